@@ -1,28 +1,34 @@
-import json
+import hashlib
 import logging
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIChatModel
-from pydantic_ai.providers.openrouter import OpenRouterProvider
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import from_json
 
 from app.core.config import get_settings
+from app.agents.payload import (
+    build_full_payload,
+    build_payload,
+    count_tokens,
+    serialize_payload,
+)
+from app.agents.prescreen import rejection_analysis, screen_profile
 from app.models.instagram import InstagramProfile, InstagramAnalysis
+from app.services import metrics, progress
+from app.services.cache import ModelCache, build_cache_backend
+from app.services.limits import llm_limiter
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from pydantic_ai.messages import ModelResponse
+    from pydantic_ai.models.openai import OpenAIChatModel
+    from pydantic_ai.usage import RunUsage
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-if not settings.openrouter_api_key:
-    raise ValueError(
-        "OPENROUTER_API_KEY environment variable is required. "
-        "Please set it in your .env file or environment."
-    )
-
-openrouter_provider = OpenRouterProvider(api_key=settings.openrouter_api_key)
-
-model = OpenAIChatModel(
-    settings.openrouter_model,
-    provider=openrouter_provider,
-)
-
 SYSTEM_PROMPT = (
     "You are Wykra, an analytical influencer research agent. "
     "Your task is to evaluate an Instagram profile based solely on the provided JSON data. "
@@ -35,9 +41,12 @@ SYSTEM_PROMPT = (
     "6. Engagement Strength: How strong is the engagement? Is it consistent and genuine?\n"
     "7. Posts Analysis: Analyze the posting patterns, content quality, and consistency.\n"
     "8. Hashtags Statistics: What hashtags do they use most? Are they relevant to their niche?\n\n"
-    "Return your analysis as a JSON object with the following structure:\n"
+    "The JSON includes a `metrics` object with precomputed engagement rate, likes and "
+    "comments per post, posting cadence, content type mix and hashtag frequencies. "
+    "Base items 6-8 on these numbers instead of recomputing them from the posts.\n\n"
+    "Return your analysis as a JSON object with the following structure, "
+    "with the fields in this order:\n"
     "{\n"
-    '  "summary": "A comprehensive 2-3 paragraph summary of the profile analysis",\n'
     '  "qualityScore": <number from 1 to 5>,\n'
     '  "topic": "<main topic/niche>",\n'
     '  "niche": "<specific niche if applicable>",\n'
@@ -46,8 +55,9 @@ SYSTEM_PROMPT = (
     '  "followerAuthenticity": "<likely real/likely fake/mixed>",\n'
     '  "visibleBrands": ["<brand1>", "<brand2>", ...],\n'
     '  "engagementStrength": "<weak/moderate/strong>",\n'
+    '  "hashtagsStatistics": "<analysis of hashtag usage>",\n'
     '  "postsAnalysis": "<detailed analysis of posts>",\n'
-    '  "hashtagsStatistics": "<analysis of hashtag usage>"\n'
+    '  "summary": "A comprehensive 2-3 paragraph summary of the profile analysis"\n'
     "}\n\n"
     "Quality Score Guidelines:\n"
     "- 1: Very poor quality, likely fake, low engagement, spam-like content\n"
@@ -59,11 +69,65 @@ SYSTEM_PROMPT = (
     "Return ONLY the JSON object, with no additional text or markdown formatting."
 )
 
-instagram_agent = Agent(
-    model=model,
-    output_type=InstagramAnalysis,
-    system_prompt=SYSTEM_PROMPT,
-)
+
+@lru_cache
+def get_openrouter_model() -> "OpenAIChatModel":
+    """Build the OpenRouter chat model on first use.
+
+    pydantic-ai and the OpenAI client are imported here rather than at module
+    import, so the API starts (and answers ``/health``) without loading them.
+
+    Returns:
+        The shared :class:`OpenAIChatModel` for ``OPENROUTER_MODEL``.
+
+    Raises:
+        ValueError: If ``OPENROUTER_API_KEY`` is not configured.
+    """
+
+    if not settings.openrouter_api_key:
+        raise ValueError(
+            "OPENROUTER_API_KEY environment variable is required. "
+            "Please set it in your .env file or environment."
+        )
+
+    from pydantic_ai.models.openai import OpenAIChatModel
+    from pydantic_ai.providers.openrouter import OpenRouterProvider
+
+    provider = OpenRouterProvider(api_key=settings.openrouter_api_key)
+    return OpenAIChatModel(settings.openrouter_model, provider=provider)
+
+
+@lru_cache
+def get_instagram_agent() -> "Agent[None, InstagramAnalysis]":
+    """Build the Instagram analysis agent on first use.
+
+    Returns:
+        The shared agent producing :class:`InstagramAnalysis`.
+
+    Raises:
+        ValueError: If ``OPENROUTER_API_KEY`` is not configured.
+    """
+
+    from pydantic_ai import Agent
+
+    return Agent(
+        model=get_openrouter_model(),
+        output_type=InstagramAnalysis,
+        system_prompt=SYSTEM_PROMPT,
+    )
+
+
+def warm_up() -> None:
+    """Build the agent ahead of the first analysis, if the key is configured."""
+
+    if not settings.openrouter_api_key:
+        return
+    try:
+        get_instagram_agent()
+    except Exception:
+        logger.exception("LLM agent warm-up failed")
+    else:
+        logger.info("LLM agent ready (%s)", settings.openrouter_model)
 
 
 async def analyze_profile(profile: InstagramProfile) -> InstagramAnalysis:
@@ -77,23 +141,163 @@ async def analyze_profile(profile: InstagramProfile) -> InstagramAnalysis:
     """
     logger.info("Analyzing profile: %s", profile.username)
 
-    payload = {
-        "username": profile.username,
-        "full_name": profile.full_name,
-        "bio": profile.bio,
-        "followers": profile.followers,
-        "following": profile.following,
-        "posts_count": profile.posts_count,
-        "is_verified": profile.is_verified,
-        "is_business": profile.is_business,
-        "profile_url": profile.profile_url,
-        "raw": profile.raw,
-    }
+    if settings.prescreen_enabled:
+        reasons = screen_profile(profile)
+        if reasons:
+            progress.emit("prescreen_rejected", reasons=reasons)
+            return rejection_analysis(profile, reasons)
 
-    user_prompt = json.dumps(payload, ensure_ascii=False)
+    user_prompt = serialize_payload(build_payload(profile))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Prompt for %s: %s tokens (%s before projection)",
+            profile.username,
+            count_tokens(user_prompt),
+            count_tokens(serialize_payload(build_full_payload(profile))),
+        )
 
-    result = await instagram_agent.run(user_prompt)
+    cache = get_analysis_cache()
+    cache_key = _analysis_cache_key(user_prompt)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        logger.info("Analysis cache hit for %s", profile.username)
+        progress.emit("analysis_cache_hit")
+        return cached
 
-    analysis = result.output
+    metrics.llm_payload_bytes.observe(len(user_prompt.encode("utf-8")))
+    progress.emit("llm_started", model=settings.openrouter_model)
+    async with llm_limiter.acquire():
+        with metrics.llm_seconds.time(), metrics.llm_calls_in_flight.track_inprogress():
+            if settings.llm_stream and progress.is_observed():
+                analysis, usage = await _run_streamed(user_prompt)
+            else:
+                result = await get_instagram_agent().run(user_prompt)
+                analysis, usage = result.output, result.usage
+
+    metrics.llm_prompt_tokens.inc(usage.input_tokens or 0)
+    metrics.llm_completion_tokens.inc(usage.output_tokens or 0)
+    progress.emit("llm_completed", qualityScore=analysis.qualityScore)
+    await cache.set(cache_key, analysis)
     logger.info("Analysis complete for %s", profile.username)
     return analysis
+
+
+async def _run_streamed(user_prompt: str) -> Tuple[InstagramAnalysis, "RunUsage"]:
+    """Run the agent on a streamed response and publish fields as they finish.
+
+    Each output field is validated on its own as soon as the model moves on to
+    the next one, and published as an ``analysis_field`` progress event. These
+    fields are provisional: the complete output is validated as usual and is
+    what the caller gets back.
+
+    Args:
+        user_prompt: The serialized profile payload.
+
+    Returns:
+        The validated analysis and the token usage of the run.
+    """
+
+    started = time.perf_counter()
+    emitted: Set[str] = set()
+    async with get_instagram_agent().run_stream(user_prompt) as result:
+        async for response in result.stream_response(
+            debounce_by=settings.llm_stream_debounce or None
+        ):
+            fields = _completed_fields(response, final=response.state == "complete")
+            for name, value in fields.items():
+                if name in emitted:
+                    continue
+                if not emitted:
+                    metrics.llm_first_field_seconds.observe(
+                        time.perf_counter() - started
+                    )
+                emitted.add(name)
+                progress.emit("analysis_field", field=name, value=value)
+        analysis = await result.get_output()
+        return analysis, result.usage
+
+
+def _completed_fields(response: "ModelResponse", final: bool) -> Dict[str, Any]:
+    """Return the fields of a partial agent response that are complete and valid.
+
+    Args:
+        response: A snapshot of the streamed response.
+        final: Whether the response is complete. Until it is, the last field
+            may still be growing and is left out.
+
+    Returns:
+        Validated field values by name.
+    """
+
+    args = next(
+        (part.args for part in response.parts if part.part_kind == "tool-call"), None
+    )
+    if isinstance(args, str):
+        try:
+            # Keep a string still being written, so it is the field held
+            # back rather than the complete one before it.
+            args = from_json(args or "{}", allow_partial="trailing-strings")
+        except ValueError:
+            return {}
+    if not isinstance(args, dict):
+        return {}
+
+    names = list(args) if final else list(args)[:-1]
+    adapters = _field_adapters()
+    fields: Dict[str, Any] = {}
+    for name in names:
+        adapter = adapters.get(name)
+        if adapter is None:
+            continue
+        try:
+            fields[name] = adapter.validate_python(args[name])
+        except ValidationError:
+            continue
+    return fields
+
+
+@lru_cache
+def _field_adapters() -> Dict[str, TypeAdapter[Any]]:
+    return {
+        name: TypeAdapter(field.annotation)
+        for name, field in InstagramAnalysis.model_fields.items()
+    }
+
+
+@lru_cache
+def get_analysis_cache() -> ModelCache[InstagramAnalysis]:
+    """Return the cache of agent results configured in the settings.
+
+    Returns:
+        A :class:`ModelCache` of :class:`InstagramAnalysis` entries.
+    """
+
+    backend = build_cache_backend(
+        settings.analysis_cache_backend,
+        namespace="instagram_analysis",
+        ttl=settings.analysis_cache_ttl,
+        max_entries=settings.analysis_cache_max_entries,
+        sqlite_path=settings.cache_sqlite_path,
+    )
+    return ModelCache(backend, InstagramAnalysis, name="analysis")
+
+
+def _analysis_cache_key(user_prompt: str) -> str:
+    """Build a content-addressed cache key for an agent run.
+
+    The key hashes the model name, the system prompt and the exact user prompt,
+    so changing the model or prompt makes every previous entry unreachable and
+    it ages out through TTL/LRU eviction.
+
+    Args:
+        user_prompt: The serialized profile payload sent to the agent.
+
+    Returns:
+        The cache key for this combination.
+    """
+
+    digest = hashlib.sha256()
+    for part in (settings.openrouter_model, SYSTEM_PROMPT, user_prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"instagram:analysis:{digest.hexdigest()}"
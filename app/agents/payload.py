@@ -0,0 +1,189 @@
+import json
+import logging
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+
+from app.core.config import get_settings
+from app.models.instagram import InstagramProfile
+from app.services.engagement import compute_engagement_metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def build_payload(profile: InstagramProfile) -> Dict[str, Any]:
+    """Build the slimmed JSON payload the agent receives for a profile.
+
+    Only allowlisted raw fields are kept. Posts are capped, captions are
+    truncated, and CDN links and internal IDs are stripped, since they cost
+    tokens without helping the analysis. Engagement, cadence and hashtag
+    numbers are precomputed into ``metrics`` so the agent does not have to
+    derive them from the posts.
+
+    Args:
+        profile: The normalized Instagram profile.
+
+    Returns:
+        A JSON-serializable dictionary.
+    """
+
+    raw = {
+        key: profile.raw[key]
+        for key in settings.llm_payload_raw_fields
+        if key in profile.raw and key != "posts"
+    }
+    if "posts" in settings.llm_payload_raw_fields:
+        raw["posts"] = _project_posts(profile.raw.get("posts") or [])
+
+    return {
+        "username": profile.username,
+        "full_name": profile.full_name,
+        "bio": profile.bio,
+        "followers": profile.followers,
+        "following": profile.following,
+        "posts_count": profile.posts_count,
+        "is_verified": profile.is_verified,
+        "is_business": profile.is_business,
+        "profile_url": profile.profile_url,
+        "metrics": _round_floats(
+            compute_engagement_metrics(profile.raw).model_dump(
+                mode="json", exclude_none=True
+            )
+        ),
+        "raw": _strip_links_and_ids(raw),
+    }
+
+
+def build_full_payload(profile: InstagramProfile) -> Dict[str, Any]:
+    """Build the unprojected payload (the full raw record), for comparisons."""
+
+    payload = build_payload(profile)
+    payload.pop("metrics")
+    payload["raw"] = profile.raw
+    return payload
+
+
+def serialize_payload(payload: Dict[str, Any]) -> str:
+    """Serialize a payload into the user prompt sent to the agent."""
+
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of ``text``.
+
+    Uses ``tiktoken`` when it is installed and its encoding can be loaded, and
+    falls back to the usual four-characters-per-token estimate otherwise.
+
+    Args:
+        text: The prompt text.
+
+    Returns:
+        The (estimated) number of tokens.
+    """
+
+    return _token_counter()(text)
+
+
+@lru_cache
+def _token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as exc:
+        logger.info("tiktoken is unavailable (%s), estimating token counts", exc)
+        return lambda text: (len(text) + 3) // 4
+
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def _project_posts(posts: List[Any]) -> List[Dict[str, Any]]:
+    """Keep the allowlisted fields of the most relevant posts."""
+
+    max_chars = settings.llm_payload_caption_max_chars
+    projected = []
+    for post in posts[: settings.llm_payload_max_posts]:
+        if not isinstance(post, dict):
+            continue
+        item = {
+            key: post[key] for key in settings.llm_payload_post_fields if key in post
+        }
+        caption = item.get("caption")
+        if isinstance(caption, str) and len(caption) > max_chars:
+            item["caption"] = caption[:max_chars].rstrip() + "…"
+        projected.append(item)
+    return projected
+
+
+def _strip_links_and_ids(value: Any) -> Any:
+    """Recursively drop URL values and identifier fields."""
+
+    if isinstance(value, dict):
+        return {
+            key: _strip_links_and_ids(item)
+            for key, item in value.items()
+            if not _is_id_key(key) and not _is_url(item)
+        }
+    if isinstance(value, list):
+        return [_strip_links_and_ids(item) for item in value if not _is_url(item)]
+    return value
+
+
+def _round_floats(value: Any, digits: int = 4) -> Any:
+    """Recursively round floats so metrics do not spend tokens on noise digits."""
+
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: _round_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(item, digits) for item in value]
+    return value
+
+
+def _is_id_key(key: str) -> bool:
+    return key in ("id", "fbid", "pk") or key.endswith("_id")
+
+
+def _is_url(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(("http://", "https://"))
+
+
+def main(argv: List[str]) -> None:
+    """Report prompt token counts before and after projection for a snapshot file.
+
+    Usage: ``python -m app.agents.payload research/profiles.json``
+    """
+
+    from app.services.brightdata import _build_profile
+
+    path = argv[1] if len(argv) > 1 else "research/profiles.json"
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    records = []
+    for item in data:
+        records.extend(item if isinstance(item, list) else [item])
+
+    total_before = total_after = 0
+    for record in records:
+        if not isinstance(record, dict) or not record.get("account"):
+            continue
+        profile = _build_profile(record, record["account"])
+        before = count_tokens(serialize_payload(build_full_payload(profile)))
+        after = count_tokens(serialize_payload(build_payload(profile)))
+        total_before += before
+        total_after += after
+        print(f"{profile.username:<32} {before:>8} -> {after:>6} tokens")
+
+    if total_before:
+        saved = 100 * (1 - total_after / total_before)
+        print(
+            f"{'TOTAL':<32} {total_before:>8} -> {total_after:>6} tokens ({saved:.1f}% saved)"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
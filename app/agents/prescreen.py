@@ -0,0 +1,120 @@
+import logging
+from typing import List
+
+from app.core.config import get_settings
+from app.models.instagram import InstagramAnalysis, InstagramProfile
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ScreeningStats:
+    """Running count of screened and rejected profiles in this process."""
+
+    def __init__(self) -> None:
+        self.screened = 0
+        self.rejected = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of screened profiles rejected without an LLM call."""
+
+        return self.rejected / self.screened if self.screened else 0.0
+
+
+screening_stats = ScreeningStats()
+
+
+def screen_profile(profile: InstagramProfile) -> List[str]:
+    """Check a profile against the configured out-of-scope rules.
+
+    Args:
+        profile: The normalized Instagram profile.
+
+    Returns:
+        The reasons the profile is out of scope; empty if it should go to the
+        agent.
+    """
+
+    reasons = []
+    raw = profile.raw
+
+    if settings.prescreen_reject_private and raw.get("is_private"):
+        reasons.append("the account is private")
+
+    if (
+        profile.followers is not None
+        and profile.followers < settings.prescreen_min_followers
+    ):
+        reasons.append(
+            f"{profile.followers} followers is below the minimum of "
+            f"{settings.prescreen_min_followers}"
+        )
+
+    # A partial record without a post count or post list says nothing about
+    # the posts, so it goes on to the full analysis.
+    posts = raw.get("posts")
+    posts_seen = len(posts or [])
+    if profile.posts_count is not None or posts is not None:
+        posts_known = max(profile.posts_count or 0, posts_seen)
+        if posts_known < settings.prescreen_min_posts:
+            reasons.append(f"the account has {posts_known} posts")
+
+    avg_engagement = raw.get("avg_engagement")
+    if (
+        isinstance(avg_engagement, (int, float))
+        and posts_seen
+        and avg_engagement < settings.prescreen_min_avg_engagement
+    ):
+        reasons.append(
+            f"average engagement {avg_engagement:.4f} is below the minimum of "
+            f"{settings.prescreen_min_avg_engagement}"
+        )
+
+    screening_stats.screened += 1
+    metrics.prescreen_screened.inc()
+    if reasons:
+        screening_stats.rejected += 1
+        metrics.prescreen_rejected.inc()
+        logger.info(
+            "Pre-screen rejected %s (%s); hit rate %.1f%% of %s",
+            profile.username,
+            "; ".join(reasons),
+            100 * screening_stats.hit_rate,
+            screening_stats.screened,
+        )
+    return reasons
+
+
+def rejection_analysis(
+    profile: InstagramProfile, reasons: List[str]
+) -> InstagramAnalysis:
+    """Build the cheap analysis returned for a profile rejected by the pre-screen.
+
+    Args:
+        profile: The rejected profile.
+        reasons: The reasons returned by :func:`screen_profile`.
+
+    Returns:
+        An :class:`InstagramAnalysis` with the lowest quality score that says
+        the full analysis was skipped and why.
+    """
+
+    return InstagramAnalysis(
+        summary=(
+            f"@{profile.username} was not analyzed in depth because "
+            f"{'; '.join(reasons)}. Profiles like this are out of scope for "
+            "influencer research."
+        ),
+        qualityScore=1,
+        topic="unknown",
+        niche=None,
+        sponsoredFrequency="unknown",
+        contentAuthenticity="unknown",
+        followerAuthenticity="unknown",
+        visibleBrands=[],
+        engagementStrength="weak",
+        postsAnalysis="Not analyzed (rejected by pre-screen).",
+        hashtagsStatistics="Not analyzed (rejected by pre-screen).",
+    )
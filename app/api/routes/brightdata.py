@@ -0,0 +1,68 @@
+import hmac
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Body, Header, HTTPException, Query
+
+from app.core.config import get_settings
+from app.services.snapshot_notifier import notifier
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+router = APIRouter()
+
+
+@router.post("/notify")
+async def snapshot_notify(
+    payload: Dict[str, Any] = Body(default_factory=dict),
+    snapshot_id: Optional[str] = Query(None, description="Bright Data snapshot ID"),
+    authorization: Optional[str] = Header(None),
+) -> dict[str, str]:
+    """Receive a Bright Data snapshot completion callback.
+
+    Args:
+        payload: The callback body, expected to contain ``snapshot_id`` and
+            ``status``.
+        snapshot_id: Optional snapshot ID passed as a query parameter instead
+            of in the body.
+        authorization: The ``Authorization`` header, checked against
+            ``BRIGHTDATA_NOTIFY_SECRET`` when one is configured.
+
+    Returns:
+        A simple acknowledgement payload.
+
+    Raises:
+        HTTPException: If the secret does not match or the callback carries no
+            snapshot ID.
+    """
+
+    secret = settings.brightdata_notify_secret
+    if secret and not _secret_matches(authorization, secret):
+        raise HTTPException(status_code=401, detail="Invalid notify credentials")
+
+    snapshot_id = payload.get("snapshot_id") or snapshot_id
+    if not snapshot_id:
+        raise HTTPException(status_code=422, detail="Missing snapshot_id")
+
+    logger.info(
+        "Notify callback for snapshot %s (status=%s)",
+        snapshot_id,
+        payload.get("status"),
+    )
+    notifier.resolve(snapshot_id, payload)
+    return {"status": "ok"}
+
+
+def _secret_matches(authorization: Optional[str], secret: str) -> bool:
+    """Compare the ``Authorization`` header to the secret in constant time.
+
+    Both the bare secret and ``Bearer <secret>`` are accepted, and both are
+    always compared so the timing does not reveal which form was close.
+    """
+
+    given = (authorization or "").encode()
+    matches = [
+        hmac.compare_digest(given, expected.encode())
+        for expected in (secret, f"Bearer {secret}")
+    ]
+    return any(matches)
@@ -1,22 +1,55 @@
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Query
+from typing import Any, AsyncIterator, List, Optional
 
-from app.services.brightdata import fetch_instagram_profile, BrightDataError
-from app.agents.instagram_analyzer import analyze_profile
-from app.models.instagram import InstagramAnalysis
+from fastapi import APIRouter, Body, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.services.analysis import analyze_fetched_profile, analyze_instagram_username
+from app.services.cohort import compute_cohort_stats, flatten_snapshots
+from app.services.engagement import compute_engagement_metrics
+from app.services import progress
+from app.services.brightdata import (
+    fetch_instagram_profile,
+    fetch_instagram_profiles,
+    normalize_username,
+    BrightDataError,
+)
+from app.services.jobs import JobQueueFullError, job_manager
+from app.services.limits import queue_patiently
+from app.models.instagram import (
+    AnalysisJob,
+    AnalysisJobRequest,
+    CohortStats,
+    EngagementMetrics,
+    InstagramAnalysis,
+    InstagramBatchItem,
+    InstagramBatchRequest,
+    InstagramProfile,
+    ProgressEvent,
+)
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 router = APIRouter()
 
 
 @router.get("/analysis", response_model=InstagramAnalysis)
 async def analyze_instagram_profile(
-    profile: str = Query(..., description="Instagram username (without @)")
+    profile: str = Query(..., description="Instagram username (without @)"),
+    max_age: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Maximum age in seconds of cached profile data (0 = fresh scrape)",
+    ),
 ) -> InstagramAnalysis:
     """Analyze an Instagram profile by fetching data and invoking the agent.
 
     Args:
         profile: The Instagram username provided via query parameter.
+        max_age: Optional maximum age of cached profile data, trading
+            freshness for latency.
 
     Returns:
         The structured :class:`InstagramAnalysis` produced by the agent.
@@ -28,11 +61,257 @@ async def analyze_instagram_profile(
 
     logger.info(f"Analysis request for profile: {profile}")
     try:
-        ig_profile = await fetch_instagram_profile(profile)
+        analysis = await analyze_instagram_username(profile, max_age=max_age)
     except BrightDataError as e:
         logger.error(f"Bright Data error for {profile}: {e}")
         raise HTTPException(status_code=502, detail=str(e))
 
-    analysis = await analyze_profile(ig_profile)
     logger.info(f"Analysis complete for {profile}")
     return analysis
+
+
+@router.get("/engagement", response_model=EngagementMetrics)
+async def get_instagram_engagement(
+    profile: str = Query(..., description="Instagram username (without @)"),
+    max_age: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Maximum age in seconds of cached profile data (0 = fresh scrape)",
+    ),
+) -> EngagementMetrics:
+    """Return deterministic engagement metrics for a profile without the LLM.
+
+    Args:
+        profile: The Instagram username provided via query parameter.
+        max_age: Optional maximum age of cached profile data.
+
+    Returns:
+        The :class:`EngagementMetrics` computed from the profile's posts.
+
+    Raises:
+        HTTPException: If the Bright Data API fails while retrieving the
+            profile.
+    """
+
+    logger.info(f"Engagement metrics request for profile: {profile}")
+    try:
+        ig_profile = await fetch_instagram_profile(profile, max_age=max_age)
+    except BrightDataError as e:
+        logger.error(f"Bright Data error for {profile}: {e}")
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return compute_engagement_metrics(ig_profile.raw)
+
+
+@router.post("/cohort", response_model=CohortStats)
+async def rank_instagram_cohort(
+    raw_profiles: List[Any] = Body(
+        ..., description="Raw Bright Data profile records (snapshot exports)"
+    ),
+) -> CohortStats:
+    """Rank many already-scraped profiles by engagement in one columnar pass.
+
+    Args:
+        raw_profiles: Bright Data profile records, either flat or grouped per
+            snapshot as in ``research/profiles.json``.
+
+    Returns:
+        Per-profile statistics ranked by engagement rate, plus cohort
+        percentiles.
+
+    Raises:
+        HTTPException: If there are more records than ``COHORT_MAX_PROFILES``.
+    """
+
+    records = flatten_snapshots(raw_profiles)
+    logger.info(f"Cohort ranking request for {len(records)} profiles")
+    if len(records) > settings.cohort_max_profiles:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"{len(records)} profiles exceed the limit of "
+                f"{settings.cohort_max_profiles} per request"
+            ),
+        )
+    return await asyncio.to_thread(compute_cohort_stats, records)
+
+
+@router.get("/analysis/events")
+async def stream_instagram_analysis(
+    profile: str = Query(..., description="Instagram username (without @)"),
+    max_age: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Maximum age in seconds of cached profile data (0 = fresh scrape)",
+    ),
+) -> StreamingResponse:
+    """Analyze an Instagram profile and stream each pipeline stage as it finishes.
+
+    The response is a Server-Sent Events stream. Every event is named after
+    its stage (``snapshot_triggered``, ``snapshot_building``,
+    ``snapshot_downloaded``, ``llm_started`` ...) and carries a
+    :class:`ProgressEvent` as JSON. While the model answers, each finished
+    field of the analysis is sent as an ``analysis_field`` event. The stream
+    ends with a ``done`` event holding the :class:`InstagramAnalysis`, or an
+    ``error`` event.
+
+    Args:
+        profile: The Instagram username provided via query parameter.
+        max_age: Optional maximum age of cached profile data.
+
+    Returns:
+        A ``text/event-stream`` response.
+    """
+
+    username = normalize_username(profile)
+    logger.info(f"Streaming analysis request for profile: {username}")
+    return StreamingResponse(
+        _analysis_events(username, max_age),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _analysis_events(username: str, max_age: Optional[int]) -> AsyncIterator[str]:
+    """Run the analysis for ``username`` and yield its progress as SSE frames."""
+
+    with progress.subscribe(username) as queue:
+        task = asyncio.create_task(
+            analyze_instagram_username(username, max_age=max_age)
+        )
+        try:
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                await asyncio.wait(
+                    {next_event, task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not next_event.done():
+                    next_event.cancel()
+                    break
+                yield _sse_frame(next_event.result())
+
+            while not queue.empty():
+                yield _sse_frame(queue.get_nowait())
+
+            try:
+                analysis = task.result()
+            except BrightDataError as e:
+                logger.error(f"Bright Data error for {username}: {e}")
+                yield _sse_frame(progress.build_event(username, "error", detail=str(e)))
+            except Exception as e:
+                logger.exception(f"Streaming analysis failed for {username}")
+                yield _sse_frame(
+                    progress.build_event(
+                        username, "error", detail=f"Analysis failed: {e}"
+                    )
+                )
+            else:
+                yield _sse_frame(
+                    progress.build_event(
+                        username, "done", analysis=analysis.model_dump()
+                    )
+                )
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+def _sse_frame(event: ProgressEvent) -> str:
+    return f"event: {event.stage}\ndata: {event.model_dump_json()}\n\n"
+
+
+@router.post("/analysis/batch", response_model=List[InstagramBatchItem])
+async def analyze_instagram_profiles(
+    request: InstagramBatchRequest,
+) -> List[InstagramBatchItem]:
+    """Analyze many Instagram profiles scraped through shared Bright Data snapshots.
+
+    Args:
+        request: The usernames to analyze.
+
+    Returns:
+        One :class:`InstagramBatchItem` per unique username, carrying either
+        the analysis or the reason it could not be produced.
+
+    Raises:
+        HTTPException: If Bright Data is not configured.
+    """
+
+    logger.info(f"Batch analysis request for {len(request.usernames)} profiles")
+    # A batch starts every trigger and LLM call at once: they queue for the
+    # upstream slots instead of being shed like interactive requests.
+    with queue_patiently():
+        try:
+            profiles = await fetch_instagram_profiles(
+                request.usernames, max_age=request.max_age
+            )
+        except BrightDataError as e:
+            logger.error(f"Bright Data error for batch: {e}")
+            raise HTTPException(status_code=502, detail=str(e))
+
+        items = await asyncio.gather(
+            *(
+                _analyze_batch_item(username, result)
+                for username, result in profiles.items()
+            )
+        )
+    logger.info(f"Batch analysis complete for {len(items)} profiles")
+    return list(items)
+
+
+@router.post("/analysis/jobs", response_model=AnalysisJob, status_code=202)
+async def create_analysis_job(request: AnalysisJobRequest) -> AnalysisJob:
+    """Queue a background analysis and return immediately.
+
+    Args:
+        request: The profile to analyze and optional cache freshness.
+
+    Returns:
+        The queued :class:`AnalysisJob`; poll ``GET /analysis/jobs/{id}`` for
+        the result.
+
+    Raises:
+        HTTPException: If the job queue is full.
+    """
+
+    logger.info(f"Analysis job request for profile: {request.profile}")
+    try:
+        return job_manager.submit(request.profile, max_age=request.max_age)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/analysis/jobs/{job_id}", response_model=AnalysisJob)
+async def get_analysis_job(job_id: str) -> AnalysisJob:
+    """Return the status, and once finished the result, of an analysis job.
+
+    Args:
+        job_id: The identifier returned by ``POST /analysis/jobs``.
+
+    Returns:
+        The current state of the :class:`AnalysisJob`.
+
+    Raises:
+        HTTPException: If the job is unknown or has expired.
+    """
+
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+async def _analyze_batch_item(
+    username: str, result: InstagramProfile | BrightDataError
+) -> InstagramBatchItem:
+    """Analyze one fetched profile of a batch, isolating its failures."""
+
+    if isinstance(result, BrightDataError):
+        return InstagramBatchItem(username=username, error=str(result))
+
+    try:
+        analysis = await analyze_fetched_profile(username, result)
+    except Exception as e:
+        logger.exception(f"Analysis failed for {username}")
+        return InstagramBatchItem(username=username, error=f"Analysis failed: {e}")
+    return InstagramBatchItem(username=username, analysis=analysis)
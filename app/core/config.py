@@ -14,19 +14,163 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment.
+
+    Args:
+        name: The environment variable to read.
+        default: The value used when the variable is unset.
+
+    Returns:
+        ``True`` for ``1``/``true``/``yes``/``on`` (case-insensitive), otherwise
+        ``False``.
+    """
+
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str, default: str) -> list[str]:
+    """Read a comma-separated list from the environment.
+
+    Args:
+        name: The environment variable to read.
+        default: The comma-separated value used when the variable is unset.
+
+    Returns:
+        The non-empty, stripped items.
+    """
+
+    value = os.getenv(name, default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 class Settings(BaseModel):
     app_name: str = "Wykra API"
     api_v1_prefix: str = "/api/v1"
 
     brightdata_api_token: str | None = os.getenv("BRIGHTDATA_API_TOKEN")
+    brightdata_base_url: str = os.getenv(
+        "BRIGHTDATA_BASE_URL", "https://api.brightdata.com/datasets/v3"
+    ).rstrip("/")
     brightdata_instagram_dataset_id: str | None = os.getenv(
         "BRIGHTDATA_INSTAGRAM_DATASET_ID"
     )
     brightdata_poll_interval: int = int(os.getenv("BRIGHTDATA_POLL_INTERVAL", "5"))
+    brightdata_poll_initial_delay: float = float(
+        os.getenv("BRIGHTDATA_POLL_INITIAL_DELAY", "1")
+    )
+    brightdata_poll_backoff_factor: float = float(
+        os.getenv("BRIGHTDATA_POLL_BACKOFF_FACTOR", "1.5")
+    )
+    brightdata_poll_jitter: float = float(os.getenv("BRIGHTDATA_POLL_JITTER", "0.2"))
+    brightdata_poll_history_size: int = int(
+        os.getenv("BRIGHTDATA_POLL_HISTORY_SIZE", "50")
+    )
     brightdata_max_wait_time: int = int(os.getenv("BRIGHTDATA_MAX_WAIT_TIME", "300"))
+    brightdata_batch_max_size: int = int(os.getenv("BRIGHTDATA_BATCH_MAX_SIZE", "100"))
+    brightdata_snapshot_format: str = os.getenv("BRIGHTDATA_SNAPSHOT_FORMAT", "ndjson")
+    brightdata_snapshot_reuse_max_age: int = int(
+        os.getenv("BRIGHTDATA_SNAPSHOT_REUSE_MAX_AGE", "3600")
+    )
+    brightdata_notify_url: str | None = os.getenv("BRIGHTDATA_NOTIFY_URL")
+    brightdata_notify_secret: str | None = os.getenv("BRIGHTDATA_NOTIFY_SECRET")
+    brightdata_notify_check_interval: int = int(
+        os.getenv("BRIGHTDATA_NOTIFY_CHECK_INTERVAL", "60")
+    )
+    brightdata_http_timeout: float = float(os.getenv("BRIGHTDATA_HTTP_TIMEOUT", "120"))
+    brightdata_http2: bool = _env_bool("BRIGHTDATA_HTTP2", True)
+    brightdata_max_connections: int = int(
+        os.getenv("BRIGHTDATA_MAX_CONNECTIONS", "100")
+    )
+    brightdata_max_keepalive_connections: int = int(
+        os.getenv("BRIGHTDATA_MAX_KEEPALIVE_CONNECTIONS", "20")
+    )
+    brightdata_keepalive_expiry: float = float(
+        os.getenv("BRIGHTDATA_KEEPALIVE_EXPIRY", "30")
+    )
+
+    brightdata_trigger_concurrency: int = int(
+        os.getenv("BRIGHTDATA_TRIGGER_CONCURRENCY", "10")
+    )
+    brightdata_trigger_rate: float = float(os.getenv("BRIGHTDATA_TRIGGER_RATE", "5"))
+    brightdata_progress_concurrency: int = int(
+        os.getenv("BRIGHTDATA_PROGRESS_CONCURRENCY", "50")
+    )
+    brightdata_progress_rate: float = float(os.getenv("BRIGHTDATA_PROGRESS_RATE", "20"))
+    brightdata_snapshot_concurrency: int = int(
+        os.getenv("BRIGHTDATA_SNAPSHOT_CONCURRENCY", "20")
+    )
+    brightdata_snapshot_rate: float = float(os.getenv("BRIGHTDATA_SNAPSHOT_RATE", "10"))
+    upstream_max_queue_time: float = float(os.getenv("UPSTREAM_MAX_QUEUE_TIME", "30"))
+
+    cache_sqlite_path: str = os.getenv("CACHE_SQLITE_PATH", ".cache/wykra.sqlite3")
+    profile_cache_backend: str = os.getenv("PROFILE_CACHE_BACKEND", "memory")
+    profile_cache_ttl: int = int(os.getenv("PROFILE_CACHE_TTL", "21600"))
+    profile_cache_max_entries: int = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "1000"))
+
+    analysis_cache_backend: str = os.getenv("ANALYSIS_CACHE_BACKEND", "memory")
+    analysis_cache_ttl: int = int(os.getenv("ANALYSIS_CACHE_TTL", "604800"))
+    analysis_cache_max_entries: int = int(
+        os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1000")
+    )
+
+    snapshot_ledger_backend: str = os.getenv("SNAPSHOT_LEDGER_BACKEND", "sqlite")
+    snapshot_ledger_path: str = os.getenv(
+        "SNAPSHOT_LEDGER_PATH", os.getenv("CACHE_SQLITE_PATH", ".cache/wykra.sqlite3")
+    )
+    snapshot_ledger_retention: int = int(
+        os.getenv("SNAPSHOT_LEDGER_RETENTION", "604800")
+    )
+
+    coordination_backend: str = os.getenv("COORDINATION_BACKEND", "none")
+    coordination_sqlite_path: str = os.getenv(
+        "COORDINATION_SQLITE_PATH",
+        os.getenv("CACHE_SQLITE_PATH", ".cache/wykra.sqlite3"),
+    )
+    coordination_lease_ttl: float = float(os.getenv("COORDINATION_LEASE_TTL", "60"))
+    coordination_poll_interval: float = float(
+        os.getenv("COORDINATION_POLL_INTERVAL", "0.25")
+    )
+
+    analysis_job_workers: int = int(os.getenv("ANALYSIS_JOB_WORKERS", "4"))
+    analysis_job_queue_size: int = int(os.getenv("ANALYSIS_JOB_QUEUE_SIZE", "1000"))
+    analysis_job_retention: int = int(os.getenv("ANALYSIS_JOB_RETENTION", "3600"))
+
+    cohort_max_profiles: int = int(os.getenv("COHORT_MAX_PROFILES", "10000"))
 
     openrouter_api_key: str | None = os.getenv("OPENROUTER_API_KEY")
     openrouter_model: str = os.getenv("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet")
+    openrouter_concurrency: int = int(os.getenv("OPENROUTER_CONCURRENCY", "10"))
+    openrouter_rate: float = float(os.getenv("OPENROUTER_RATE", "0"))
+    llm_warmup: bool = _env_bool("LLM_WARMUP", True)
+    llm_stream: bool = _env_bool("LLM_STREAM", True)
+    llm_stream_debounce: float = float(os.getenv("LLM_STREAM_DEBOUNCE", "0.1"))
+
+    llm_payload_raw_fields: list[str] = _env_list(
+        "LLM_PAYLOAD_RAW_FIELDS",
+        "category_name,business_category_name,avg_engagement,"
+        "is_private,is_joined_recently,highlights_count,has_channel,"
+        "bio_hashtags,posts",
+    )
+    llm_payload_post_fields: list[str] = _env_list(
+        "LLM_PAYLOAD_POST_FIELDS",
+        "caption,content_type,is_pinned,location",
+    )
+    llm_payload_max_posts: int = int(os.getenv("LLM_PAYLOAD_MAX_POSTS", "12"))
+    llm_payload_caption_max_chars: int = int(
+        os.getenv("LLM_PAYLOAD_CAPTION_MAX_CHARS", "500")
+    )
+
+    prescreen_enabled: bool = _env_bool("PRESCREEN_ENABLED", True)
+    prescreen_reject_private: bool = _env_bool("PRESCREEN_REJECT_PRIVATE", True)
+    prescreen_min_followers: int = int(os.getenv("PRESCREEN_MIN_FOLLOWERS", "100"))
+    prescreen_min_posts: int = int(os.getenv("PRESCREEN_MIN_POSTS", "1"))
+    prescreen_min_avg_engagement: float = float(
+        os.getenv("PRESCREEN_MIN_AVG_ENGAGEMENT", "0.0005")
+    )
 
     environment: str = os.getenv("ENVIRONMENT", "local")
 
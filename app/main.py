@@ -1,13 +1,70 @@
+import asyncio
 import logging
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.agents.instagram_analyzer import warm_up
 from app.core.config import get_settings
+from app.api.routes import brightdata as brightdata_routes
 from app.api.routes import instagram as instagram_routes
+from app.services import metrics
+from app.services.brightdata import (
+    close_http_client,
+    open_http_client,
+    resume_outstanding_snapshots,
+)
+from app.services.jobs import job_manager
+from app.services.limits import UpstreamBusyError
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage resources shared across requests for the lifetime of the app.
+
+    The LLM stack is loaded in a background thread, so the app starts serving
+    (``/health`` included) before it is ready. Snapshots a previous run left
+    outstanding are collected in the background too.
+    """
+
+    app.state.brightdata_client = await open_http_client()
+    await job_manager.start()
+    warmup = (
+        asyncio.create_task(asyncio.to_thread(warm_up)) if settings.llm_warmup else None
+    )
+    resume = asyncio.create_task(resume_outstanding_snapshots())
+    try:
+        yield
+    finally:
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
+        if not resume.done():
+            resume.cancel()
+        await job_manager.stop()
+        await close_http_client()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+
+
+@app.exception_handler(UpstreamBusyError)
+async def upstream_busy_handler(
+    request: Request, exc: UpstreamBusyError
+) -> JSONResponse:
+    """Turn upstream back-pressure into ``429 Too Many Requests``."""
+
+    logger.warning("Upstream busy for %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 
 @app.get("/health")
@@ -17,9 +74,24 @@ async def health() -> dict[str, str]:
     return {"status": "ok", "environment": settings.environment}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    """Expose pipeline metrics in the Prometheus text format."""
+
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
 # /api/v1/instagram/analysis?profile=...
 app.include_router(
     instagram_routes.router,
     prefix=f"{settings.api_v1_prefix}/instagram",
     tags=["instagram"],
 )
+
+# /api/v1/brightdata/notify (snapshot completion callbacks)
+app.include_router(
+    brightdata_routes.router,
+    prefix=f"{settings.api_v1_prefix}/brightdata",
+    tags=["brightdata"],
+)
@@ -1,5 +1,6 @@
-from typing import Any, Optional, List
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Literal, Optional, List
+from pydantic import BaseModel, Field
 
 
 class InstagramProfile(BaseModel):
@@ -16,7 +17,8 @@ class InstagramProfile(BaseModel):
 
 
 class InstagramAnalysis(BaseModel):
-    summary: str
+    # Short verdicts first: the model writes fields in schema order, so a
+    # streamed analysis delivers them before the long-form text.
     qualityScore: int
     topic: str
     niche: Optional[str] = None
@@ -25,5 +27,93 @@ class InstagramAnalysis(BaseModel):
     followerAuthenticity: str
     visibleBrands: List[str]
     engagementStrength: str
-    postsAnalysis: str
     hashtagsStatistics: str
+    postsAnalysis: str
+    summary: str
+
+
+class HashtagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class EngagementMetrics(BaseModel):
+    followers: Optional[int] = None
+    following: Optional[int] = None
+    follower_following_ratio: Optional[float] = None
+    posts_analyzed: int
+    pinned_posts: int
+    avg_likes: Optional[float] = None
+    median_likes: Optional[float] = None
+    avg_comments: Optional[float] = None
+    median_comments: Optional[float] = None
+    engagement_rate: Optional[float] = None
+    posts_per_week: Optional[float] = None
+    median_days_between_posts: Optional[float] = None
+    first_post_at: Optional[datetime] = None
+    last_post_at: Optional[datetime] = None
+    content_type_mix: dict[str, float] = Field(default_factory=dict)
+    hashtags_per_post: float = 0.0
+    top_hashtags: List[HashtagCount] = Field(default_factory=list)
+
+
+class CohortProfileStats(BaseModel):
+    username: str
+    followers: Optional[float] = None
+    following: Optional[float] = None
+    follower_following_ratio: Optional[float] = None
+    posts_analyzed: int
+    avg_likes: Optional[float] = None
+    avg_comments: Optional[float] = None
+    engagement_rate: Optional[float] = None
+    engagement_percentile: Optional[float] = None
+    posts_per_week: Optional[float] = None
+    posting_frequency_zscore: Optional[float] = None
+
+
+class CohortSummary(BaseModel):
+    profiles: int
+    engagement_rate_percentiles: dict[str, float] = Field(default_factory=dict)
+    followers_percentiles: dict[str, float] = Field(default_factory=dict)
+    posts_per_week_mean: Optional[float] = None
+    posts_per_week_std: Optional[float] = None
+
+
+class CohortStats(BaseModel):
+    summary: CohortSummary
+    profiles: List[CohortProfileStats]
+
+
+class InstagramBatchRequest(BaseModel):
+    usernames: List[str] = Field(..., min_length=1)
+    max_age: Optional[int] = Field(None, ge=0)
+
+
+class InstagramBatchItem(BaseModel):
+    username: str
+    analysis: Optional[InstagramAnalysis] = None
+    error: Optional[str] = None
+
+
+class AnalysisJobRequest(BaseModel):
+    profile: str
+    max_age: Optional[int] = Field(None, ge=0)
+
+
+class AnalysisJob(BaseModel):
+    id: str
+    profile: str
+    max_age: Optional[int] = None
+    status: Literal["queued", "running", "succeeded", "failed"] = "queued"
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[InstagramAnalysis] = None
+    error: Optional[str] = None
+
+
+class ProgressEvent(BaseModel):
+    stage: str
+    profile: str
+    timestamp: float
+    data: dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,89 @@
+import logging
+import time
+from typing import Optional
+
+from app.agents.instagram_analyzer import analyze_profile
+from app.models.instagram import InstagramAnalysis, InstagramProfile
+from app.services import metrics, progress
+from app.services.brightdata import fetch_instagram_profile, normalize_username
+from app.services.coordination import get_leases
+from app.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_analysis_flight: SingleFlight[InstagramAnalysis] = SingleFlight("analysis")
+
+
+async def analyze_instagram_username(
+    username: str, max_age: Optional[float] = None
+) -> InstagramAnalysis:
+    """Fetch and analyze an Instagram profile, sharing work between callers.
+
+    Concurrent requests for the same normalized username await a single
+    scrape and a single agent run. Across worker processes a lease serializes
+    them, and the later ones are answered from the shared caches: a profile
+    stored while a worker waited for the lease counts as fresh, even under
+    ``max_age=0``.
+
+    Args:
+        username: The Instagram handle, with or without the leading ``@``.
+        max_age: Optional maximum age in seconds of a cached profile.
+
+    Returns:
+        The :class:`InstagramAnalysis` produced by the agent.
+
+    Raises:
+        BrightDataError: If the profile could not be fetched.
+    """
+
+    username = normalize_username(username)
+    with progress.bind(username):
+        return await _analysis_flight.do(
+            username, lambda: _analyze_instagram_username(username, max_age)
+        )
+
+
+async def analyze_fetched_profile(
+    username: str, profile: InstagramProfile
+) -> InstagramAnalysis:
+    """Analyze a profile the caller already fetched, e.g. as part of a batch.
+
+    The agent run is shared with :func:`analyze_instagram_username` for the
+    same username, in-process and across workers.
+
+    Args:
+        username: The Instagram handle the profile was fetched for.
+        profile: The fetched profile.
+
+    Returns:
+        The :class:`InstagramAnalysis` produced by the agent.
+    """
+
+    username = normalize_username(username)
+    with progress.bind(username):
+        return await _analysis_flight.do(
+            username,
+            lambda: _analyze_instagram_username(
+                username, max_age=None, profile=profile
+            ),
+        )
+
+
+async def _analyze_instagram_username(
+    username: str,
+    max_age: Optional[float],
+    profile: Optional[InstagramProfile] = None,
+) -> InstagramAnalysis:
+    started = time.time()
+    async with get_leases().exclusive(f"analysis:{username}") as waited:
+        # The holder has usually just cached the profile, and with it the
+        # analysis keyed by the same prompt.
+        if waited and max_age is not None:
+            max_age = max(max_age, time.time() - started)
+        with (
+            metrics.analysis_seconds.time(),
+            metrics.analyses_in_flight.track_inprogress(),
+        ):
+            if profile is None:
+                profile = await fetch_instagram_profile(username, max_age=max_age)
+            return await analyze_profile(profile)
@@ -1,25 +1,132 @@
 import asyncio
+import codecs
+import json
 import logging
-from typing import Any, Dict
+import time
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
 
 import httpx
 
 from app.core.config import get_settings
 from app.models.instagram import InstagramProfile
+from app.services import metrics, progress, snapshot_ledger
+from app.services.cache import ModelCache, build_cache_backend
+from app.services.coordination import get_leases
+from app.services.datasets import BrightDataDataset, datasets
+from app.services.jsonstream import JSONArrayStream
+from app.services.limits import (
+    brightdata_progress_limiter,
+    brightdata_snapshot_limiter,
+    brightdata_trigger_limiter,
+)
+from app.services.polling import poll_scheduler
+from app.services.singleflight import SingleFlight
+from app.services.snapshot_ledger import get_snapshot_ledger
+from app.services.snapshot_notifier import notifier
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+_http_client: httpx.AsyncClient | None = None
+_profile_flight: SingleFlight[InstagramProfile] = SingleFlight("profile fetch")
+
+
 class BrightDataError(Exception):
     """Raised when the Bright Data API returns an error or invalid response."""
 
 
-async def fetch_instagram_profile(username: str) -> InstagramProfile:
+_snapshot_flight: SingleFlight[Dict[str, InstagramProfile | BrightDataError]] = (
+    SingleFlight("snapshot collect")
+)
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for every Bright Data request.
+
+    Returns:
+        An :class:`httpx.AsyncClient` configured with keep-alive pooling and,
+        when enabled, HTTP/2.
+    """
+
+    limits = httpx.Limits(
+        max_connections=settings.brightdata_max_connections,
+        max_keepalive_connections=settings.brightdata_max_keepalive_connections,
+        keepalive_expiry=settings.brightdata_keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        timeout=settings.brightdata_http_timeout,
+        limits=limits,
+        http2=settings.brightdata_http2,
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the shared Bright Data HTTP client.
+
+    Intended to be called once from the application lifespan. Calling it again
+    while a client is open returns the existing instance.
+
+    Returns:
+        The shared :class:`httpx.AsyncClient`.
+    """
+
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+        logger.info(
+            "Opened Bright Data HTTP client (http2=%s, max_connections=%s)",
+            settings.brightdata_http2,
+            settings.brightdata_max_connections,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared Bright Data HTTP client and release its connections."""
+
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Closed Bright Data HTTP client")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared Bright Data HTTP client.
+
+    The client is normally opened by the application lifespan. When the service
+    is used outside of FastAPI (scripts, notebooks) it is created lazily on
+    first use and should be closed with :func:`close_http_client`.
+
+    Returns:
+        The shared :class:`httpx.AsyncClient`.
+    """
+
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+async def fetch_instagram_profile(
+    username: str, max_age: Optional[float] = None
+) -> InstagramProfile:
     """Fetch and normalize an Instagram profile using the Bright Data API.
 
+    Fresh profiles are served from the profile cache. Concurrent calls for the
+    same (normalized) username share one snapshot.
+
     Args:
         username: The Instagram handle to fetch, without the leading ``@``.
+        max_age: Optional maximum age in seconds of a cached profile. ``None``
+            uses the cache TTL, ``0`` forces a new scrape.
 
     Returns:
         A populated :class:`InstagramProfile` built from the Bright Data dataset.
@@ -29,25 +136,693 @@ async def fetch_instagram_profile(username: str) -> InstagramProfile:
             returns an unexpected response.
     """
 
-    if (
-        not settings.brightdata_api_token
-        or not settings.brightdata_instagram_dataset_id
+    username = normalize_username(username)
+
+    with progress.bind(username):
+        cached = await get_profile_cache().get(_profile_cache_key(username), max_age)
+        if cached is not None:
+            logger.info("Profile cache hit for %s", username)
+            progress.emit("profile_cache_hit")
+            return cached
+
+        return await _profile_flight.do(
+            username, lambda: _fetch_instagram_profile(username, max_age)
+        )
+
+
+async def _fetch_instagram_profile(
+    username: str, max_age: Optional[float]
+) -> InstagramProfile:
+    """Fetch one username while holding its cross-process lease.
+
+    A worker that had to wait for the lease re-reads the profile cache first:
+    the holder has usually just stored the profile. Anything stored while it
+    waited counts as fresh, even under ``max_age=0``.
+    """
+
+    started = time.time()
+    async with get_leases().exclusive(f"profile:{username}") as waited:
+        if waited:
+            if max_age is not None:
+                max_age = max(max_age, time.time() - started)
+            cached = await get_profile_cache().get(
+                _profile_cache_key(username), max_age
+            )
+            if cached is not None:
+                logger.info("Profile fetched by another worker for %s", username)
+                progress.emit("profile_cache_hit")
+                return cached
+        return await _scrape_instagram_profile(username, max_age)
+
+
+async def _scrape_instagram_profile(
+    username: str, max_age: Optional[float]
+) -> InstagramProfile:
+    """Run the trigger, wait and download cycle for a single username.
+
+    A snapshot recorded in the ledger for ``username`` is collected instead of
+    triggering a new one when it is recent enough: see
+    :func:`_find_reusable_snapshot`.
+    """
+
+    dataset = datasets.get("profiles")
+    headers = _auth_headers(dataset)
+    client = get_http_client()
+    ledger = get_snapshot_ledger()
+    with (
+        metrics.profile_fetch_seconds.time(),
+        metrics.profile_fetches_in_flight.track_inprogress(),
     ):
+        result: InstagramProfile | BrightDataError | None = None
+        entry = await _find_reusable_snapshot(dataset, username, max_age)
+        if entry is not None:
+            try:
+                results = await _collect_recorded_snapshot(
+                    client, headers, dataset, entry
+                )
+                result = results[username]
+            except BrightDataError as exc:
+                result = exc
+            # An error row in a recorded snapshot may have been transient: it
+            # is worth a fresh scrape, as is a snapshot that failed outright.
+            if isinstance(result, BrightDataError):
+                logger.warning(
+                    "Recorded snapshot %s failed for %s, triggering a new one: %s",
+                    entry.snapshot_id,
+                    username,
+                    result,
+                )
+                result = None
+
+        if result is None:
+            snapshot_id = await _trigger_snapshot(
+                client, headers, dataset, [{"user_name": username}]
+            )
+            await ledger.record(dataset.dataset_id, snapshot_id, [username])
+            results = await _collect_snapshot(
+                client, headers, dataset, snapshot_id, [username]
+            )
+            result = results[username]
+
+    if isinstance(result, BrightDataError):
+        raise result
+    logger.info("Successfully built InstagramProfile for %s", result.username)
+    return result
+
+
+async def fetch_instagram_profiles(
+    usernames: Sequence[str], max_age: Optional[float] = None
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Fetch many Instagram profiles with as few Bright Data snapshots as possible.
+
+    Usernames are de-duplicated and looked up in the profile cache first.
+    Usernames another call is already fetching join that call, as in
+    :func:`fetch_instagram_profile`; the rest are claimed so single fetches
+    join the batch instead, and sent in chunks of at most
+    ``brightdata_batch_max_size`` per trigger. Chunks run concurrently and the
+    records of each snapshot are matched back to the requested usernames.
+
+    Args:
+        usernames: Instagram handles to fetch, with or without the leading
+            ``@``.
+        max_age: Optional maximum age in seconds of cached profiles, as in
+            :func:`fetch_instagram_profile`.
+
+    Returns:
+        A mapping from each normalized username to its :class:`InstagramProfile`,
+        or to the :class:`BrightDataError` explaining why it is missing.
+
+    Raises:
+        BrightDataError: If the Bright Data credentials are not configured.
+    """
+
+    unique = list(dict.fromkeys(normalize_username(u) for u in usernames if u))
+    cache = get_profile_cache()
+
+    results: Dict[str, InstagramProfile | BrightDataError] = {}
+    missing: List[str] = []
+    for username in unique:
+        cached = await cache.get(_profile_cache_key(username), max_age)
+        if cached is not None:
+            results[username] = cached
+        else:
+            missing.append(username)
+
+    if not missing:
+        return results
+
+    dataset = datasets.get("profiles")
+    headers = _auth_headers(dataset)
+    client = get_http_client()
+
+    outcomes = await _profile_flight.do_many(
+        missing,
+        lambda claimed: _fetch_profile_batch(
+            client, headers, dataset, claimed, max_age
+        ),
+    )
+    for username, outcome in outcomes.items():
+        if isinstance(outcome, (InstagramProfile, BrightDataError)):
+            results[username] = outcome
+        else:
+            results[username] = BrightDataError(
+                f"Could not fetch {username}: {outcome!r}"
+            )
+    return {username: results[username] for username in unique}
+
+
+async def fetch_dataset_records(
+    name: str, inputs: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Run one snapshot of a registered dataset and return all of its records.
+
+    Args:
+        name: The dataset name in :data:`app.services.datasets.datasets`, e.g.
+            ``"posts"`` or ``"serp"``.
+        inputs: The trigger inputs, in the shape the dataset expects.
+
+    Returns:
+        The snapshot records, error rows included.
+
+    Raises:
+        KeyError: If the dataset is not registered.
+        BrightDataError: If the dataset is not configured or the snapshot
+            fails.
+    """
+
+    dataset = datasets.get(name)
+    headers = _auth_headers(dataset)
+    client = get_http_client()
+    snapshot_id = await _trigger_snapshot(client, headers, dataset, inputs)
+    await _wait_for_snapshot_ready(client, headers, dataset, snapshot_id)
+    return [
+        record
+        async for record in _iter_snapshot_records(
+            client, headers, dataset, snapshot_id
+        )
+    ]
+
+
+@lru_cache
+def get_profile_cache() -> ModelCache[InstagramProfile]:
+    """Return the cache of normalized profiles configured in the settings.
+
+    Returns:
+        A :class:`ModelCache` of :class:`InstagramProfile` entries.
+    """
+
+    backend = build_cache_backend(
+        settings.profile_cache_backend,
+        namespace="instagram_profile",
+        ttl=settings.profile_cache_ttl,
+        max_entries=settings.profile_cache_max_entries,
+        sqlite_path=settings.cache_sqlite_path,
+    )
+    return ModelCache(backend, InstagramProfile, name="profile")
+
+
+def _profile_cache_key(username: str) -> str:
+    return f"instagram:profile:{username}"
+
+
+async def _fetch_profile_batch(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    usernames: List[str],
+    max_age: Optional[float],
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Fetch the usernames a batch claimed while holding their leases.
+
+    Leases are taken in sorted order, so two batches cannot deadlock. As in
+    :func:`_fetch_instagram_profile`, usernames whose lease had to be waited
+    for are looked up in the profile cache again before anything is
+    triggered.
+
+    Returns:
+        A mapping from each username to its profile or error.
+    """
+
+    results: Dict[str, InstagramProfile | BrightDataError] = {}
+    started = time.time()
+    async with AsyncExitStack() as leases:
+        waited = [
+            username
+            for username in sorted(usernames)
+            if await leases.enter_async_context(
+                get_leases().exclusive(f"profile:{username}")
+            )
+        ]
+        if waited and max_age is not None:
+            max_age = max(max_age, time.time() - started)
+        for username in waited:
+            cached = await get_profile_cache().get(
+                _profile_cache_key(username), max_age
+            )
+            if cached is not None:
+                results[username] = cached
+        if results:
+            logger.info("%s profile(s) fetched by another worker", len(results))
+
+        missing = [username for username in usernames if username not in results]
+        if missing:
+            reused = await _collect_reusable_snapshots(
+                client, headers, dataset, missing, max_age
+            )
+            results.update(reused)
+            missing = [username for username in missing if username not in reused]
+        if not missing:
+            return results
+
+        size = max(1, settings.brightdata_batch_max_size)
+        chunks = [missing[i : i + size] for i in range(0, len(missing), size)]
+        logger.info(
+            "Fetching %s profiles in %s snapshot(s) (%s cached or reused)",
+            len(missing),
+            len(chunks),
+            len(results),
+        )
+        chunk_results = await asyncio.gather(
+            *(_fetch_profile_chunk(client, headers, dataset, chunk) for chunk in chunks)
+        )
+    for chunk_result in chunk_results:
+        results.update(chunk_result)
+    return results
+
+
+async def _fetch_profile_chunk(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    usernames: List[str],
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Fetch one trigger-sized chunk of profiles and split the snapshot.
+
+    Any failure, including back-pressure from the upstream limiters, becomes
+    an error for every username of the chunk, so sibling chunks carry on.
+
+    Args:
+        client: The HTTP client used to communicate with Bright Data.
+        headers: HTTP headers including authorization metadata.
+        dataset: The profiles dataset.
+        usernames: Normalized usernames that fit in a single trigger.
+
+    Returns:
+        A mapping from each username in the chunk to its profile or error.
+    """
+
+    try:
+        with progress.bind(*usernames):
+            snapshot_id = await _trigger_snapshot(
+                client, headers, dataset, [{"user_name": u} for u in usernames]
+            )
+            await get_snapshot_ledger().record(
+                dataset.dataset_id, snapshot_id, usernames
+            )
+            results = await _collect_snapshot(
+                client, headers, dataset, snapshot_id, usernames
+            )
+    except BrightDataError as exc:
+        return {username: exc for username in usernames}
+    except Exception as exc:
+        logger.warning("Snapshot chunk of %s profiles failed: %s", len(usernames), exc)
+        error = BrightDataError(f"Could not fetch profiles: {exc}")
+        return {username: error for username in usernames}
+
+    logger.info(
+        "Snapshot %s matched %s/%s profiles",
+        snapshot_id,
+        sum(isinstance(r, InstagramProfile) for r in results.values()),
+        len(usernames),
+    )
+    return results
+
+
+async def _find_reusable_snapshot(
+    dataset: BrightDataDataset, username: str, max_age: Optional[float]
+) -> Optional[snapshot_ledger.SnapshotEntry]:
+    """Look up a recorded snapshot of ``username`` to collect instead of a trigger.
+
+    A snapshot that is already built is preferred, since it downloads without
+    a build wait: it must have been triggered within
+    ``brightdata_snapshot_reuse_max_age`` (``0`` turns reuse off). Otherwise a
+    snapshot that is still outstanding, e.g. one a restart interrupted, is
+    attached to. Neither may be older than ``max_age``, or the profile cache
+    TTL when ``max_age`` is ``None``.
+
+    Args:
+        dataset: The profiles dataset.
+        username: The normalized username.
+        max_age: The caller's maximum data age in seconds.
+
+    Returns:
+        The ledger entry to collect, or ``None`` to trigger a new snapshot.
+    """
+
+    ledger = get_snapshot_ledger()
+    freshness = settings.profile_cache_ttl if max_age is None else max_age
+    now = time.time()
+
+    reuse_age = min(freshness, settings.brightdata_snapshot_reuse_max_age)
+    if reuse_age > 0:
+        entry = await ledger.find(
+            dataset.dataset_id,
+            username,
+            (snapshot_ledger.READY, snapshot_ledger.DOWNLOADED),
+            since=now - reuse_age,
+        )
+        if entry is not None:
+            logger.info("Reusing snapshot %s for %s", entry.snapshot_id, username)
+            return entry
+
+    entry = await ledger.find(
+        dataset.dataset_id, username, snapshot_ledger.OUTSTANDING, since=now - freshness
+    )
+    if entry is not None:
+        logger.info(
+            "Attaching %s to outstanding snapshot %s", username, entry.snapshot_id
+        )
+    return entry
+
+
+async def _collect_reusable_snapshots(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    usernames: List[str],
+    max_age: Optional[float],
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Collect the recorded snapshots that cover some of ``usernames``.
+
+    Usernames sharing a snapshot are collected with one download. Usernames
+    whose snapshot fails, or holds an error row for them, are left out, so
+    the caller triggers them afresh.
+
+    Returns:
+        The results of the usernames that were covered by a recorded snapshot.
+    """
+
+    entries: Dict[str, snapshot_ledger.SnapshotEntry] = {}
+    wanted: Dict[str, List[str]] = {}
+    for username in usernames:
+        entry = await _find_reusable_snapshot(dataset, username, max_age)
+        if entry is not None:
+            entries[entry.snapshot_id] = entry
+            wanted.setdefault(entry.snapshot_id, []).append(username)
+
+    results: Dict[str, InstagramProfile | BrightDataError] = {}
+    collected = await asyncio.gather(
+        *(
+            _collect_recorded_snapshot(client, headers, dataset, entry)
+            for entry in entries.values()
+        ),
+        return_exceptions=True,
+    )
+    for entry, outcome in zip(entries.values(), collected):
+        if isinstance(outcome, BrightDataError):
+            logger.warning(
+                "Recorded snapshot %s failed, triggering a new one: %s",
+                entry.snapshot_id,
+                outcome,
+            )
+            continue
+        if isinstance(outcome, BaseException):
+            raise outcome
+        for username in wanted[entry.snapshot_id]:
+            if isinstance(outcome[username], InstagramProfile):
+                results[username] = outcome[username]
+    return results
+
+
+async def _collect_recorded_snapshot(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    entry: snapshot_ledger.SnapshotEntry,
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Collect a snapshot from the ledger instead of triggering a new one."""
+
+    reused = entry.status in (snapshot_ledger.READY, snapshot_ledger.DOWNLOADED)
+    reason = "reused" if reused else "attached"
+    metrics.snapshots_reused.labels(dataset.name, reason).inc()
+    progress.emit(f"snapshot_{reason}", snapshot_id=entry.snapshot_id)
+    with progress.bind(*entry.usernames):
+        return await _collect_snapshot(
+            client,
+            headers,
+            dataset,
+            entry.snapshot_id,
+            entry.usernames,
+            wait=not reused,
+            triggered_at=entry.triggered_at,
+        )
+
+
+async def _collect_snapshot(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    snapshot_id: str,
+    usernames: List[str],
+    wait: bool = True,
+    triggered_at: Optional[float] = None,
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Collect a profiles snapshot, once per process however many want it.
+
+    The trigger path, ledger reuse and startup resume can all reach the same
+    snapshot; they share one :func:`_download_snapshot`, whose arguments come
+    from the first caller.
+    """
+
+    return await _snapshot_flight.do(
+        snapshot_id,
+        lambda: _download_snapshot(
+            client,
+            headers,
+            dataset,
+            snapshot_id,
+            usernames,
+            wait=wait,
+            triggered_at=triggered_at,
+        ),
+    )
+
+
+async def _download_snapshot(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    snapshot_id: str,
+    usernames: List[str],
+    wait: bool = True,
+    triggered_at: Optional[float] = None,
+) -> Dict[str, InstagramProfile | BrightDataError]:
+    """Wait for a triggered profiles snapshot and split it by username.
+
+    A snapshot of one username only needs its first record; larger ones are
+    matched record by record. Profiles are stored in the profile cache and the
+    outcome in the snapshot ledger.
+
+    Args:
+        client: The HTTP client used to communicate with Bright Data.
+        headers: HTTP headers including authorization metadata.
+        dataset: The profiles dataset.
+        snapshot_id: The snapshot to collect.
+        usernames: The normalized usernames the snapshot was triggered for.
+        wait: Whether to wait for the snapshot to be ready; ``False`` for a
+            snapshot the ledger already knows to be built.
+        triggered_at: When a snapshot recorded earlier was triggered. Its
+            profiles are cached as of then, so a reused snapshot does not pass
+            later ``max_age`` checks as fresh data. ``None`` means now.
+
+    Returns:
+        A mapping from each username to its profile or error.
+
+    Raises:
+        BrightDataError: If the snapshot fails or cannot be downloaded.
+    """
+
+    ledger = get_snapshot_ledger()
+    results: Dict[str, InstagramProfile | BrightDataError] = {}
+    try:
+        if wait:
+            await _wait_for_snapshot_ready(client, headers, dataset, snapshot_id)
+            await ledger.set_status(snapshot_id, snapshot_ledger.READY)
+        if len(usernames) == 1:
+            record = await _fetch_snapshot_profile(
+                client, headers, dataset, snapshot_id
+            )
+            results[usernames[0]] = _record_result(record, usernames[0])
+        else:
+            wanted = set(usernames)
+            async for record in _iter_snapshot_records(
+                client, headers, dataset, snapshot_id
+            ):
+                username = _record_username(record)
+                if username in wanted and username not in results:
+                    results[username] = _record_result(record, username)
+    except BrightDataError as exc:
+        await ledger.set_status(snapshot_id, snapshot_ledger.FAILED, str(exc))
+        raise
+    # An entry that expired meanwhile is older than the profile cache TTL or
+    # was superseded by a newer snapshot: its profiles must not be cached.
+    current = await ledger.set_status(snapshot_id, snapshot_ledger.DOWNLOADED)
+    if not current:
+        logger.info(
+            "Snapshot %s expired while downloading, not caching it", snapshot_id
+        )
+
+    cache = get_profile_cache()
+    for username in usernames:
+        result = results.setdefault(
+            username,
+            BrightDataError(f"Snapshot {snapshot_id} has no record for {username}"),
+        )
+        if current and isinstance(result, InstagramProfile):
+            await cache.set(
+                _profile_cache_key(username), result, stored_at=triggered_at
+            )
+    return results
+
+
+async def resume_outstanding_snapshots() -> int:
+    """Collect the profile snapshots a previous run triggered but never read.
+
+    Runs at startup. Snapshots older than the profile cache TTL are marked
+    expired rather than downloaded, and the profiles of the others are cached
+    as of their trigger, so they expire within the TTL of the scrape. Under several workers each snapshot is
+    collected by one of them.
+
+    Returns:
+        The number of snapshots that were outstanding.
+    """
+
+    dataset = datasets.get("profiles")
+    try:
+        headers = _auth_headers(dataset)
+    except BrightDataError:
+        return 0
+
+    entries = await get_snapshot_ledger().outstanding(
+        dataset.dataset_id, since=time.time() - settings.profile_cache_ttl
+    )
+    if entries:
+        logger.info("Resuming %s outstanding snapshot(s)", len(entries))
+    client = get_http_client()
+    await asyncio.gather(
+        *(_resume_snapshot(client, headers, dataset, entry) for entry in entries)
+    )
+    return len(entries)
+
+
+async def _resume_snapshot(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    entry: snapshot_ledger.SnapshotEntry,
+) -> None:
+    ledger = get_snapshot_ledger()
+    async with get_leases().exclusive(f"snapshot:{entry.snapshot_id}") as waited:
+        if waited:
+            current = await ledger.get(entry.snapshot_id)
+            if current is None or current.status not in snapshot_ledger.OUTSTANDING:
+                return
+        try:
+            with progress.bind(*entry.usernames):
+                await _collect_snapshot(
+                    client,
+                    headers,
+                    dataset,
+                    entry.snapshot_id,
+                    entry.usernames,
+                    triggered_at=entry.triggered_at,
+                )
+            metrics.snapshots_reused.labels(dataset.name, "resumed").inc()
+            logger.info("Resumed snapshot %s", entry.snapshot_id)
+        except BrightDataError as exc:
+            logger.warning("Could not resume snapshot %s: %s", entry.snapshot_id, exc)
+        except Exception:
+            logger.exception("Unexpected error resuming snapshot %s", entry.snapshot_id)
+
+
+def normalize_username(username: str) -> str:
+    """Normalize an Instagram handle for comparisons and lookups.
+
+    Args:
+        username: A handle as typed by a user, possibly with ``@`` or spaces.
+
+    Returns:
+        The lowercase handle without surrounding whitespace or ``@``.
+    """
+
+    return username.strip().lstrip("@").lower()
+
+
+def _record_username(record: Dict[str, Any]) -> str:
+    """Return the normalized username a snapshot record belongs to.
+
+    The scraped ``account`` is preferred. The echoed ``input`` (``user_name``
+    or profile ``url``) is used when the account is missing, e.g. in error rows.
+    """
+
+    account = record.get("account")
+    if account:
+        return normalize_username(str(account))
+
+    inputs = record.get("input") or {}
+    if inputs.get("user_name"):
+        return normalize_username(str(inputs["user_name"]))
+    if inputs.get("url"):
+        path = urlparse(str(inputs["url"])).path.strip("/")
+        return normalize_username(path.split("/")[0]) if path else ""
+    return ""
+
+
+def _record_result(
+    record: Dict[str, Any], username: str
+) -> InstagramProfile | BrightDataError:
+    """Turn a snapshot record into a profile, or an error for error rows."""
+
+    error = _record_error(record)
+    if error:
+        return BrightDataError(f"Bright Data could not scrape {username}: {error}")
+    return _build_profile(record, username)
+
+
+def _auth_headers(dataset: BrightDataDataset) -> Dict[str, str]:
+    """Return the Bright Data request headers.
+
+    Args:
+        dataset: The dataset about to be queried.
+
+    Raises:
+        BrightDataError: If the Bright Data credentials or the dataset ID are
+            not configured.
+    """
+
+    if not settings.brightdata_api_token or not dataset.dataset_id:
         raise BrightDataError(
-            "Bright Data credentials or dataset ID are not configured"
+            f"Bright Data credentials or {dataset.name} dataset ID are not configured"
         )
 
-    headers = {
+    return {
         "Authorization": f"Bearer {settings.brightdata_api_token}",
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        snapshot_id = await _trigger_snapshot(client, headers, username)
-        await _wait_for_snapshot_ready(client, headers, snapshot_id)
-        raw_profile = await _fetch_snapshot_profile(client, headers, snapshot_id)
 
-    profile = InstagramProfile(
+def _build_profile(raw_profile: Dict[str, Any], username: str) -> InstagramProfile:
+    """Normalize a raw Bright Data profile record into an InstagramProfile.
+
+    Args:
+        raw_profile: A single record from the Bright Data snapshot.
+        username: The requested username, used when the record has no account.
+
+    Returns:
+        The normalized :class:`InstagramProfile`.
+    """
+
+    return InstagramProfile(
         username=raw_profile.get("account") or username,
         full_name=raw_profile.get("profile_name") or raw_profile.get("full_name"),
         bio=raw_profile.get("biography"),
@@ -64,21 +839,20 @@ async def fetch_instagram_profile(username: str) -> InstagramProfile:
         raw=raw_profile,
     )
 
-    logger.info("Successfully built InstagramProfile for %s", profile.username)
-    return profile
-
 
 async def _trigger_snapshot(
     client: httpx.AsyncClient,
     headers: Dict[str, str],
-    username: str,
+    dataset: BrightDataDataset,
+    inputs: List[Dict[str, Any]],
 ) -> str:
-    """Trigger a Bright Data snapshot request for an Instagram username.
+    """Trigger a Bright Data snapshot for one or more dataset inputs.
 
     Args:
         client: The HTTP client used to communicate with Bright Data.
         headers: HTTP headers including authorization metadata.
-        username: The Instagram handle to request.
+        dataset: The dataset to trigger.
+        inputs: The trigger inputs, e.g. ``{"user_name": ...}`` for profiles.
 
     Returns:
         The Bright Data ``snapshot_id`` that can be polled for progress.
@@ -88,18 +862,29 @@ async def _trigger_snapshot(
             a ``snapshot_id``.
     """
 
-    trigger_url = (
-        "https://api.brightdata.com/datasets/v3/trigger"
-        f"?dataset_id={settings.brightdata_instagram_dataset_id}"
-        "&include_errors=true"
-        "&type=discover_new"
-        "&discover_by=user_name"
-    )
+    trigger_url = dataset.url("trigger")
+    params: Dict[str, str] = {
+        "dataset_id": dataset.dataset_id or "",
+        "include_errors": "true",
+        **dataset.trigger_params,
+    }
+    if settings.brightdata_notify_url:
+        params["notify"] = settings.brightdata_notify_url
+        if settings.brightdata_notify_secret:
+            params["auth_header"] = settings.brightdata_notify_secret
 
-    payload = [{"user_name": username}]
-    logger.info("Triggering Bright Data scrape for username=%s", username)
+    if len(inputs) == 1:
+        logger.info("Triggering Bright Data %s scrape for %s", dataset.name, inputs[0])
+    else:
+        logger.info(
+            "Triggering Bright Data %s scrape for %s inputs", dataset.name, len(inputs)
+        )
 
-    resp = await client.post(trigger_url, headers=headers, json=payload)
+    with metrics.trigger_seconds.time():
+        async with brightdata_trigger_limiter.acquire():
+            resp = await client.post(
+                trigger_url, headers=headers, json=inputs, params=params
+            )
     try:
         resp.raise_for_status()
     except httpx.HTTPStatusError as exc:
@@ -116,19 +901,135 @@ async def _trigger_snapshot(
         raise BrightDataError(f"Unexpected trigger response (no snapshot_id): {data}")
 
     logger.info("Snapshot ID from trigger: %s", snapshot_id)
+    progress.emit("snapshot_triggered", snapshot_id=snapshot_id)
     return snapshot_id
 
 
 async def _wait_for_snapshot_ready(
     client: httpx.AsyncClient,
     headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    snapshot_id: str,
+) -> None:
+    """Wait until a Bright Data snapshot finishes building.
+
+    When ``BRIGHTDATA_NOTIFY_URL`` is configured the trigger registered a
+    completion callback, so this waits for the notify route instead of
+    polling. Otherwise it polls the progress endpoint.
+
+    Args:
+        client: The HTTP client used to communicate with Bright Data.
+        headers: HTTP headers including authorization metadata.
+        dataset: The dataset the snapshot belongs to.
+        snapshot_id: The identifier returned by :func:`_trigger_snapshot`.
+
+    Raises:
+        BrightDataError: If polling fails, the snapshot reports an error, or the
+            maximum wait time is exceeded.
+    """
+
+    with metrics.snapshot_build_seconds.time():
+        if settings.brightdata_notify_url:
+            await _wait_for_snapshot_notification(client, headers, dataset, snapshot_id)
+        else:
+            await _poll_snapshot_progress(client, headers, dataset, snapshot_id)
+
+
+async def _wait_for_snapshot_notification(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    snapshot_id: str,
+) -> None:
+    """Wait for the Bright Data completion callback of a snapshot.
+
+    A single progress check runs every ``brightdata_notify_check_interval``
+    seconds as a fallback, so a lost callback delays the result instead of
+    failing it.
+
+    Args:
+        client: The HTTP client used to communicate with Bright Data.
+        headers: HTTP headers including authorization metadata.
+        dataset: The dataset the snapshot belongs to.
+        snapshot_id: The identifier returned by :func:`_trigger_snapshot`.
+
+    Raises:
+        BrightDataError: If the snapshot reports an error or the maximum wait
+            time is exceeded.
+    """
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + dataset.max_wait_time
+    check_interval = settings.brightdata_notify_check_interval
+    future = notifier.register(snapshot_id)
+    last_status = None
+
+    logger.info("Waiting for notify callback for snapshot %s", snapshot_id)
+
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            try:
+                data = await asyncio.wait_for(
+                    asyncio.shield(future), timeout=min(check_interval, remaining)
+                )
+            except asyncio.TimeoutError:
+                logger.info(
+                    "No callback yet for snapshot %s, checking progress", snapshot_id
+                )
+                data = await _get_snapshot_progress(
+                    client, headers, dataset, snapshot_id
+                )
+
+            status = _snapshot_status(data)
+            last_status = status
+
+            if status in ("ready", "completed", "done"):
+                logger.info("Snapshot %s is %s", snapshot_id, status)
+                progress.emit("snapshot_ready", snapshot_id=snapshot_id)
+                return
+
+            progress.emit(
+                "snapshot_building",
+                snapshot_id=snapshot_id,
+                status=status,
+                **_progress_details(data),
+            )
+
+            if status in ("failed", "error"):
+                raise BrightDataError(
+                    f"Bright Data snapshot {snapshot_id} failed: {data}"
+                )
+
+            if future.done():
+                future = notifier.pending(snapshot_id)
+    finally:
+        notifier.discard(snapshot_id)
+
+    raise BrightDataError(
+        f"Bright Data snapshot {snapshot_id} not ready after "
+        f"{dataset.max_wait_time} seconds (last status={last_status})"
+    )
+
+
+async def _poll_snapshot_progress(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
     snapshot_id: str,
 ) -> None:
     """Poll the Bright Data API until a snapshot finishes building.
 
+    Delays between polls come from :data:`poll_scheduler`, which backs off with
+    jitter and learns the typical time-to-ready of the dataset.
+
     Args:
         client: The HTTP client used to communicate with Bright Data.
         headers: HTTP headers including authorization metadata.
+        dataset: The dataset the snapshot belongs to.
         snapshot_id: The identifier returned by :func:`_trigger_snapshot`.
 
     Raises:
@@ -136,68 +1037,138 @@ async def _wait_for_snapshot_ready(
             maximum wait time is exceeded.
     """
 
-    progress_url = f"https://api.brightdata.com/datasets/v3/progress/{snapshot_id}"
-    interval = settings.brightdata_poll_interval
-    max_attempts = settings.brightdata_max_wait_time // interval
+    dataset_id = dataset.dataset_id
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    deadline = started_at + dataset.max_wait_time
+    delays = poll_scheduler.delays(
+        dataset_id,
+        initial_delay=dataset.poll_initial_delay,
+        max_delay=dataset.poll_interval,
+    )
 
     logger.info(
-        "Polling snapshot %s (max %s attempts, %ss interval)",
+        "Polling snapshot %s (max %ss, expected ready in ~%ss)",
         snapshot_id,
-        max_attempts,
-        interval,
+        dataset.max_wait_time,
+        poll_scheduler.expected_ready_time(dataset_id),
     )
 
     last_status = None
+    attempt = 0
 
-    for attempt in range(1, max_attempts + 1):
-        if attempt > 1:
-            await asyncio.sleep(interval)
-
-        logger.debug(
-            "Progress attempt %s/%s for snapshot %s",
-            attempt,
-            max_attempts,
-            snapshot_id,
-        )
-
-        resp = await client.get(progress_url, headers=headers)
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as exc:
-            logger.error("Progress error: %s", exc.response.text)
-            raise BrightDataError(
-                f"Bright Data progress error: {exc.response.text}"
-            ) from exc
-
-        data = resp.json()
-        logger.debug("Progress data: %s", data)
+    while True:
+        attempt += 1
+        logger.debug("Progress attempt %s for snapshot %s", attempt, snapshot_id)
 
-        status = (data or {}).get("status") or (data or {}).get("state")
+        data = await _get_snapshot_progress(client, headers, dataset, snapshot_id)
+        status = _snapshot_status(data)
         last_status = status
 
         if status in ("ready", "completed", "done"):
-            logger.info("Snapshot %s is %s", snapshot_id, status)
+            elapsed = loop.time() - started_at
+            poll_scheduler.record(dataset_id, elapsed)
+            logger.info(
+                "Snapshot %s is %s after %.1fs (%s polls)",
+                snapshot_id,
+                status,
+                elapsed,
+                attempt,
+            )
+            progress.emit("snapshot_ready", snapshot_id=snapshot_id)
             return
 
         if status in ("failed", "error"):
             raise BrightDataError(f"Bright Data snapshot {snapshot_id} failed: {data}")
 
+        progress.emit(
+            "snapshot_building",
+            snapshot_id=snapshot_id,
+            status=status,
+            **_progress_details(data),
+        )
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(next(delays), remaining))
+
     raise BrightDataError(
         f"Bright Data snapshot {snapshot_id} not ready after "
-        f"{settings.brightdata_max_wait_time} seconds (last status={last_status})"
+        f"{dataset.max_wait_time} seconds (last status={last_status})"
     )
 
 
+async def _get_snapshot_progress(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    snapshot_id: str,
+) -> Dict[str, Any]:
+    """Fetch the current progress payload of a snapshot.
+
+    Args:
+        client: The HTTP client used to communicate with Bright Data.
+        headers: HTTP headers including authorization metadata.
+        dataset: The dataset the snapshot belongs to.
+        snapshot_id: The identifier returned by :func:`_trigger_snapshot`.
+
+    Returns:
+        The decoded progress payload.
+
+    Raises:
+        BrightDataError: If the progress request fails.
+    """
+
+    progress_url = dataset.url(f"progress/{snapshot_id}")
+    metrics.poll_attempts.labels(dataset.name).inc()
+
+    async with brightdata_progress_limiter.acquire():
+        resp = await client.get(progress_url, headers=headers)
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        logger.error("Progress error: %s", exc.response.text)
+        raise BrightDataError(
+            f"Bright Data progress error: {exc.response.text}"
+        ) from exc
+
+    data = resp.json()
+    logger.debug("Progress data: %s", data)
+    return data or {}
+
+
+def _snapshot_status(data: Dict[str, Any]) -> str | None:
+    """Extract the snapshot status from a progress or callback payload."""
+
+    return data.get("status") or data.get("state")
+
+
+def _progress_details(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the numeric progress fields Bright Data reports, if any."""
+
+    return {
+        key: data[key]
+        for key in ("progress", "records", "errors", "collection_duration")
+        if key in data
+    }
+
+
 async def _fetch_snapshot_profile(
     client: httpx.AsyncClient,
     headers: Dict[str, str],
+    dataset: BrightDataDataset,
     snapshot_id: str,
 ) -> Dict[str, Any]:
     """Fetch the completed snapshot payload from Bright Data.
 
+    Only the first record is needed, so the download is closed as soon as it
+    has been parsed.
+
     Args:
         client: The HTTP client used to communicate with Bright Data.
         headers: HTTP headers including authorization metadata.
+        dataset: The dataset the snapshot belongs to.
         snapshot_id: The identifier returned by :func:`_trigger_snapshot`.
 
     Returns:
@@ -209,72 +1180,235 @@ async def _fetch_snapshot_profile(
             the snapshot never becomes available.
     """
 
-    snapshot_url = f"https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}"
-    interval = settings.brightdata_poll_interval
-    max_attempts = 5
+    started = time.perf_counter()
+    records = _iter_snapshot_records(client, headers, dataset, snapshot_id)
+    try:
+        profile = await anext(records)
+    except StopAsyncIteration:
+        raise BrightDataError(f"Snapshot {snapshot_id} has no records")
+    finally:
+        await records.aclose()
+
+    metrics.snapshot_download_seconds.observe(time.perf_counter() - started)
+    metrics.snapshot_records.labels(dataset.name).inc()
+
+    progress.emit("snapshot_downloaded", snapshot_id=snapshot_id, records=1)
+    return profile
+
+
+async def _iter_snapshot_records(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    dataset: BrightDataDataset,
+    snapshot_id: str,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the records of a completed snapshot from Bright Data.
+
+    The snapshot is requested in ``brightdata_snapshot_format`` (``ndjson`` or
+    ``json``) and parsed incrementally, so each record is yielded as soon as it
+    has been received and memory use does not grow with the snapshot size.
+    Error rows (from ``include_errors=true``) are yielded like any other
+    record; callers decide how to report them.
+
+    Args:
+        client: The HTTP client used to communicate with Bright Data.
+        headers: HTTP headers including authorization metadata.
+        dataset: The dataset the snapshot belongs to.
+        snapshot_id: The identifier returned by :func:`_trigger_snapshot`.
+
+    Yields:
+        Each record of the snapshot.
+
+    Raises:
+        BrightDataError: If the API returns an error, an unexpected payload, or
+            the snapshot is not available within the dataset's
+            ``max_wait_time``.
+    """
+
+    snapshot_url = dataset.url(f"snapshot/{snapshot_id}")
+    snapshot_format = settings.brightdata_snapshot_format
+    # A snapshot can answer 202 for a while after it reports ready, so retries
+    # are bounded by the dataset's wait budget rather than an attempt count.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + dataset.max_wait_time
+    delays = poll_scheduler.delays(
+        initial_delay=dataset.poll_initial_delay, max_delay=dataset.poll_interval
+    )
+    started = time.perf_counter()
+    attempt = 0
 
-    for attempt in range(1, max_attempts + 1):
+    while True:
+        attempt += 1
         logger.info(
-            "Fetching snapshot JSON (attempt %s/%s) from %s",
+            "Fetching snapshot %s (attempt %s) from %s",
+            snapshot_format,
             attempt,
-            max_attempts,
             snapshot_url,
         )
 
-        resp = await client.get(snapshot_url, headers=headers)
-
-        if resp.status_code == 202:
-            logger.info("Snapshot %s not ready yet (202 Accepted)", snapshot_id)
-        else:
-            try:
-                resp.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                logger.error("Snapshot fetch error: %s", exc.response.text)
-                raise BrightDataError(
-                    f"Bright Data snapshot fetch error: {exc.response.text}"
-                ) from exc
-
-            data = resp.json()
-            logger.debug("Snapshot data: %s", data)
-
-            if isinstance(data, list) and data:
-                profile = data[0]
-                if not isinstance(profile, dict):
-                    raise BrightDataError(
-                        f"Snapshot {snapshot_id} first item is not an object: {profile}"
-                    )
-                return profile
-
-            if isinstance(data, dict):
-                status = data.get("status")
-                message = str(data.get("message", "")).lower()
-
-                if status in ("building",) or "not ready yet" in message:
-                    logger.info(
-                        "Snapshot %s still building according to body (status=%s)",
-                        snapshot_id,
-                        status,
-                    )
-                elif (
-                    data.get("account")
-                    or data.get("profile_name")
-                    or data.get("full_name")
-                ):
-                    return data
+        records = 0
+        async with brightdata_snapshot_limiter.acquire():
+            async with client.stream(
+                "GET",
+                snapshot_url,
+                headers=headers,
+                params={"format": snapshot_format},
+            ) as resp:
+                if resp.status_code == 202:
+                    logger.info("Snapshot %s not ready yet (202 Accepted)", snapshot_id)
+                    metrics.snapshot_not_ready.labels(dataset.name).inc()
                 else:
-                    raise BrightDataError(
-                        f"Snapshot {snapshot_id} returned unexpected JSON object: {data}"
-                    )
+                    if resp.is_error:
+                        await resp.aread()
+                        logger.error("Snapshot fetch error: %s", resp.text)
+                        raise BrightDataError(
+                            f"Bright Data snapshot fetch error: {resp.text}"
+                        )
 
-            logger.info(
-                "Snapshot %s returned empty or invalid JSON structure: %s",
-                snapshot_id,
-                data,
-            )
+                    try:
+                        async for item in _parse_snapshot_body(resp, snapshot_format):
+                            if records == 0 and _is_not_ready_message(item):
+                                logger.info(
+                                    "Snapshot %s still building according to body "
+                                    "(status=%s)",
+                                    snapshot_id,
+                                    item.get("status"),
+                                )
+                                metrics.snapshot_not_ready.labels(dataset.name).inc()
+                                break
+                            records += 1
+                            yield _as_record(dataset, snapshot_id, item)
+                    except ValueError as exc:
+                        raise BrightDataError(
+                            f"Snapshot {snapshot_id} returned invalid JSON: {exc}"
+                        ) from exc
+
+                    if records:
+                        metrics.snapshot_download_seconds.observe(
+                            time.perf_counter() - started
+                        )
+                        metrics.snapshot_records.labels(dataset.name).inc(records)
+                        metrics.snapshot_bytes.labels(dataset.name).inc(
+                            resp.num_bytes_downloaded
+                        )
+                        progress.emit(
+                            "snapshot_downloaded",
+                            snapshot_id=snapshot_id,
+                            records=records,
+                            bytes=resp.num_bytes_downloaded,
+                        )
+                        return
 
-        if attempt < max_attempts:
-            await asyncio.sleep(interval)
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(next(delays), remaining))
 
     raise BrightDataError(
-        f"Snapshot {snapshot_id} not ready after {max_attempts} fetch attempts"
+        f"Snapshot {snapshot_id} not ready for download after "
+        f"{dataset.max_wait_time} seconds ({attempt} attempts)"
     )
+
+
+async def _parse_snapshot_body(
+    resp: httpx.Response, snapshot_format: str
+) -> AsyncIterator[Any]:
+    """Yield the top-level values of a streamed snapshot body as they arrive.
+
+    ``ndjson`` bodies are split on lines. A body starting with ``[`` is decoded
+    with :class:`JSONArrayStream` whatever format was requested, so snapshots
+    served as a JSON array still parse; a top-level object (such as a status
+    message) is yielded as a single value, even when it is pretty-printed
+    over several lines.
+
+    Raises:
+        ValueError: If the body is not valid JSON.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    stream: Optional[JSONArrayStream] = None
+    if snapshot_format != "ndjson":
+        stream = JSONArrayStream()
+    buffer = ""
+    parsed_line = False
+    whole_body = False
+
+    async for chunk in resp.aiter_bytes():
+        text = decoder.decode(chunk)
+        if stream is None:
+            buffer += text
+            if whole_body or not buffer.lstrip():
+                continue
+            if buffer.lstrip().startswith("["):
+                stream = JSONArrayStream()
+                text, buffer = buffer, ""
+            else:
+                *lines, rest = buffer.split("\n")
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        if parsed_line:
+                            raise
+                        # Not NDJSON but one value over several lines, such
+                        # as a pretty-printed status: read the body whole.
+                        whole_body = True
+                        break
+                    parsed_line = True
+                    yield item
+                if not whole_body:
+                    buffer = rest
+                continue
+        for item in stream.feed(text):
+            yield item
+
+    tail = decoder.decode(b"", final=True)
+    if stream is None:
+        buffer += tail
+        if buffer.strip():
+            yield json.loads(buffer)
+        return
+    for item in stream.feed(tail) + stream.close():
+        yield item
+
+
+def _is_not_ready_message(item: Any) -> bool:
+    """Tell a "snapshot is still building" body apart from a record."""
+
+    if not isinstance(item, dict) or item.get("account"):
+        return False
+    message = str(item.get("message", "")).lower()
+    return item.get("status") in ("building",) or "not ready yet" in message
+
+
+def _as_record(
+    dataset: BrightDataDataset, snapshot_id: str, record: Any
+) -> Dict[str, Any]:
+    """Check that a snapshot element looks like a record of ``dataset``.
+
+    Error rows are always accepted; other objects must carry one of the
+    dataset's ``record_keys``.
+    """
+
+    if not isinstance(record, dict):
+        raise BrightDataError(
+            f"Snapshot {snapshot_id} contains a record that is not an object: {record}"
+        )
+    if (
+        dataset.record_keys
+        and not _record_error(record)
+        and not any(record.get(key) for key in dataset.record_keys)
+    ):
+        raise BrightDataError(
+            f"Snapshot {snapshot_id} returned unexpected JSON object: {record}"
+        )
+    return record
+
+
+def _record_error(record: Dict[str, Any]) -> str | None:
+    """Return the error of an ``include_errors`` row, or ``None`` for a profile."""
+
+    error = record.get("error") or record.get("error_code")
+    return str(error) if error else None
@@ -0,0 +1,295 @@
+"""Local stand-in for the Bright Data datasets API.
+
+Implements the three endpoints the service uses (``trigger``, ``progress`` and
+``snapshot``) on top of fixture profiles, so load tests and CI can run the
+whole pipeline without spending Bright Data credits. Point the service at it
+with ``BRIGHTDATA_BASE_URL=http://127.0.0.1:8900/datasets/v3``.
+
+Usage: ``python -m app.services.brightdata_mock [--port 8900] [--build-latency 2]``
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+from fastapi import APIRouter, Body, FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.cohort import flatten_snapshots
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURES = "research/profiles.json"
+
+
+class MockSnapshot:
+    """A snapshot created by a trigger call, with its build schedule."""
+
+    def __init__(
+        self,
+        snapshot_id: str,
+        dataset_id: str,
+        records: List[Dict[str, Any]],
+        ready_at: float,
+        failed: bool,
+        not_ready_responses: int,
+    ) -> None:
+        self.snapshot_id = snapshot_id
+        self.dataset_id = dataset_id
+        self.records = records
+        self.ready_at = ready_at
+        self.failed = failed
+        self.not_ready_responses = not_ready_responses
+
+    @property
+    def status(self) -> str:
+        if time.monotonic() < self.ready_at:
+            return "running"
+        return "failed" if self.failed else "ready"
+
+
+class MockBrightData:
+    """In-memory Bright Data datasets API with tunable latency and failures.
+
+    Args:
+        fixtures: Raw profile records served for matching usernames.
+        build_latency: Seconds a snapshot spends in ``running`` after a trigger.
+        build_latency_jitter: Random spread applied to ``build_latency``, as a
+            fraction.
+        not_ready_responses: How many times a ready snapshot answers ``202``
+            before returning its records.
+        trigger_failure_rate: Probability that a trigger call fails with 500.
+        snapshot_failure_rate: Probability that a snapshot ends up ``failed``.
+        error_rate: Probability that a username yields an error row.
+        unknown_usernames: ``"clone"`` serves a copy of a fixture for usernames
+            without one, ``"error"`` returns an error row instead.
+        seed: Seed for the random generator, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        fixtures: List[Dict[str, Any]],
+        build_latency: float = 0.0,
+        build_latency_jitter: float = 0.0,
+        not_ready_responses: int = 0,
+        trigger_failure_rate: float = 0.0,
+        snapshot_failure_rate: float = 0.0,
+        error_rate: float = 0.0,
+        unknown_usernames: str = "clone",
+        seed: Optional[int] = None,
+    ) -> None:
+        if unknown_usernames not in ("clone", "error"):
+            raise ValueError("unknown_usernames must be 'clone' or 'error'")
+        self.fixtures = {
+            str(record["account"]).lower(): record
+            for record in flatten_snapshots(fixtures)
+        }
+        self.build_latency = build_latency
+        self.build_latency_jitter = build_latency_jitter
+        self.not_ready_responses = not_ready_responses
+        self.trigger_failure_rate = trigger_failure_rate
+        self.snapshot_failure_rate = snapshot_failure_rate
+        self.error_rate = error_rate
+        self.unknown_usernames = unknown_usernames
+        self.snapshots: Dict[str, MockSnapshot] = {}
+        self.requests: Dict[str, int] = {"trigger": 0, "progress": 0, "snapshot": 0}
+        self._random = random.Random(seed)
+        self._templates = list(self.fixtures.values())
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_FIXTURES, **kwargs: Any) -> "MockBrightData":
+        """Build a mock server from a snapshot export such as ``profiles.json``."""
+
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def build_app(self) -> FastAPI:
+        """Return the ASGI app serving the mocked ``/datasets/v3`` endpoints."""
+
+        app = FastAPI(title="Bright Data mock")
+        app.include_router(self._router(), prefix="/datasets/v3")
+        return app
+
+    def record_for(self, username: str) -> Dict[str, Any]:
+        """Return the record a scrape of ``username`` produces."""
+
+        username = username.strip().lstrip("@").lower()
+        if self._random.random() < self.error_rate:
+            return _error_row(username, "Injected failure")
+
+        record = self.fixtures.get(username)
+        if record is not None:
+            return record
+        if self.unknown_usernames == "error" or not self._templates:
+            return _error_row(username, "Profile not found")
+
+        template = self._templates[zlib.crc32(username.encode()) % len(self._templates)]
+        record = copy.deepcopy(template)
+        record["account"] = username
+        record["profile_url"] = f"https://instagram.com/{username}"
+        record["input"] = {"user_name": username}
+        return record
+
+    def _router(self) -> APIRouter:
+        router = APIRouter()
+
+        @router.post("/trigger")
+        async def trigger(
+            dataset_id: str = Query(...),
+            notify: Optional[str] = Query(None),
+            auth_header: Optional[str] = Query(None),
+            inputs: List[Dict[str, Any]] = Body(...),
+        ) -> Dict[str, str]:
+            self.requests["trigger"] += 1
+            if self._random.random() < self.trigger_failure_rate:
+                raise HTTPException(status_code=500, detail="Injected trigger failure")
+
+            latency = self.build_latency * (
+                1 + self._random.uniform(-1, 1) * self.build_latency_jitter
+            )
+            records = [self.record_for(_input_username(item)) for item in inputs]
+            snapshot = MockSnapshot(
+                snapshot_id=f"s_{uuid.uuid4().hex[:16]}",
+                dataset_id=dataset_id,
+                records=records,
+                ready_at=time.monotonic() + max(latency, 0.0),
+                failed=self._random.random() < self.snapshot_failure_rate,
+                not_ready_responses=self.not_ready_responses,
+            )
+            self.snapshots[snapshot.snapshot_id] = snapshot
+            if notify:
+                task = asyncio.create_task(_notify(snapshot, notify, auth_header))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return {"snapshot_id": snapshot.snapshot_id}
+
+        @router.get("/progress/{snapshot_id}")
+        async def snapshot_progress(snapshot_id: str) -> Dict[str, Any]:
+            self.requests["progress"] += 1
+            snapshot = self._get(snapshot_id)
+            data: Dict[str, Any] = {
+                "snapshot_id": snapshot_id,
+                "dataset_id": snapshot.dataset_id,
+                "status": snapshot.status,
+            }
+            if snapshot.status == "ready":
+                data["records"] = len(snapshot.records)
+            return data
+
+        @router.get("/snapshot/{snapshot_id}")
+        async def snapshot_download(
+            snapshot_id: str, format: str = Query("json")
+        ) -> Any:
+            self.requests["snapshot"] += 1
+            snapshot = self._get(snapshot_id)
+            if snapshot.status == "failed":
+                raise HTTPException(status_code=400, detail="Snapshot failed")
+            if snapshot.status != "ready" or snapshot.not_ready_responses > 0:
+                snapshot.not_ready_responses = max(snapshot.not_ready_responses - 1, 0)
+                return JSONResponse(
+                    status_code=202,
+                    content={
+                        "status": "building",
+                        "message": "Snapshot is not ready yet, try again in 10s",
+                    },
+                )
+            if format == "ndjson":
+                return StreamingResponse(
+                    _ndjson(snapshot.records), media_type="application/x-ndjson"
+                )
+            return JSONResponse(content=snapshot.records)
+
+        return router
+
+    def _get(self, snapshot_id: str) -> MockSnapshot:
+        snapshot = self.snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail="Snapshot not found")
+        return snapshot
+
+
+def _input_username(item: Dict[str, Any]) -> str:
+    """Read the username of a trigger input (``user_name`` or profile ``url``)."""
+
+    if item.get("user_name"):
+        return str(item["user_name"])
+    return str(item.get("url", "")).rstrip("/").rsplit("/", 1)[-1]
+
+
+def _error_row(username: str, message: str) -> Dict[str, Any]:
+    return {
+        "error": message,
+        "error_code": "dead_page",
+        "input": {"user_name": username},
+    }
+
+
+def _ndjson(records: List[Dict[str, Any]]) -> Iterator[bytes]:
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+async def _notify(snapshot: MockSnapshot, url: str, auth_header: Optional[str]) -> None:
+    """Call the trigger's ``notify`` URL once the snapshot finishes building."""
+
+    await asyncio.sleep(max(snapshot.ready_at - time.monotonic(), 0.0))
+    headers = {"Authorization": auth_header} if auth_header else {}
+    payload = {"snapshot_id": snapshot.snapshot_id, "status": snapshot.status}
+    try:
+        async with httpx.AsyncClient(timeout=10) as client:
+            await client.post(url, json=payload, headers=headers)
+    except httpx.HTTPError as exc:
+        logger.warning("Notify callback to %s failed: %s", url, exc)
+
+
+def main(argv: List[str]) -> None:
+    """Serve the mock API with uvicorn."""
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.brightdata_mock",
+        description=__doc__.split("\n")[0],
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--build-latency", type=float, default=2.0)
+    parser.add_argument("--build-latency-jitter", type=float, default=0.2)
+    parser.add_argument("--not-ready-responses", type=int, default=0)
+    parser.add_argument("--trigger-failure-rate", type=float, default=0.0)
+    parser.add_argument("--snapshot-failure-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--unknown-usernames", choices=("clone", "error"), default="clone"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv[1:])
+
+    mock = MockBrightData.from_file(
+        args.fixtures,
+        build_latency=args.build_latency,
+        build_latency_jitter=args.build_latency_jitter,
+        not_ready_responses=args.not_ready_responses,
+        trigger_failure_rate=args.trigger_failure_rate,
+        snapshot_failure_rate=args.snapshot_failure_rate,
+        error_rate=args.error_rate,
+        unknown_usernames=args.unknown_usernames,
+        seed=args.seed,
+    )
+    logger.info("Serving %s fixture profiles", len(mock.fixtures))
+    uvicorn.run(mock.build_app(), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Optional, Protocol, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class CacheBackend(Protocol):
+    """Storage for serialized cache entries with TTL and size-based eviction."""
+
+    async def get(self, key: str) -> Optional[Tuple[float, str]]:
+        """Return ``(stored_at, value)`` for ``key`` or ``None`` if absent or expired."""
+
+    async def set(
+        self, key: str, value: str, stored_at: Optional[float] = None
+    ) -> None:
+        """Store ``value`` under ``key``, evicting old entries if needed.
+
+        ``stored_at`` backdates the entry to when its data was produced; it
+        defaults to now.
+        """
+
+    async def delete(self, key: str) -> None:
+        """Remove ``key`` from the cache."""
+
+
+class NullCache:
+    """Cache backend that never stores anything."""
+
+    async def get(self, key: str) -> Optional[Tuple[float, str]]:
+        return None
+
+    async def set(
+        self, key: str, value: str, stored_at: Optional[float] = None
+    ) -> None:
+        return None
+
+    async def delete(self, key: str) -> None:
+        return None
+
+
+class MemoryCache:
+    """In-process LRU cache with a TTL, lost on restart."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Tuple[float, str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(
+        self, key: str, value: str, stored_at: Optional[float] = None
+    ) -> None:
+        self._entries[key] = (time.time() if stored_at is None else stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+def connect_sqlite(path: str, busy_timeout: float = 5.0) -> sqlite3.Connection:
+    """Open a SQLite database that several worker processes can share.
+
+    The database runs in WAL mode, so readers never block the single writer,
+    and a busy timeout makes concurrent writers wait instead of failing with
+    ``database is locked``.
+
+    Args:
+        path: Database file; its directory is created if needed.
+        busy_timeout: Seconds a writer waits for the lock held by another
+            connection.
+
+    Returns:
+        A connection usable from any thread; callers serialize access.
+    """
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SQLiteCache:
+    """On-disk LRU cache with a TTL that survives restarts.
+
+    Several caches, and several worker processes, can share one database
+    file; entries are separated by ``namespace``. Queries run in a worker
+    thread to keep the event loop free.
+    """
+
+    def __init__(self, path: str, namespace: str, ttl: float, max_entries: int) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_lru"
+                " ON cache_entries (namespace, accessed_at)"
+            )
+
+    async def get(self, key: str) -> Optional[Tuple[float, str]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(
+        self, key: str, value: str, stored_at: Optional[float] = None
+    ) -> None:
+        await asyncio.to_thread(self._set, key, value, stored_at)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    def _get(self, key: str) -> Optional[Tuple[float, str]]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM cache_entries"
+                " WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > self.ttl:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                return None
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ?"
+                " WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+        return row[0], row[1]
+
+    def _set(self, key: str, value: str, stored_at: Optional[float]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, key, value, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    key,
+                    value,
+                    now if stored_at is None else stored_at,
+                    now,
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache_entries WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+
+def build_cache_backend(
+    backend: str, namespace: str, ttl: float, max_entries: int, sqlite_path: str
+) -> CacheBackend:
+    """Create the cache backend selected in the settings.
+
+    Args:
+        backend: ``memory``, ``sqlite`` or ``none``.
+        namespace: Separates this cache from others sharing a SQLite file.
+        ttl: Maximum entry age in seconds.
+        max_entries: Entries kept before the least recently used are evicted.
+        sqlite_path: Database file used by the ``sqlite`` backend.
+
+    Returns:
+        The configured :class:`CacheBackend`.
+
+    Raises:
+        ValueError: If ``backend`` is not a known backend name.
+    """
+
+    if backend == "memory":
+        return MemoryCache(ttl=ttl, max_entries=max_entries)
+    if backend == "sqlite":
+        return SQLiteCache(
+            sqlite_path, namespace=namespace, ttl=ttl, max_entries=max_entries
+        )
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend!r}")
+
+
+class ModelCache(Generic[M]):
+    """Typed cache of Pydantic models on top of a :class:`CacheBackend`."""
+
+    def __init__(
+        self, backend: CacheBackend, model: Type[M], name: Optional[str] = None
+    ) -> None:
+        self.backend = backend
+        self.model = model
+        self.name = name or model.__name__
+        self._hits = metrics.cache_requests.labels(self.name, "hit")
+        self._misses = metrics.cache_requests.labels(self.name, "miss")
+
+    async def get(self, key: str, max_age: Optional[float] = None) -> Optional[M]:
+        """Return the cached model for ``key`` if it is fresh enough.
+
+        Args:
+            key: The cache key.
+            max_age: Optional maximum age in seconds, tighter than the backend
+                TTL. ``0`` always misses.
+
+        Returns:
+            The cached model, or ``None`` on a miss.
+        """
+
+        if max_age is not None and max_age <= 0:
+            self._misses.inc()
+            return None
+
+        entry = await self.backend.get(key)
+        if entry is None:
+            self._misses.inc()
+            return None
+
+        stored_at, value = entry
+        if max_age is not None and time.time() - stored_at > max_age:
+            self._misses.inc()
+            return None
+
+        try:
+            model = self.model.model_validate_json(value)
+        except ValueError:
+            logger.warning("Dropping unreadable cache entry %s", key)
+            await self.backend.delete(key)
+            self._misses.inc()
+            return None
+        self._hits.inc()
+        return model
+
+    async def set(self, key: str, value: M, stored_at: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``.
+
+        Args:
+            key: The cache key.
+            value: The model to store.
+            stored_at: When the data was produced, as a Unix timestamp, if
+                earlier than now. Later ``max_age`` checks and the TTL count
+                from it.
+        """
+
+        await self.backend.set(key, value.model_dump_json(), stored_at)
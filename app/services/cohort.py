@@ -0,0 +1,290 @@
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+import numpy as np
+
+from app.models.instagram import CohortProfileStats, CohortStats, CohortSummary
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+class ProfileColumns(NamedTuple):
+    """Columnar view of many raw profiles and their flattened posts.
+
+    Profile-level arrays have one entry per profile. Post-level arrays have
+    one entry per non-pinned post, sorted by ``post_owner`` (the index of the
+    profile the post belongs to).
+    """
+
+    usernames: List[str]
+    followers: np.ndarray
+    following: np.ndarray
+    post_owner: np.ndarray
+    post_likes: np.ndarray
+    post_comments: np.ndarray
+    post_timestamps: np.ndarray
+
+
+def flatten_snapshots(data: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Flatten snapshot exports (lists of records, or lists of such lists).
+
+    Error rows and anything that is not a profile record are dropped.
+    """
+
+    records: List[Dict[str, Any]] = []
+    for item in data:
+        if isinstance(item, list):
+            records.extend(flatten_snapshots(item))
+        elif isinstance(item, dict) and item.get("account"):
+            records.append(item)
+    return records
+
+
+def build_columns(raw_profiles: List[Dict[str, Any]]) -> ProfileColumns:
+    """Convert raw Bright Data profiles into NumPy columns in a single pass.
+
+    Pinned posts are skipped, as in :func:`compute_engagement_metrics`.
+
+    Args:
+        raw_profiles: Records of the Bright Data Instagram profiles dataset.
+
+    Returns:
+        The :class:`ProfileColumns` for the cohort.
+    """
+
+    usernames: List[str] = []
+    followers: List[float] = []
+    following: List[float] = []
+    owners: List[int] = []
+    likes: List[float] = []
+    comments: List[float] = []
+    timestamps: List[str] = []
+
+    for index, raw in enumerate(raw_profiles):
+        usernames.append(str(raw.get("account") or ""))
+        followers.append(raw.get("followers") or np.nan)
+        following.append(raw.get("following") or np.nan)
+        for post in raw.get("posts") or ():
+            if not isinstance(post, dict) or post.get("is_pinned"):
+                continue
+            owners.append(index)
+            likes.append(post.get("likes") or 0)
+            comments.append(post.get("comments") or 0)
+            timestamps.append(post.get("datetime") or "NaT")
+
+    parsed = _parse_timestamps(timestamps)
+    post_timestamps = parsed.astype("float64")
+    post_timestamps[np.isnat(parsed)] = np.nan
+
+    return ProfileColumns(
+        usernames=usernames,
+        followers=np.array(followers, dtype="float64"),
+        following=np.array(following, dtype="float64"),
+        post_owner=np.array(owners, dtype="int64"),
+        post_likes=np.array(likes, dtype="float64"),
+        post_comments=np.array(comments, dtype="float64"),
+        post_timestamps=post_timestamps,
+    )
+
+
+def _parse_timestamps(values: List[str]) -> np.ndarray:
+    """Parse ISO 8601 post timestamps, with ``NaT`` for malformed ones.
+
+    The whole column is converted at once; only when that fails is it parsed
+    value by value, so one bad record does not fail the cohort.
+    """
+
+    text = np.char.rstrip(np.array(values, dtype="U32"), "Z")
+    try:
+        return text.astype("datetime64[s]")
+    except ValueError:
+        return np.array([_parse_timestamp(value) for value in text])
+
+
+def _parse_timestamp(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, "s")
+    except ValueError:
+        return np.datetime64("NaT", "s")
+
+
+def compute_cohort_stats(raw_profiles: List[Dict[str, Any]]) -> CohortStats:
+    """Compute per-profile and cohort statistics for many profiles at once.
+
+    All aggregation runs on NumPy arrays: per-profile sums use ``bincount``
+    and per-profile ranges use ``reduceat`` over the post columns, so the cost
+    is dominated by reading the raw dictionaries once.
+
+    Args:
+        raw_profiles: Records of the Bright Data Instagram profiles dataset.
+
+    Returns:
+        :class:`CohortStats` with profiles ranked by engagement rate.
+    """
+
+    columns = build_columns(raw_profiles)
+    n = len(columns.usernames)
+    if n == 0:
+        return CohortStats(summary=CohortSummary(profiles=0), profiles=[])
+
+    owner = columns.post_owner
+    post_counts = np.bincount(owner, minlength=n).astype("float64")
+    has_posts = post_counts > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_likes = np.bincount(owner, columns.post_likes, minlength=n) / post_counts
+        avg_comments = (
+            np.bincount(owner, columns.post_comments, minlength=n) / post_counts
+        )
+        engagement_rate = (avg_likes + avg_comments) / columns.followers
+        ratio = columns.followers / columns.following
+        posts_per_week = _posts_per_week(columns, post_counts)
+
+    engagement_rate[~has_posts | ~(columns.followers > 0)] = np.nan
+    ratio[~np.isfinite(ratio)] = np.nan
+
+    percentile = _percentile_rank(engagement_rate)
+    zscore = _zscore(posts_per_week)
+
+    order = np.argsort(-np.nan_to_num(engagement_rate, nan=-np.inf), kind="stable")
+    usernames = [columns.usernames[i] for i in order.tolist()]
+    fields = {
+        "followers": _column(columns.followers[order]),
+        "following": _column(columns.following[order]),
+        "follower_following_ratio": _column(ratio[order]),
+        "posts_analyzed": post_counts[order].astype("int64").tolist(),
+        "avg_likes": _column(avg_likes[order]),
+        "avg_comments": _column(avg_comments[order]),
+        "engagement_rate": _column(engagement_rate[order]),
+        "engagement_percentile": _column(percentile[order]),
+        "posts_per_week": _column(posts_per_week[order]),
+        "posting_frequency_zscore": _column(zscore[order]),
+    }
+    profiles = [
+        CohortProfileStats(
+            username=username, **{name: values[i] for name, values in fields.items()}
+        )
+        for i, username in enumerate(usernames)
+    ]
+
+    summary = CohortSummary(
+        profiles=n,
+        engagement_rate_percentiles=_percentiles(engagement_rate),
+        followers_percentiles=_percentiles(columns.followers),
+        posts_per_week_mean=(
+            _value(np.nanmean(posts_per_week))
+            if np.isfinite(posts_per_week).any()
+            else None
+        ),
+        posts_per_week_std=(
+            _value(np.nanstd(posts_per_week))
+            if np.isfinite(posts_per_week).any()
+            else None
+        ),
+    )
+    return CohortStats(summary=summary, profiles=profiles)
+
+
+def _posts_per_week(columns: ProfileColumns, post_counts: np.ndarray) -> np.ndarray:
+    """Posting frequency per profile from the span of its post timestamps."""
+
+    n = len(post_counts)
+    result = np.full(n, np.nan)
+    timestamps = columns.post_timestamps
+    if timestamps.size == 0:
+        return result
+
+    starts = np.searchsorted(columns.post_owner, np.arange(n))
+    present = post_counts > 0
+    offsets = starts[present]
+    newest = np.fmax.reduceat(timestamps, offsets)
+    oldest = np.fmin.reduceat(timestamps, offsets)
+    dated = np.bincount(
+        columns.post_owner, np.isfinite(timestamps).astype("float64"), minlength=n
+    )[present]
+
+    span_weeks = (newest - oldest) / (7 * 86400)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frequency = (dated - 1) / span_weeks
+    frequency[~(span_weeks > 0)] = np.nan
+    result[present] = frequency
+    return result
+
+
+def _percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Percentile rank (0-100) of each finite value within the cohort."""
+
+    result = np.full(values.shape, np.nan)
+    finite = np.isfinite(values)
+    count = int(finite.sum())
+    if count == 0:
+        return result
+    ranks = np.empty(count)
+    ranks[np.argsort(values[finite], kind="stable")] = np.arange(count)
+    result[finite] = 100.0 * ranks / max(count - 1, 1)
+    return result
+
+
+def _zscore(values: np.ndarray) -> np.ndarray:
+    finite = np.isfinite(values)
+    if finite.sum() < 2:
+        return np.full(values.shape, np.nan)
+    std = np.nanstd(values)
+    if std == 0:
+        return np.where(finite, 0.0, np.nan)
+    return (values - np.nanmean(values)) / std
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return {}
+    return {
+        f"p{p}": float(v)
+        for p, v in zip(PERCENTILES, np.percentile(finite, PERCENTILES))
+    }
+
+
+def _column(values: np.ndarray) -> List[float | None]:
+    """Convert a float column to a list with ``None`` for missing values."""
+
+    column = values.astype(object)
+    column[~np.isfinite(values)] = None
+    return column.tolist()
+
+
+def _value(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
+
+
+def main(argv: List[str]) -> None:
+    """Rank the profiles of a snapshot export and report the engine timing.
+
+    Usage: ``python -m app.services.cohort research/profiles.json [repeat]``
+    """
+
+    path = argv[1] if len(argv) > 1 else "research/profiles.json"
+    repeat = int(argv[2]) if len(argv) > 2 else 1
+    with open(path, encoding="utf-8") as f:
+        records = flatten_snapshots(json.load(f)) * repeat
+
+    started = time.perf_counter()
+    stats = compute_cohort_stats(records)
+    elapsed = time.perf_counter() - started
+
+    for profile in stats.profiles[:20]:
+        print(
+            f"{profile.username:<32} er={profile.engagement_rate or 0:.4f} "
+            f"pct={profile.engagement_percentile or 0:5.1f} "
+            f"ppw={profile.posts_per_week or 0:.2f}"
+        )
+    print(f"{len(records)} profiles ranked in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,156 @@
+"""Cross-process coordination for multi-worker deployments.
+
+:class:`~app.services.singleflight.SingleFlight` only collapses duplicate work
+inside one process. When the API runs as several workers, the same username can
+reach two processes at once; a lease in a shared store makes the second one
+wait for the first and then read the result from the shared caches instead of
+paying for another scrape or LLM call.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Protocol
+
+from app.core.config import get_settings
+from app.services import metrics
+from app.services.cache import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseBackend(Protocol):
+    """Grants exclusive, expiring ownership of a key across processes."""
+
+    def exclusive(self, key: str) -> AbstractAsyncContextManager[bool]:
+        """Hold ``key`` for the duration of an ``async with`` block.
+
+        The block receives ``True`` when it had to wait for another holder,
+        i.e. when the result it is about to produce may already be cached.
+        """
+
+
+class NullLeases:
+    """Lease backend for a single process: every lease is granted at once."""
+
+    @asynccontextmanager
+    async def exclusive(self, key: str) -> AsyncIterator[bool]:
+        yield False
+
+
+class SQLiteLeases:
+    """Leases stored in a SQLite database shared by every worker.
+
+    A lease expires ``ttl`` seconds after it was last renewed and is renewed
+    every ``ttl / 3`` seconds while held, so the lease of a crashed worker is
+    taken over once it expires. Waiters poll every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, path: str, ttl: float, poll_interval: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                " key TEXT PRIMARY KEY,"
+                " owner TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+
+    @asynccontextmanager
+    async def exclusive(self, key: str) -> AsyncIterator[bool]:
+        waited = False
+        while not await asyncio.to_thread(self._acquire, key):
+            if not waited:
+                logger.info("Waiting for another worker holding %s", key)
+                metrics.lease_waits.labels(key.split(":", 1)[0]).inc()
+                waited = True
+            await asyncio.sleep(self.poll_interval)
+
+        heartbeat = asyncio.create_task(self._heartbeat(key))
+        try:
+            yield waited
+        finally:
+            heartbeat.cancel()
+            await asyncio.to_thread(self._release, key)
+
+    async def _heartbeat(self, key: str) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            if not await asyncio.to_thread(self._renew, key):
+                logger.warning("Lost the lease on %s", key)
+                return
+
+    def _acquire(self, key: str) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM leases WHERE key = ? AND expires_at < ?", (key, now)
+            )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO leases (key, owner, expires_at)"
+                " VALUES (?, ?, ?)",
+                (key, self.owner, now + self.ttl),
+            )
+        return cursor.rowcount == 1
+
+    def _renew(self, key: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+                (time.time() + self.ttl, key, self.owner),
+            )
+        return cursor.rowcount == 1
+
+    def _release(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner)
+            )
+
+
+def build_lease_backend(
+    backend: str, sqlite_path: str, ttl: float, poll_interval: float
+) -> LeaseBackend:
+    """Create the lease backend selected in the settings.
+
+    Args:
+        backend: ``sqlite`` or ``none``.
+        sqlite_path: Database file used by the ``sqlite`` backend.
+        ttl: Seconds a lease outlives its last renewal.
+        poll_interval: Seconds between attempts to take a held lease.
+
+    Returns:
+        The configured :class:`LeaseBackend`.
+
+    Raises:
+        ValueError: If ``backend`` is not a known backend name.
+    """
+
+    if backend == "sqlite":
+        return SQLiteLeases(sqlite_path, ttl=ttl, poll_interval=poll_interval)
+    if backend == "none":
+        return NullLeases()
+    raise ValueError(f"Unknown coordination backend: {backend!r}")
+
+
+@lru_cache
+def get_leases() -> LeaseBackend:
+    """Return the lease backend configured in the settings."""
+
+    settings = get_settings()
+    return build_lease_backend(
+        settings.coordination_backend,
+        sqlite_path=settings.coordination_sqlite_path,
+        ttl=settings.coordination_lease_ttl,
+        poll_interval=settings.coordination_poll_interval,
+    )
@@ -0,0 +1,151 @@
+import logging
+import os
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class BrightDataDataset:
+    """Endpoint, trigger parameters and polling policy of one Bright Data dataset.
+
+    Every attribute can be overridden from the environment with a
+    ``BRIGHTDATA_<NAME>_`` prefix (e.g. ``BRIGHTDATA_POSTS_BASE_URL``), which
+    makes regional endpoints, proxies and the local stand-in server a matter
+    of configuration.
+
+    Args:
+        name: Registry key, e.g. ``"profiles"``.
+        dataset_id: The Bright Data dataset ID.
+        base_url: API root the ``trigger``, ``progress`` and ``snapshot`` paths
+            are appended to.
+        trigger_params: Extra query parameters sent with every trigger, on top
+            of ``dataset_id`` and ``include_errors``.
+        poll_initial_delay: First delay between progress polls in seconds.
+        poll_interval: Upper bound for a single poll delay in seconds.
+        max_wait_time: Seconds to wait for a snapshot before giving up.
+        record_keys: Fields of which at least one identifies a real record, so
+            that a stray status object is not mistaken for data. Empty accepts
+            any object.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dataset_id: Optional[str],
+        base_url: str,
+        trigger_params: Dict[str, str],
+        poll_initial_delay: float,
+        poll_interval: float,
+        max_wait_time: float,
+        record_keys: Tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.dataset_id = dataset_id
+        self.base_url = base_url.rstrip("/")
+        self.trigger_params = trigger_params
+        self.poll_initial_delay = poll_initial_delay
+        self.poll_interval = poll_interval
+        self.max_wait_time = max_wait_time
+        self.record_keys = record_keys
+
+    def url(self, path: str) -> str:
+        """Return the absolute URL of an API path such as ``"trigger"``."""
+
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def __repr__(self) -> str:
+        return f"BrightDataDataset(name={self.name!r}, dataset_id={self.dataset_id!r})"
+
+
+class DatasetRegistry:
+    """Named :class:`BrightDataDataset` entries used by the Bright Data client."""
+
+    def __init__(self, datasets: Sequence[BrightDataDataset] = ()) -> None:
+        self._datasets: Dict[str, BrightDataDataset] = {}
+        for dataset in datasets:
+            self.register(dataset)
+
+    def register(self, dataset: BrightDataDataset) -> None:
+        """Add ``dataset``, replacing any entry with the same name."""
+
+        self._datasets[dataset.name] = dataset
+
+    def get(self, name: str) -> BrightDataDataset:
+        """Return the dataset registered as ``name``.
+
+        Raises:
+            KeyError: If no dataset has that name.
+        """
+
+        try:
+            return self._datasets[name]
+        except KeyError:
+            raise KeyError(
+                f"Unknown Bright Data dataset {name!r}; "
+                f"known datasets: {', '.join(self._datasets)}"
+            ) from None
+
+    def __iter__(self) -> Iterator[BrightDataDataset]:
+        return iter(self._datasets.values())
+
+
+def _dataset_from_env(
+    name: str,
+    dataset_id: Optional[str],
+    trigger_params: str = "",
+    record_keys: Tuple[str, ...] = (),
+) -> BrightDataDataset:
+    """Build a dataset from its defaults and ``BRIGHTDATA_<NAME>_*`` overrides.
+
+    ``BRIGHTDATA_<NAME>_TRIGGER_PARAMS`` is a comma-separated list of
+    ``key=value`` pairs. Base URL and polling settings fall back to the global
+    ``BRIGHTDATA_*`` ones.
+    """
+
+    prefix = f"BRIGHTDATA_{name.upper()}_"
+    params = os.getenv(prefix + "TRIGGER_PARAMS", trigger_params)
+    return BrightDataDataset(
+        name=name,
+        dataset_id=os.getenv(prefix + "DATASET_ID", dataset_id or "") or None,
+        base_url=os.getenv(prefix + "BASE_URL", settings.brightdata_base_url),
+        trigger_params=dict(
+            pair.strip().split("=", 1) for pair in params.split(",") if "=" in pair
+        ),
+        poll_initial_delay=float(
+            os.getenv(
+                prefix + "POLL_INITIAL_DELAY", settings.brightdata_poll_initial_delay
+            )
+        ),
+        poll_interval=float(
+            os.getenv(prefix + "POLL_INTERVAL", settings.brightdata_poll_interval)
+        ),
+        max_wait_time=float(
+            os.getenv(prefix + "MAX_WAIT_TIME", settings.brightdata_max_wait_time)
+        ),
+        record_keys=record_keys,
+    )
+
+
+datasets = DatasetRegistry(
+    [
+        _dataset_from_env(
+            "profiles",
+            settings.brightdata_instagram_dataset_id,
+            "type=discover_new,discover_by=user_name",
+            record_keys=("account", "profile_name", "full_name", "input"),
+        ),
+        _dataset_from_env(
+            "posts", "gd_lk5ns7kz21pck8jpis", "type=discover_new,discover_by=url"
+        ),
+        _dataset_from_env(
+            "reels", "gd_lyclm20il4r5helnj", "type=discover_new,discover_by=url"
+        ),
+        _dataset_from_env("comments", "gd_ltppn085pokosxh13"),
+        _dataset_from_env("serp", "gd_mfz5x93lmsjjjylob"),
+        _dataset_from_env("ai_mode", "gd_mcswdt6z2elth3zqr2"),
+        _dataset_from_env("perplexity", "gd_m7dhdot1vw9a7gc1n"),
+    ]
+)
@@ -0,0 +1,110 @@
+import logging
+import re
+import statistics
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.models.instagram import EngagementMetrics, HashtagCount
+
+logger = logging.getLogger(__name__)
+
+HASHTAG_PATTERN = re.compile(r"#(\w+)", re.UNICODE)
+TOP_HASHTAGS = 15
+
+
+def compute_engagement_metrics(raw_profile: Dict[str, Any]) -> EngagementMetrics:
+    """Compute deterministic engagement metrics from a raw Bright Data profile.
+
+    Pinned posts are counted but excluded from engagement averages and posting
+    cadence: they are usually older, hand-picked top performers and would skew
+    both. If every post is pinned they are used anyway.
+
+    Args:
+        raw_profile: A single record of the Bright Data Instagram profiles
+            dataset, including its ``posts`` list.
+
+    Returns:
+        The computed :class:`EngagementMetrics`.
+    """
+
+    posts = [p for p in raw_profile.get("posts") or [] if isinstance(p, dict)]
+    pinned = [p for p in posts if p.get("is_pinned")]
+    regular = [p for p in posts if not p.get("is_pinned")] or posts
+
+    followers = raw_profile.get("followers") or 0
+    likes = [_as_number(p.get("likes")) for p in regular]
+    comments = [_as_number(p.get("comments")) for p in regular]
+    interactions = [lk + cm for lk, cm in zip(likes, comments)]
+
+    posted_at = sorted(
+        ts for ts in (_parse_datetime(p.get("datetime")) for p in regular) if ts
+    )
+    gaps = [
+        (later - earlier).total_seconds() / 86400
+        for earlier, later in zip(posted_at, posted_at[1:])
+    ]
+    span_days = (posted_at[-1] - posted_at[0]).total_seconds() / 86400 if gaps else 0
+
+    content_types = Counter(str(p.get("content_type") or "unknown") for p in posts)
+    hashtags: Counter[str] = Counter()
+    for post in posts:
+        hashtags.update(_hashtags(post.get("caption")))
+
+    return EngagementMetrics(
+        followers=raw_profile.get("followers"),
+        following=raw_profile.get("following"),
+        follower_following_ratio=(
+            followers / raw_profile["following"]
+            if raw_profile.get("following")
+            else None
+        ),
+        posts_analyzed=len(posts),
+        pinned_posts=len(pinned),
+        avg_likes=_mean(likes),
+        median_likes=_median(likes),
+        avg_comments=_mean(comments),
+        median_comments=_median(comments),
+        engagement_rate=(
+            _mean([i / followers for i in interactions]) if followers else None
+        ),
+        posts_per_week=(len(gaps) / span_days * 7 if span_days else None),
+        median_days_between_posts=_median(gaps),
+        first_post_at=posted_at[0] if posted_at else None,
+        last_post_at=posted_at[-1] if posted_at else None,
+        content_type_mix={
+            kind: count / len(posts) for kind, count in content_types.most_common()
+        },
+        hashtags_per_post=(sum(hashtags.values()) / len(posts) if posts else 0.0),
+        top_hashtags=[
+            HashtagCount(tag=tag, count=count)
+            for tag, count in hashtags.most_common(TOP_HASHTAGS)
+        ],
+    )
+
+
+def _hashtags(caption: Any) -> List[str]:
+    if not isinstance(caption, str):
+        return []
+    return [tag.lower() for tag in HASHTAG_PATTERN.findall(caption)]
+
+
+def _as_number(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return statistics.fmean(values) if values else None
+
+
+def _median(values: List[float]) -> Optional[float]:
+    return statistics.median(values) if values else None
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.models.instagram import AnalysisJob
+from app.services.analysis import analyze_instagram_username
+from app.services.brightdata import BrightDataError
+from app.services.limits import queue_patiently
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the job queue is at capacity."""
+
+
+class JobManager:
+    """Run analyses in the background on a bounded pool of workers.
+
+    Jobs are queued in memory and picked up by ``workers`` tasks, so the
+    number of concurrent analyses does not depend on how many clients are
+    connected. Jobs queue for upstream slots instead of failing with
+    :class:`~app.services.limits.UpstreamBusyError`. Finished jobs are kept for ``retention`` seconds so clients can
+    collect the result.
+    """
+
+    def __init__(self, workers: int, queue_size: int, retention: float) -> None:
+        self.workers = workers
+        self.retention = retention
+        self._queue: asyncio.Queue[AnalysisJob] = asyncio.Queue(maxsize=queue_size)
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._tasks: List[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"analysis-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info("Started %s analysis job workers", self.workers)
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks and wait for them to exit."""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Stopped analysis job workers")
+
+    def submit(self, profile: str, max_age: Optional[int] = None) -> AnalysisJob:
+        """Queue an analysis of ``profile``.
+
+        Args:
+            profile: The Instagram username to analyze.
+            max_age: Optional maximum age in seconds of cached profile data.
+
+        Returns:
+            The queued :class:`AnalysisJob`.
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity.
+        """
+
+        self._prune()
+
+        job = AnalysisJob(
+            id=uuid.uuid4().hex,
+            profile=profile,
+            max_age=max_age,
+            created_at=datetime.now(timezone.utc),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as exc:
+            raise JobQueueFullError("Analysis job queue is full") from exc
+
+        self._jobs[job.id] = job
+        logger.info("Queued analysis job %s for %s", job.id, profile)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Return the job with ``job_id``, or ``None`` if unknown or expired."""
+
+        return self._jobs.get(job_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: AnalysisJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+
+        try:
+            # Nobody is waiting on the response, so a busy upstream only
+            # delays the job.
+            with queue_patiently():
+                job.result = await analyze_instagram_username(
+                    job.profile, max_age=job.max_age
+                )
+            job.status = "succeeded"
+        except BrightDataError as e:
+            logger.error("Bright Data error for job %s: %s", job.id, e)
+            job.error = str(e)
+            job.status = "failed"
+        except asyncio.CancelledError:
+            job.error = "Job was cancelled"
+            job.status = "failed"
+            raise
+        except Exception as e:
+            logger.exception("Analysis job %s failed", job.id)
+            job.error = f"Analysis failed: {e}"
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            logger.info("Analysis job %s finished with status %s", job.id, job.status)
+
+    def _prune(self) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention)
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+
+job_manager = JobManager(
+    workers=settings.analysis_job_workers,
+    queue_size=settings.analysis_job_queue_size,
+    retention=settings.analysis_job_retention,
+)
@@ -0,0 +1,133 @@
+import json
+import logging
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStream:
+    """Incrementally decode the elements of a top-level JSON array.
+
+    Text is fed in arbitrary chunks and every element is returned as soon as
+    it is complete, so only the element being received is held in memory.
+    Elements are decoded with :meth:`json.JSONDecoder.raw_decode`. After an
+    incomplete attempt, decoding is retried only once the buffer has doubled,
+    which keeps the total work linear even for elements spanning many chunks.
+
+    A top-level value that is not an array (e.g. an error object) is buffered
+    and returned whole by :meth:`close`; :attr:`is_array` tells the two apart.
+    """
+
+    def __init__(self) -> None:
+        self.is_array: Optional[bool] = None
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._retry_at = 0
+        self._done = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Add decoded text and return the elements completed by it."""
+
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if len(self._buffer) + self._pending_size < self._retry_at:
+            return []
+        self._flush_pending()
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Return the remaining elements once the input is exhausted.
+
+        Raises:
+            ValueError: If the input is not valid JSON or was truncated.
+        """
+
+        self._flush_pending()
+        items = self._drain(final=True)
+        if self.is_array and not self._done:
+            raise ValueError("Truncated JSON array")
+        return items
+
+    def _flush_pending(self) -> None:
+        if self._pending:
+            self._buffer += "".join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+
+    def _drain(self, final: bool) -> List[Any]:
+        buffer = self._buffer
+        size = len(buffer)
+        items: List[Any] = []
+        pos = 0
+        incomplete = False
+
+        while True:
+            while pos < size and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == size:
+                break
+
+            if self._done:
+                raise ValueError(
+                    f"Extra data after JSON value: {buffer[pos:pos + 50]!r}"
+                )
+
+            if self.is_array is None:
+                if buffer[pos] == "[":
+                    self.is_array = True
+                    pos += 1
+                    continue
+                self.is_array = False
+
+            if not self.is_array:
+                if not final:
+                    incomplete = True
+                    break
+                items.append(json.loads(buffer[pos:]))
+                pos = size
+                self._done = True
+                break
+
+            char = buffer[pos]
+            if char == ",":
+                pos += 1
+                continue
+            if char == "]":
+                self._done = True
+                pos += 1
+                continue
+
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("Truncated or invalid JSON array element")
+                incomplete = True
+                break
+
+            if not isinstance(value, (dict, list)):
+                # A scalar is only complete once the separator after it has
+                # arrived: "0." or "1e" decode as a shorter number that the
+                # next chunk continues.
+                after = end
+                while after < size and buffer[after] in _WHITESPACE:
+                    after += 1
+                if after == size or buffer[after] not in ",]":
+                    if final and after < size:
+                        raise ValueError(
+                            f"Invalid JSON array element: {buffer[pos:after + 1]!r}"
+                        )
+                    if not final:
+                        incomplete = True
+                        break
+
+            items.append(value)
+            pos = end
+
+        self._buffer = buffer[pos:]
+        self._retry_at = 2 * len(self._buffer) if incomplete else 0
+        return items
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_queue_patiently: ContextVar[bool] = ContextVar("queue_patiently", default=False)
+
+
+class UpstreamBusyError(Exception):
+    """Raised when an upstream call cannot be admitted within its queue budget."""
+
+    def __init__(self, upstream: str, retry_after: float) -> None:
+        super().__init__(
+            f"{upstream} is at capacity, retry in {math.ceil(retry_after)}s"
+        )
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+@contextmanager
+def queue_patiently() -> Iterator[None]:
+    """Make upstream calls in this context queue for a slot without a budget.
+
+    Shedding with 429 protects the latency of interactive requests. Batch
+    requests and background jobs start many calls at once by design: they
+    should wait their turn rather than lose every item that does not get a
+    slot within ``max_queue_time``. Tasks started inside the block inherit
+    the setting.
+    """
+
+    token = _queue_patiently.set(True)
+    try:
+        yield
+    finally:
+        _queue_patiently.reset(token)
+
+
+class TokenBucket:
+    """Classic token bucket; a non-positive ``rate`` disables it."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, max_wait: Optional[float]) -> Optional[float]:
+        """Take one token, possibly in advance.
+
+        Args:
+            max_wait: The longest acceptable wait for the token, or ``None``
+                for no limit.
+
+        Returns:
+            Seconds to wait before the token may be used, or ``None`` if that
+            would exceed ``max_wait`` (nothing is taken in that case).
+        """
+
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            return None
+        self._tokens -= 1
+        return wait
+
+
+class UpstreamLimiter:
+    """Bound concurrency and request rate for one upstream endpoint.
+
+    Callers queue for a concurrency slot and then for a rate token. If
+    ``max_queue_time`` is set and the combined wait would exceed it, the call
+    is rejected with :class:`UpstreamBusyError` so the API can answer 429
+    instead of letting latency grow without bound; callers inside
+    :func:`queue_patiently` always wait. Queueing time is recorded for
+    observability.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        rate: float,
+        max_queue_time: Optional[float],
+    ) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue_time = max_queue_time
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate=rate, capacity=max(1.0, rate))
+        self._avg_hold_time = 1.0
+
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold a slot of this upstream for the duration of the block.
+
+        Raises:
+            UpstreamBusyError: If no slot and token are available within
+                ``max_queue_time``, outside :func:`queue_patiently`.
+        """
+
+        max_queue_time = None if _queue_patiently.get() else self.max_queue_time
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), max_queue_time)
+        except asyncio.TimeoutError:
+            self._reject(self._avg_hold_time)
+
+        try:
+            remaining = (
+                None
+                if max_queue_time is None
+                else max_queue_time - (time.monotonic() - started)
+            )
+            wait = self._bucket.reserve(remaining)
+            if wait is None:
+                self._reject(1 / self._bucket.rate)
+            elif wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        acquired = time.monotonic()
+        queued = acquired - started
+        self.admitted += 1
+        self.queue_time_total += queued
+        self.in_flight += 1
+        if queued > 1:
+            logger.info("Waited %.2fs for a %s slot", queued, self.name)
+
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            held = time.monotonic() - acquired
+            self._avg_hold_time = 0.9 * self._avg_hold_time + 0.1 * held
+            self._semaphore.release()
+
+    def _reject(self, retry_after: float) -> None:
+        self.rejected += 1
+        logger.warning("Rejecting %s call: upstream at capacity", self.name)
+        raise UpstreamBusyError(self.name, max(1.0, retry_after))
+
+
+# Triggers and LLM runs are the admission points, so they shed load when
+# saturated. Progress checks and downloads belong to snapshots that are
+# already paid for, so they wait for a slot instead of failing.
+brightdata_trigger_limiter = UpstreamLimiter(
+    "brightdata_trigger",
+    concurrency=settings.brightdata_trigger_concurrency,
+    rate=settings.brightdata_trigger_rate,
+    max_queue_time=settings.upstream_max_queue_time,
+)
+brightdata_progress_limiter = UpstreamLimiter(
+    "brightdata_progress",
+    concurrency=settings.brightdata_progress_concurrency,
+    rate=settings.brightdata_progress_rate,
+    max_queue_time=None,
+)
+brightdata_snapshot_limiter = UpstreamLimiter(
+    "brightdata_snapshot",
+    concurrency=settings.brightdata_snapshot_concurrency,
+    rate=settings.brightdata_snapshot_rate,
+    max_queue_time=None,
+)
+llm_limiter = UpstreamLimiter(
+    "openrouter",
+    concurrency=settings.openrouter_concurrency,
+    rate=settings.openrouter_rate,
+    max_queue_time=settings.upstream_max_queue_time,
+)
@@ -0,0 +1,181 @@
+"""Prometheus metrics for the analysis pipeline.
+
+Hot-path metrics are plain counters and histograms whose label children are
+bound once at import, so recording costs a lock and an addition. State the
+process already keeps (limiter and single-flight counters) is read
+by :class:`PipelineCollector` only when ``/metrics`` is scraped.
+
+Under gunicorn with several workers ``PROMETHEUS_MULTIPROC_DIR`` is set and the
+metric values of every worker are merged on each scrape. The
+:class:`PipelineCollector` figures stay those of the worker that answered.
+"""
+
+import logging
+import os
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from app.services import limits
+from app.services.singleflight import flight_groups
+
+logger = logging.getLogger(__name__)
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+stage_seconds = Histogram(
+    "wykra_stage_duration_seconds",
+    "Duration of each pipeline stage.",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+trigger_seconds = stage_seconds.labels("brightdata_trigger")
+snapshot_build_seconds = stage_seconds.labels("snapshot_build")
+snapshot_download_seconds = stage_seconds.labels("snapshot_download")
+profile_fetch_seconds = stage_seconds.labels("profile_fetch")
+llm_seconds = stage_seconds.labels("llm")
+llm_first_field_seconds = stage_seconds.labels("llm_first_field")
+analysis_seconds = stage_seconds.labels("analysis")
+
+poll_attempts = Counter(
+    "wykra_brightdata_progress_checks",
+    "Snapshot progress requests sent to Bright Data.",
+    ["dataset"],
+)
+snapshot_not_ready = Counter(
+    "wykra_brightdata_snapshot_not_ready",
+    "Snapshot downloads answered with 202 or a still-building body.",
+    ["dataset"],
+)
+snapshot_bytes = Counter(
+    "wykra_brightdata_snapshot_bytes",
+    "Bytes downloaded from Bright Data snapshots.",
+    ["dataset"],
+)
+snapshot_records = Counter(
+    "wykra_brightdata_snapshot_records",
+    "Records parsed from Bright Data snapshots.",
+    ["dataset"],
+)
+snapshots_reused = Counter(
+    "wykra_brightdata_snapshots_reused",
+    "Recorded snapshots collected instead of triggering a new one.",
+    ["dataset", "reason"],
+)
+
+llm_payload_bytes = Histogram(
+    "wykra_llm_payload_bytes",
+    "Size of the profile payload sent to the agent.",
+    buckets=(1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072, 262144),
+)
+llm_tokens = Counter(
+    "wykra_llm_tokens",
+    "Tokens reported by the model provider.",
+    ["kind"],
+)
+llm_prompt_tokens = llm_tokens.labels("prompt")
+llm_completion_tokens = llm_tokens.labels("completion")
+
+prescreen_screened = Counter(
+    "wykra_prescreen_screened",
+    "Profiles checked by the pre-screen.",
+)
+prescreen_rejected = Counter(
+    "wykra_prescreen_rejected",
+    "Profiles answered by the pre-screen without an LLM call.",
+)
+
+cache_requests = Counter(
+    "wykra_cache_requests",
+    "Cache lookups by cache and result.",
+    ["cache", "result"],
+)
+
+lease_waits = Counter(
+    "wykra_coordination_waits",
+    "Calls that waited for another worker holding the same key.",
+    ["kind"],
+)
+
+in_flight = Gauge(
+    "wykra_in_flight",
+    "Operations currently running.",
+    ["operation"],
+    multiprocess_mode="livesum",
+)
+profile_fetches_in_flight = in_flight.labels("profile_fetch")
+analyses_in_flight = in_flight.labels("analysis")
+llm_calls_in_flight = in_flight.labels("llm")
+
+
+class PipelineCollector(Collector):
+    """Expose counters the services already keep, read at scrape time."""
+
+    def collect(self) -> Iterator[Metric]:
+        limiters = (
+            limits.brightdata_trigger_limiter,
+            limits.brightdata_progress_limiter,
+            limits.brightdata_snapshot_limiter,
+            limits.llm_limiter,
+        )
+        upstream_in_flight = GaugeMetricFamily(
+            "wykra_upstream_in_flight",
+            "Calls holding an upstream concurrency slot.",
+            labels=["upstream"],
+        )
+        admitted = CounterMetricFamily(
+            "wykra_upstream_admitted",
+            "Calls admitted by the upstream limiter.",
+            labels=["upstream"],
+        )
+        rejected = CounterMetricFamily(
+            "wykra_upstream_rejected",
+            "Calls rejected with 429 by the upstream limiter.",
+            labels=["upstream"],
+        )
+        queue_seconds = CounterMetricFamily(
+            "wykra_upstream_queue_seconds",
+            "Total time admitted calls spent queueing for the upstream.",
+            labels=["upstream"],
+        )
+        for limiter in limiters:
+            upstream_in_flight.add_metric([limiter.name], limiter.in_flight)
+            admitted.add_metric([limiter.name], limiter.admitted)
+            rejected.add_metric([limiter.name], limiter.rejected)
+            queue_seconds.add_metric([limiter.name], limiter.queue_time_total)
+        yield from (upstream_in_flight, admitted, rejected, queue_seconds)
+
+        flights = GaugeMetricFamily(
+            "wykra_singleflight_keys",
+            "Keys with a shared call in progress.",
+            labels=["group"],
+        )
+        for group in flight_groups():
+            flights.add_metric([group.name], group.in_flight())
+        yield flights
+
+
+REGISTRY.register(PipelineCollector())
+
+
+def render() -> tuple[bytes, str]:
+    """Return the exposition text of every registered metric and its type."""
+
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(PipelineCollector())
+    return generate_latest(registry), CONTENT_TYPE_LATEST
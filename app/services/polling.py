@@ -0,0 +1,123 @@
+import logging
+import random
+import statistics
+from collections import deque
+from typing import Deque, Dict, Iterator
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class AdaptivePollScheduler:
+    """Produce poll delays that back off with jitter and learn per dataset.
+
+    Delays start at ``initial_delay`` and grow by ``backoff_factor`` up to
+    ``max_delay``, each scaled by a random factor in ``1 ± jitter`` so that
+    concurrent pollers do not synchronize. For datasets with recorded history,
+    the first delay is stretched to just below the fastest typical
+    time-to-ready, which skips progress calls that could only say "running".
+    """
+
+    def __init__(
+        self,
+        initial_delay: float,
+        max_delay: float,
+        backoff_factor: float,
+        jitter: float,
+        history_size: int,
+    ) -> None:
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.history_size = history_size
+        self._history: Dict[str, Deque[float]] = {}
+
+    def delays(
+        self,
+        dataset_id: str | None = None,
+        initial_delay: float | None = None,
+        max_delay: float | None = None,
+    ) -> Iterator[float]:
+        """Yield successive delays (in seconds) to sleep between polls.
+
+        Args:
+            dataset_id: The Bright Data dataset being polled. ``None`` skips the
+                learned warm-up and yields plain backoff delays.
+            initial_delay: Per-dataset override of ``initial_delay``.
+            max_delay: Per-dataset override of ``max_delay``.
+
+        Yields:
+            The next delay in seconds.
+        """
+
+        delay = self.initial_delay if initial_delay is None else initial_delay
+        max_delay = self.max_delay if max_delay is None else max_delay
+
+        expected = self.expected_ready_time(dataset_id)
+        if expected is not None and expected > delay:
+            yield self._jittered(expected)
+
+        while True:
+            yield self._jittered(delay)
+            delay = min(delay * self.backoff_factor, max_delay)
+
+    def record(self, dataset_id: str | None, elapsed: float) -> None:
+        """Record how long a snapshot of ``dataset_id`` took to become ready.
+
+        Args:
+            dataset_id: The Bright Data dataset of the snapshot.
+            elapsed: Seconds between the first poll and the ready status.
+        """
+
+        if not dataset_id:
+            return
+        history = self._history.get(dataset_id)
+        if history is None:
+            history = self._history[dataset_id] = deque(maxlen=self.history_size)
+        history.append(elapsed)
+        logger.debug(
+            "Recorded time-to-ready %.1fs for dataset %s (n=%s)",
+            elapsed,
+            dataset_id,
+            len(history),
+        )
+
+    def expected_ready_time(self, dataset_id: str | None) -> float | None:
+        """Return a conservative estimate of time-to-ready for ``dataset_id``.
+
+        The estimate is the lower quartile of recent history, discounted by
+        the jitter so the first poll lands just before a typical snapshot
+        completes rather than after it.
+
+        Args:
+            dataset_id: The Bright Data dataset being polled.
+
+        Returns:
+            The estimated seconds until ready, or ``None`` without history.
+        """
+
+        history = self._history.get(dataset_id) if dataset_id else None
+        if not history:
+            return None
+        if len(history) == 1:
+            lower = history[0]
+        else:
+            lower = statistics.quantiles(history, n=4, method="inclusive")[0]
+        return lower * (1 - self.jitter)
+
+    def _jittered(self, delay: float) -> float:
+        if self.jitter <= 0:
+            return delay
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+poll_scheduler = AdaptivePollScheduler(
+    initial_delay=settings.brightdata_poll_initial_delay,
+    max_delay=settings.brightdata_poll_interval,
+    backoff_factor=settings.brightdata_poll_backoff_factor,
+    jitter=settings.brightdata_poll_jitter,
+    history_size=settings.brightdata_poll_history_size,
+)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from app.models.instagram import ProgressEvent
+
+logger = logging.getLogger(__name__)
+
+_subscribers: Dict[str, Set[asyncio.Queue[ProgressEvent]]] = {}
+_channels: ContextVar[Tuple[str, ...]] = ContextVar("progress_channels", default=())
+
+
+@contextmanager
+def subscribe(channel: str) -> Iterator[asyncio.Queue[ProgressEvent]]:
+    """Receive the progress events published on ``channel``.
+
+    Args:
+        channel: The normalized username whose pipeline should be observed.
+
+    Yields:
+        A queue that receives every :class:`ProgressEvent` published while the
+        context is open.
+    """
+
+    queue: asyncio.Queue[ProgressEvent] = asyncio.Queue()
+    _subscribers.setdefault(channel, set()).add(queue)
+    try:
+        yield queue
+    finally:
+        queues = _subscribers.get(channel)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del _subscribers[channel]
+
+
+@contextmanager
+def bind(*channels: str) -> Iterator[None]:
+    """Route :func:`emit` calls in the current context to ``channels``.
+
+    Bindings nest: channels already bound by an outer context stay bound.
+    Tasks created inside the context inherit the binding.
+
+    Args:
+        channels: Normalized usernames the current work belongs to.
+    """
+
+    current = _channels.get()
+    merged = current + tuple(c for c in channels if c not in current)
+    token = _channels.set(merged)
+    try:
+        yield
+    finally:
+        _channels.reset(token)
+
+
+def is_observed() -> bool:
+    """Return whether anyone subscribes to a channel bound in this context.
+
+    Lets producers skip work, such as streaming an LLM response, whose only
+    consumer would be the progress stream.
+    """
+
+    return any(_subscribers.get(channel) for channel in _channels.get())
+
+
+def build_event(channel: str, stage: str, **data: Any) -> ProgressEvent:
+    """Create a timestamped :class:`ProgressEvent` for ``channel``."""
+
+    return ProgressEvent(stage=stage, profile=channel, timestamp=time.time(), data=data)
+
+
+def emit(stage: str, **data: Any) -> None:
+    """Publish a pipeline stage event to every channel bound in this context.
+
+    This is a no-op when nothing is bound or nobody is subscribed, so it is
+    cheap to call from the hot path.
+
+    Args:
+        stage: Short stage name, e.g. ``snapshot_triggered``.
+        **data: JSON-serializable details about the stage.
+    """
+
+    for channel in _channels.get():
+        queues = _subscribers.get(channel)
+        if not queues:
+            continue
+        event = build_event(channel, stage, **data)
+        for queue in queues:
+            queue.put_nowait(event)
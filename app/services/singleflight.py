@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import weakref
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_groups: "weakref.WeakSet[SingleFlight[Any]]" = weakref.WeakSet()
+
+
+class _Call(Generic[T]):
+    """An in-progress call shared by every waiter of the same key."""
+
+    def __init__(self, task: asyncio.Task[T]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls for the same key into a single execution.
+
+    The first caller for a key starts the work in its own task and later
+    callers await that same task. Each waiter awaits through
+    :func:`asyncio.shield`, so one disconnecting client does not cancel the
+    work for the others. When the last waiter is cancelled the task is
+    cancelled too, and the key is released immediately so a new caller starts
+    fresh instead of joining a dying task.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        _groups.add(self)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key``, or join the call already running for it.
+
+        Args:
+            key: Identifies calls that can share one result.
+            fn: Zero-argument coroutine function doing the actual work. It is
+                only invoked when no call for ``key`` is in progress.
+
+        Returns:
+            The result of the shared call.
+
+        Raises:
+            Exception: Whatever the shared call raised, re-raised in every
+                waiter.
+        """
+
+        call = self._calls.get(key)
+        if call is None:
+            call = self._start(key, fn())
+        else:
+            logger.info("Joining in-flight %s call for %s", self.name, key)
+        return await self._wait(key, call)
+
+    async def do_many(
+        self,
+        keys: Iterable[Hashable],
+        fn: Callable[[List[Hashable]], Awaitable[Mapping[Hashable, T | Exception]]],
+    ) -> Dict[Hashable, T | BaseException]:
+        """Run ``fn`` once for the keys without a call in progress, join the rest.
+
+        Every key handed to ``fn`` is registered as a call of its own, so a
+        :meth:`do` for one of them joins the shared work instead of starting
+        it again. The shared work is cancelled once none of its keys has a
+        waiter left.
+
+        Args:
+            keys: The keys to produce.
+            fn: Coroutine function receiving the keys it has to produce and
+                returning a result, or the exception to raise, for each.
+
+        Returns:
+            The result of every key, or the exception its call raised.
+        """
+
+        keys = list(dict.fromkeys(keys))
+        calls = {key: self._calls.get(key) for key in keys}
+        claimed = [key for key, call in calls.items() if call is None]
+        if len(claimed) < len(keys):
+            logger.info(
+                "Joining %s in-flight %s call(s)", len(keys) - len(claimed), self.name
+            )
+
+        if claimed:
+            shared = asyncio.ensure_future(fn(claimed))
+            members = len(claimed)
+
+            async def member(key: Hashable) -> T:
+                nonlocal members
+                try:
+                    outcome = (await asyncio.shield(shared))[key]
+                finally:
+                    members -= 1
+                    if members == 0 and not shared.done():
+                        shared.cancel()
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+            for key in claimed:
+                calls[key] = self._start(key, member(key))
+
+        outcomes = await asyncio.gather(
+            *(self._wait(key, calls[key]) for key in keys), return_exceptions=True
+        )
+        return dict(zip(keys, outcomes))
+
+    def in_flight(self) -> int:
+        """Return the number of keys with a call currently in progress."""
+
+        return len(self._calls)
+
+    def _start(self, key: Hashable, work: Awaitable[T]) -> _Call[T]:
+        call = _Call(asyncio.ensure_future(work))
+        self._calls[key] = call
+        call.task.add_done_callback(lambda _: self._release(key, call))
+        return call
+
+    async def _wait(self, key: Hashable, call: _Call[T]) -> T:
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                logger.info(
+                    "All waiters left, cancelling %s call for %s", self.name, key
+                )
+                self._release(key, call)
+                call.task.cancel()
+
+    def _release(self, key: Hashable, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+def flight_groups() -> List[SingleFlight[Any]]:
+    """Return every live :class:`SingleFlight`, e.g. for metrics."""
+
+    return sorted(_groups, key=lambda group: group.name)
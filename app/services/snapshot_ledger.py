@@ -0,0 +1,338 @@
+"""Durable record of the Bright Data snapshots this service has triggered.
+
+Every trigger is written down before the service starts waiting for it, so a
+snapshot that is still building when the process stops is not lost: on the
+next start it is polled and downloaded, and a request for one of its
+usernames attaches to it instead of paying for another scrape.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional, Protocol, Sequence
+
+from app.core.config import get_settings
+from app.services.cache import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+DOWNLOADED = "downloaded"
+FAILED = "failed"
+EXPIRED = "expired"
+
+# Snapshots that were triggered but whose records have not been read yet.
+OUTSTANDING = (PENDING, READY)
+
+
+class SnapshotEntry:
+    """One triggered snapshot and the usernames it was triggered for."""
+
+    def __init__(
+        self,
+        snapshot_id: str,
+        dataset_id: str,
+        usernames: List[str],
+        status: str,
+        triggered_at: float,
+    ) -> None:
+        self.snapshot_id = snapshot_id
+        self.dataset_id = dataset_id
+        self.usernames = usernames
+        self.status = status
+        self.triggered_at = triggered_at
+
+    def __repr__(self) -> str:
+        return (
+            f"SnapshotEntry({self.snapshot_id!r}, {self.dataset_id!r},"
+            f" {len(self.usernames)} username(s), {self.status!r})"
+        )
+
+
+class SnapshotLedger(Protocol):
+    """Storage for triggered snapshots and their status."""
+
+    async def record(
+        self, dataset_id: str, snapshot_id: str, usernames: Sequence[str]
+    ) -> None:
+        """Store a snapshot that was just triggered as ``pending``.
+
+        Outstanding snapshots of the same dataset whose usernames are all
+        covered by the new one are marked ``expired``.
+        """
+
+    async def set_status(
+        self, snapshot_id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        """Move ``snapshot_id`` to ``status``, unless it has expired.
+
+        Expiry is final: a download that finishes after a newer snapshot
+        superseded this one does not bring it back.
+
+        Returns:
+            ``False`` if the entry is expired and was left as is.
+        """
+
+    async def get(self, snapshot_id: str) -> Optional[SnapshotEntry]:
+        """Return the entry for ``snapshot_id``, if any."""
+
+    async def find(
+        self,
+        dataset_id: str,
+        username: str,
+        statuses: Sequence[str],
+        since: float,
+    ) -> Optional[SnapshotEntry]:
+        """Return the newest snapshot for ``username`` in one of ``statuses``.
+
+        Only snapshots triggered at or after ``since`` (a Unix timestamp) are
+        considered.
+        """
+
+    async def outstanding(self, dataset_id: str, since: float) -> List[SnapshotEntry]:
+        """Return the snapshots not downloaded yet, expiring older ones.
+
+        Outstanding snapshots triggered before ``since`` are marked
+        ``expired`` and left out.
+        """
+
+
+class NullSnapshotLedger:
+    """Ledger that remembers nothing."""
+
+    async def record(
+        self, dataset_id: str, snapshot_id: str, usernames: Sequence[str]
+    ) -> None:
+        return None
+
+    async def set_status(
+        self, snapshot_id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        return True
+
+    async def get(self, snapshot_id: str) -> Optional[SnapshotEntry]:
+        return None
+
+    async def find(
+        self,
+        dataset_id: str,
+        username: str,
+        statuses: Sequence[str],
+        since: float,
+    ) -> Optional[SnapshotEntry]:
+        return None
+
+    async def outstanding(self, dataset_id: str, since: float) -> List[SnapshotEntry]:
+        return []
+
+
+class SQLiteSnapshotLedger:
+    """Ledger in a SQLite database, shared by every worker process.
+
+    Entries triggered more than ``retention`` seconds ago are deleted whenever
+    a new snapshot is recorded. Queries run in a worker thread to keep the
+    event loop free.
+    """
+
+    def __init__(self, path: str, retention: float) -> None:
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " snapshot_id TEXT PRIMARY KEY,"
+                " dataset_id TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " triggered_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " error TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshot_inputs ("
+                " snapshot_id TEXT NOT NULL"
+                " REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,"
+                " username TEXT NOT NULL,"
+                " PRIMARY KEY (snapshot_id, username))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS snapshot_inputs_username"
+                " ON snapshot_inputs (username)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS snapshots_status"
+                " ON snapshots (dataset_id, status, triggered_at)"
+            )
+
+    async def record(
+        self, dataset_id: str, snapshot_id: str, usernames: Sequence[str]
+    ) -> None:
+        await asyncio.to_thread(self._record, dataset_id, snapshot_id, usernames)
+
+    async def set_status(
+        self, snapshot_id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        return await asyncio.to_thread(self._set_status, snapshot_id, status, error)
+
+    async def get(self, snapshot_id: str) -> Optional[SnapshotEntry]:
+        return await asyncio.to_thread(self._get, snapshot_id)
+
+    async def find(
+        self,
+        dataset_id: str,
+        username: str,
+        statuses: Sequence[str],
+        since: float,
+    ) -> Optional[SnapshotEntry]:
+        return await asyncio.to_thread(
+            self._find, dataset_id, username, tuple(statuses), since
+        )
+
+    async def outstanding(self, dataset_id: str, since: float) -> List[SnapshotEntry]:
+        return await asyncio.to_thread(self._outstanding, dataset_id, since)
+
+    def _record(
+        self, dataset_id: str, snapshot_id: str, usernames: Sequence[str]
+    ) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots"
+                " (snapshot_id, dataset_id, status, triggered_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (snapshot_id, dataset_id, PENDING, now, now),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO snapshot_inputs (snapshot_id, username)"
+                " VALUES (?, ?)",
+                [(snapshot_id, username) for username in usernames],
+            )
+            # Older outstanding snapshots covered by this one would only
+            # bring back staler data.
+            placeholders = ", ".join("?" for _ in OUTSTANDING)
+            self._conn.execute(
+                "UPDATE snapshots SET status = ?, updated_at = ?"
+                f" WHERE dataset_id = ? AND status IN ({placeholders})"
+                " AND snapshot_id != ? AND NOT EXISTS ("
+                "  SELECT 1 FROM snapshot_inputs i"
+                "  WHERE i.snapshot_id = snapshots.snapshot_id"
+                "  AND i.username NOT IN ("
+                "   SELECT username FROM snapshot_inputs WHERE snapshot_id = ?))",
+                (EXPIRED, now, dataset_id, *OUTSTANDING, snapshot_id, snapshot_id),
+            )
+            self._conn.execute(
+                "DELETE FROM snapshots WHERE triggered_at < ?",
+                (now - self.retention,),
+            )
+
+    def _set_status(self, snapshot_id: str, status: str, error: Optional[str]) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE snapshots SET status = ?, error = ?, updated_at = ?"
+                " WHERE snapshot_id = ? AND status != ?",
+                (status, error, time.time(), snapshot_id, EXPIRED),
+            )
+            if cursor.rowcount:
+                return True
+            expired = self._conn.execute(
+                "SELECT 1 FROM snapshots WHERE snapshot_id = ? AND status = ?",
+                (snapshot_id, EXPIRED),
+            ).fetchone()
+        return expired is None
+
+    def _get(self, snapshot_id: str) -> Optional[SnapshotEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT snapshot_id, dataset_id, status, triggered_at"
+                " FROM snapshots WHERE snapshot_id = ?",
+                (snapshot_id,),
+            ).fetchone()
+            return self._entry(row) if row else None
+
+    def _find(
+        self,
+        dataset_id: str,
+        username: str,
+        statuses: Sequence[str],
+        since: float,
+    ) -> Optional[SnapshotEntry]:
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s.snapshot_id, s.dataset_id, s.status, s.triggered_at"
+                " FROM snapshots s JOIN snapshot_inputs i USING (snapshot_id)"
+                " WHERE s.dataset_id = ? AND i.username = ?"
+                f" AND s.status IN ({placeholders}) AND s.triggered_at >= ?"
+                " ORDER BY s.triggered_at DESC LIMIT 1",
+                (dataset_id, username, *statuses, since),
+            ).fetchone()
+            return self._entry(row) if row else None
+
+    def _outstanding(self, dataset_id: str, since: float) -> List[SnapshotEntry]:
+        placeholders = ", ".join("?" for _ in OUTSTANDING)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE snapshots SET status = ?, updated_at = ?"
+                f" WHERE dataset_id = ? AND status IN ({placeholders})"
+                " AND triggered_at < ?",
+                (EXPIRED, time.time(), dataset_id, *OUTSTANDING, since),
+            )
+            rows = self._conn.execute(
+                "SELECT snapshot_id, dataset_id, status, triggered_at"
+                f" FROM snapshots WHERE dataset_id = ? AND status IN ({placeholders})"
+                " ORDER BY triggered_at",
+                (dataset_id, *OUTSTANDING),
+            ).fetchall()
+            return [self._entry(row) for row in rows]
+
+    def _entry(self, row: tuple) -> SnapshotEntry:
+        usernames = [
+            username
+            for (username,) in self._conn.execute(
+                "SELECT username FROM snapshot_inputs WHERE snapshot_id = ?"
+                " ORDER BY username",
+                (row[0],),
+            )
+        ]
+        return SnapshotEntry(row[0], row[1], usernames, row[2], row[3])
+
+
+def build_snapshot_ledger(
+    backend: str, sqlite_path: str, retention: float
+) -> SnapshotLedger:
+    """Create the snapshot ledger selected in the settings.
+
+    Args:
+        backend: ``sqlite`` or ``none``.
+        sqlite_path: Database file used by the ``sqlite`` backend.
+        retention: Seconds an entry is kept after its trigger.
+
+    Returns:
+        The configured :class:`SnapshotLedger`.
+
+    Raises:
+        ValueError: If ``backend`` is not a known backend name.
+    """
+
+    if backend == "sqlite":
+        return SQLiteSnapshotLedger(sqlite_path, retention=retention)
+    if backend == "none":
+        return NullSnapshotLedger()
+    raise ValueError(f"Unknown snapshot ledger backend: {backend!r}")
+
+
+@lru_cache
+def get_snapshot_ledger() -> SnapshotLedger:
+    """Return the snapshot ledger configured in the settings."""
+
+    settings = get_settings()
+    return build_snapshot_ledger(
+        settings.snapshot_ledger_backend,
+        sqlite_path=settings.snapshot_ledger_path,
+        retention=settings.snapshot_ledger_retention,
+    )
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class SnapshotNotifier:
+    """Route Bright Data completion callbacks to the coroutines awaiting them.
+
+    Each in-flight snapshot registers a future keyed by ``snapshot_id``. The
+    notify route resolves it when Bright Data calls back, so waiting for a
+    snapshot costs no progress requests. Callbacks that arrive before the
+    waiter registers (the trigger response and the callback can race) are kept
+    for ``brightdata_max_wait_time`` seconds and handed over on registration.
+
+    Several coroutines may wait for the same snapshot and share its future.
+    Registrations are counted, and the future is only dropped when the last
+    waiter discards it.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: Dict[str, asyncio.Future[Dict[str, Any]]] = {}
+        self._registrations: Dict[str, int] = {}
+        self._early: Dict[str, tuple[float, Dict[str, Any]]] = {}
+
+    def register(self, snapshot_id: str) -> asyncio.Future[Dict[str, Any]]:
+        """Return the future that resolves when ``snapshot_id`` completes.
+
+        Every call must be paired with a call to :meth:`discard`.
+
+        Args:
+            snapshot_id: The Bright Data snapshot to wait for.
+
+        Returns:
+            A future resolved with the callback payload.
+        """
+
+        self._registrations[snapshot_id] = self._registrations.get(snapshot_id, 0) + 1
+        return self.pending(snapshot_id)
+
+    def pending(self, snapshot_id: str) -> asyncio.Future[Dict[str, Any]]:
+        """Return an unresolved future for a snapshot that is already registered.
+
+        Used by a waiter whose future resolved with a callback that did not
+        report the snapshot as finished.
+        """
+
+        future = self._waiters.get(snapshot_id)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[snapshot_id] = future
+
+        early = self._early.pop(snapshot_id, None)
+        if early is not None and not future.done():
+            future.set_result(early[1])
+        return future
+
+    def resolve(self, snapshot_id: str, payload: Dict[str, Any]) -> bool:
+        """Deliver a completion callback for ``snapshot_id``.
+
+        Args:
+            snapshot_id: The snapshot reported by Bright Data.
+            payload: The callback body.
+
+        Returns:
+            ``True`` if a waiter was resolved, ``False`` if the callback was
+            stored for a waiter that has not registered yet.
+        """
+
+        future = self._waiters.get(snapshot_id)
+        if future is not None and not future.done():
+            future.set_result(payload)
+            return True
+
+        self._prune_early()
+        self._early[snapshot_id] = (time.monotonic(), payload)
+        return False
+
+    def discard(self, snapshot_id: str) -> None:
+        """Drop one registration, forgetting the future after the last one."""
+
+        remaining = self._registrations.get(snapshot_id, 0) - 1
+        if remaining > 0:
+            self._registrations[snapshot_id] = remaining
+            return
+
+        self._registrations.pop(snapshot_id, None)
+        future = self._waiters.pop(snapshot_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def _prune_early(self) -> None:
+        cutoff = time.monotonic() - settings.brightdata_max_wait_time
+        for snapshot_id, (received_at, _) in list(self._early.items()):
+            if received_at < cutoff:
+                del self._early[snapshot_id]
+
+
+notifier = SnapshotNotifier()
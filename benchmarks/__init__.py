@@ -0,0 +1,4 @@
+"""Benchmarks for the analysis pipeline.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
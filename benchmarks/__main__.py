@@ -0,0 +1,74 @@
+"""Run the benchmark suite and emit the results as JSON.
+
+Usage: ``python -m benchmarks [--levels 1,10,100,1000] [--output results.json]``
+"""
+
+from benchmarks import common
+
+import argparse
+import asyncio
+import sys
+from typing import List
+
+from benchmarks.micro import run_micro
+from benchmarks.pipeline import run_pipeline
+from benchmarks.startup import measure_import
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "--levels",
+        default="1,10,100,1000",
+        help="Comma-separated concurrent client counts",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=None,
+        help="Requests per level (default: max(50, 2 * concurrency))",
+    )
+    parser.add_argument(
+        "--build-latency",
+        type=float,
+        default=0.05,
+        help="Seconds the Bright Data stand-in takes to build a snapshot",
+    )
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.05,
+        help="Seconds the fake model takes to answer",
+    )
+    parser.add_argument("--micro-number", type=int, default=2000)
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-startup", action="store_true")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args(argv[1:])
+
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    results = {
+        "environment": common.environment(),
+        "config": {
+            "levels": levels,
+            "requests": args.requests,
+            "build_latency": args.build_latency,
+            "llm_latency": args.llm_latency,
+        },
+    }
+    if not args.skip_startup:
+        results["startup"] = measure_import()
+    if not args.skip_micro:
+        results["micro"] = run_micro(args.micro_number)
+    if not args.skip_pipeline:
+        results["pipeline"] = asyncio.run(
+            run_pipeline(levels, args.requests, args.build_latency, args.llm_latency)
+        )
+    common.write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
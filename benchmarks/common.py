@@ -0,0 +1,141 @@
+"""Shared setup for the benchmark suite.
+
+Importing this module sets the environment the benchmarks run under, so it must
+be imported before anything from ``app``: settings are read at import time.
+Every value is a default and can be overridden from the shell.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+from benchmarks.sample import SAMPLE_ANALYSIS
+
+BENCH_ENV = {
+    "OPENROUTER_API_KEY": "benchmark",
+    "BRIGHTDATA_API_TOKEN": "benchmark",
+    "BRIGHTDATA_INSTAGRAM_DATASET_ID": "gd_benchmark",
+    "BRIGHTDATA_BASE_URL": "http://brightdata-mock/datasets/v3",
+    "BRIGHTDATA_POLL_INITIAL_DELAY": "0.01",
+    "BRIGHTDATA_POLL_INTERVAL": "1",
+    "BRIGHTDATA_POLL_JITTER": "0",
+    "BRIGHTDATA_TRIGGER_CONCURRENCY": "1000",
+    "BRIGHTDATA_TRIGGER_RATE": "0",
+    "BRIGHTDATA_PROGRESS_CONCURRENCY": "1000",
+    "BRIGHTDATA_PROGRESS_RATE": "0",
+    "BRIGHTDATA_SNAPSHOT_CONCURRENCY": "1000",
+    "BRIGHTDATA_SNAPSHOT_RATE": "0",
+    "OPENROUTER_CONCURRENCY": "1000",
+    "OPENROUTER_RATE": "0",
+    "UPSTREAM_MAX_QUEUE_TIME": "600",
+    "PROFILE_CACHE_BACKEND": "none",
+    "ANALYSIS_CACHE_BACKEND": "none",
+    "SNAPSHOT_LEDGER_BACKEND": "none",
+    "PRESCREEN_ENABLED": "false",
+    "LOG_LEVEL": "WARNING",
+    "PYDANTIC_AI_NO_BANNER": "1",
+}
+for _key, _value in BENCH_ENV.items():
+    os.environ.setdefault(_key, _value)
+
+FIXTURES = "research/profiles.json"
+
+
+def fake_model(latency: float = 0.0) -> Any:
+    """Return a pydantic-ai model that answers with :data:`SAMPLE_ANALYSIS`.
+
+    Args:
+        latency: Seconds each model call sleeps before answering, to stand in
+            for the LLM round trip.
+    """
+
+    from pydantic_ai.messages import ModelResponse, ToolCallPart
+    from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+    async def respond(messages: List[Any], info: AgentInfo) -> ModelResponse:
+        if latency:
+            await asyncio.sleep(latency)
+        return ModelResponse(
+            parts=[ToolCallPart(info.output_tools[0].name, SAMPLE_ANALYSIS)]
+        )
+
+    return FunctionModel(respond, model_name="benchmark")
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """Summarize latency samples (in seconds) as milliseconds."""
+
+    import numpy as np
+
+    if not samples:
+        return {}
+    values = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def time_call(fn: Callable[[], Any], number: int, repeat: int = 5) -> Dict[str, float]:
+    """Time ``fn`` like :mod:`timeit` and report per-call figures.
+
+    Args:
+        fn: The function under test.
+        number: Calls per timing run.
+        repeat: Timing runs; the best and median are reported.
+    """
+
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - started) / number)
+    runs.sort()
+    return {
+        "calls": number * repeat,
+        "best_us": round(runs[0] * 1e6, 3),
+        "median_us": round(runs[len(runs) // 2] * 1e6, 3),
+        "ops_per_sec": round(1 / runs[0], 1),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the commit and machine a result was produced on."""
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def write_results(results: Dict[str, Any], path: str | None) -> None:
+    """Print ``results`` as JSON, or write them to ``path``."""
+
+    text = json.dumps(results, indent=2)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
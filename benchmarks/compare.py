@@ -0,0 +1,74 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage: ``python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]``
+
+Exits with status 1 when a latency grows, or a throughput drops, by more than
+the threshold (a fraction of the baseline).
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Metric name -> True when higher is better.
+METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+    "best_us": False,
+    "median_s": False,
+}
+
+
+def _rows(results: Dict[str, Any]) -> Iterator[Tuple[str, str, float]]:
+    for level in results.get("pipeline", []):
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            if metric in level:
+                yield f"pipeline c={level['concurrency']}", metric, level[metric]
+    for level in results.get("scaling", []):
+        for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+            if metric in level:
+                yield f"scaling workers={level['workers']}", metric, level[metric]
+    if "median_s" in results.get("startup", {}):
+        yield "startup import", "median_s", results["startup"]["median_s"]
+    for name, timing in results.get("micro", {}).items():
+        if isinstance(timing, dict) and "best_us" in timing:
+            yield f"micro {name}", "best_us", timing["best_us"]
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv[1:])
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = {
+            (bench, metric): value for bench, metric, value in _rows(json.load(f))
+        }
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = list(_rows(json.load(f)))
+
+    regressions = 0
+    for bench, metric, value in candidate:
+        before = baseline.get((bench, metric))
+        if not before:
+            continue
+        change = (value - before) / before
+        worse = -change if METRICS[metric] else change
+        flag = "REGRESSION" if worse > args.threshold else ""
+        regressions += bool(flag)
+        print(
+            f"{bench:<36} {metric:<15} {before:>12.3f} -> {value:>12.3f} "
+            f"({change:+.1%}) {flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
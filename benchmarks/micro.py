@@ -0,0 +1,52 @@
+"""Micro-benchmarks of the CPU-bound steps on the analysis hot path."""
+
+from benchmarks import common
+
+import itertools
+import json
+from typing import Any, Dict
+
+from app.agents.payload import build_payload, serialize_payload
+from app.models.instagram import InstagramAnalysis
+from app.services.brightdata import _build_profile, normalize_username
+from app.services.cohort import flatten_snapshots
+
+
+def run_micro(number: int = 2000, repeat: int = 5) -> Dict[str, Any]:
+    """Time profile normalization, payload serialization and output validation.
+
+    Args:
+        number: Calls per timing run.
+        repeat: Timing runs per benchmark.
+
+    Returns:
+        Per-call timings keyed by benchmark name.
+    """
+
+    with open(common.FIXTURES, encoding="utf-8") as f:
+        records = flatten_snapshots(json.load(f))
+    profiles = [
+        _build_profile(record, normalize_username(record["account"]))
+        for record in records
+    ]
+    analysis_json = json.dumps(common.SAMPLE_ANALYSIS)
+
+    next_record = itertools.cycle(records).__next__
+    next_profile = itertools.cycle(profiles).__next__
+
+    def normalize() -> None:
+        record = next_record()
+        _build_profile(record, normalize_username(record["account"]))
+
+    def serialize() -> None:
+        serialize_payload(build_payload(next_profile()))
+
+    def validate() -> None:
+        InstagramAnalysis.model_validate_json(analysis_json)
+
+    return {
+        "fixture_profiles": len(records),
+        "profile_normalization": common.time_call(normalize, number, repeat),
+        "payload_serialization": common.time_call(serialize, number, repeat),
+        "analysis_validation": common.time_call(validate, number, repeat),
+    }
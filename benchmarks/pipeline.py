@@ -0,0 +1,104 @@
+"""End-to-end load benchmark of ``GET /api/v1/instagram/analysis``.
+
+The API runs in-process behind its own lifespan. Bright Data is replaced by
+:class:`MockBrightData` (mounted on the shared HTTP client through an ASGI
+transport) and the LLM by :func:`benchmarks.common.fake_model`, so a run
+measures the service itself: scheduling, polling, parsing, payload building,
+validation and the per-upstream limiters.
+"""
+
+from benchmarks import common
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+import httpx
+
+from app.agents.instagram_analyzer import get_instagram_agent
+from app.main import app
+from app.services import brightdata
+from app.services.brightdata_mock import MockBrightData
+
+
+async def run_level(
+    client: httpx.AsyncClient, concurrency: int, requests: int
+) -> Dict[str, Any]:
+    """Send ``requests`` analyses from ``concurrency`` concurrent clients.
+
+    Every request uses a new username so that neither the caches nor the
+    single-flight groups can collapse the work.
+    """
+
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses: Counter[int] = Counter()
+
+    async def worker() -> None:
+        while (i := next(counter)) < requests:
+            started = time.perf_counter()
+            resp = await client.get(
+                "/api/v1/instagram/analysis",
+                params={"profile": f"bench_{concurrency}_{i}"},
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[resp.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": requests - statuses[200],
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2),
+        **common.percentiles(latencies),
+    }
+
+
+async def run_pipeline(
+    levels: Sequence[int],
+    requests: int | None = None,
+    build_latency: float = 0.05,
+    llm_latency: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """Run :func:`run_level` for each concurrency level.
+
+    Args:
+        levels: Concurrent client counts, e.g. ``(1, 10, 100, 1000)``.
+        requests: Requests per level; defaults to ``max(50, 2 * concurrency)``.
+        build_latency: Seconds the mock takes to build each snapshot.
+        llm_latency: Seconds the fake model takes to answer.
+
+    Returns:
+        One result dictionary per level.
+    """
+
+    mock = MockBrightData.from_file(
+        common.FIXTURES, build_latency=build_latency, seed=0
+    )
+    mock_app = mock.build_app()
+    build_client = brightdata._build_http_client
+    brightdata._build_http_client = lambda: httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=mock_app), timeout=None
+    )
+    results = []
+    try:
+        with get_instagram_agent().override(model=common.fake_model(llm_latency)):
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app),
+                    base_url="http://wykra",
+                    timeout=None,
+                ) as client:
+                    for concurrency in levels:
+                        count = requests or max(50, 2 * concurrency)
+                        results.append(await run_level(client, concurrency, count))
+    finally:
+        brightdata._build_http_client = build_client
+    return results
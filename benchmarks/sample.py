@@ -0,0 +1,22 @@
+"""Canned agent output shared by the benchmarks and the test suite.
+
+Kept apart from :mod:`benchmarks.common`, which sets the benchmark
+environment on import. The fields are in schema order, the order a streamed
+response delivers them in.
+"""
+
+from typing import Any, Dict
+
+SAMPLE_ANALYSIS: Dict[str, Any] = {
+    "qualityScore": 4,
+    "topic": "Baking",
+    "niche": "Sourdough",
+    "sponsoredFrequency": "low",
+    "contentAuthenticity": "authentic",
+    "followerAuthenticity": "likely real",
+    "visibleBrands": [],
+    "engagementStrength": "moderate",
+    "hashtagsStatistics": "Consistent niche hashtags such as #sourdough.",
+    "postsAnalysis": "Regular posts of home-baked loaves with personal captions.",
+    "summary": "A home baker sharing sourdough experiments with a small, engaged audience.",
+}
@@ -0,0 +1,242 @@
+"""Throughput of the API under gunicorn as the number of workers grows.
+
+For each worker count the API is started with ``gunicorn.conf.py`` (shared
+SQLite caches, leases and snapshot ledger, as in production) serving
+:mod:`benchmarks.scaling_app`, and loaded over real HTTP from several client
+processes. Every request uses a new username, so the work cannot be collapsed
+and each worker does the full pipeline.
+
+Scaling is only near-linear while there are spare cores: the workers and the
+load generators share the machine, so keep ``workers + clients`` at or below
+the CPU count.
+
+Usage: ``python -m benchmarks.scaling [--workers 1,2,4] [--output results.json]``
+"""
+
+from benchmarks import common
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence, Tuple
+
+import httpx
+
+
+async def _drive(
+    base_url: str, prefix: str, concurrency: int, requests: int
+) -> Tuple[List[float], Dict[int, int]]:
+    latencies: List[float] = []
+    statuses: Counter[int] = Counter()
+    remaining = iter(range(requests))
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=None,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+
+        async def worker() -> None:
+            for i in remaining:
+                started = time.perf_counter()
+                try:
+                    resp = await client.get(
+                        "/api/v1/instagram/analysis",
+                        params={"profile": f"{prefix}_{i}"},
+                    )
+                    statuses[resp.status_code] += 1
+                except httpx.HTTPError:
+                    statuses[0] += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, dict(statuses)
+
+
+def _drive_process(
+    base_url: str, prefix: str, concurrency: int, requests: int
+) -> Tuple[List[float], Dict[int, int]]:
+    return asyncio.run(_drive(base_url, prefix, concurrency, requests))
+
+
+def _wait_until_healthy(
+    base_url: str, server: subprocess.Popen, timeout: float
+) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API did not become healthy within {timeout}s")
+
+
+def run_workers(
+    workers: int,
+    concurrency: int,
+    requests: int,
+    clients: int,
+    port: int,
+    build_latency: float,
+    llm_latency: float,
+) -> Dict[str, Any]:
+    """Start gunicorn with ``workers`` workers and measure its throughput.
+
+    Args:
+        workers: Gunicorn worker processes.
+        concurrency: Concurrent requests across all client processes.
+        requests: Requests sent in total.
+        clients: Load generator processes.
+        port: Port the API listens on.
+        build_latency: Seconds the mock takes to build each snapshot.
+        llm_latency: Seconds the fake model takes to answer.
+
+    Returns:
+        The throughput and latency figures for this worker count.
+    """
+
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory(prefix="wykra-scaling-") as tmp:
+        env = {
+            **os.environ,
+            "PORT": str(port),
+            "WEB_CONCURRENCY": str(workers),
+            # Outlast any pause of the starved client so it never reuses a
+            # connection the server is closing.
+            "GUNICORN_KEEPALIVE": "75",
+            "PROFILE_CACHE_BACKEND": "sqlite",
+            "ANALYSIS_CACHE_BACKEND": "sqlite",
+            "COORDINATION_BACKEND": "sqlite",
+            "CACHE_SQLITE_PATH": os.path.join(tmp, "cache.sqlite3"),
+            "COORDINATION_SQLITE_PATH": os.path.join(tmp, "cache.sqlite3"),
+            "SNAPSHOT_LEDGER_BACKEND": "sqlite",
+            "SNAPSHOT_LEDGER_PATH": os.path.join(tmp, "cache.sqlite3"),
+            "PROMETHEUS_MULTIPROC_DIR": os.path.join(tmp, "metrics"),
+            "BENCH_BUILD_LATENCY": str(build_latency),
+            "BENCH_LLM_LATENCY": str(llm_latency),
+        }
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "-c",
+                "gunicorn.conf.py",
+                "--log-level",
+                "warning",
+                "benchmarks.scaling_app:app",
+            ],
+            env=env,
+        )
+        try:
+            _wait_until_healthy(base_url, server, timeout=60)
+            # Let every worker finish its lifespan and warm-up.
+            _drive_process(base_url, f"warmup_{workers}", workers * 2, workers * 10)
+
+            per_client = [requests // clients] * clients
+            per_client[0] += requests - sum(per_client)
+            started = time.perf_counter()
+            with ProcessPoolExecutor(clients) as pool:
+                parts = list(
+                    pool.map(
+                        _drive_process,
+                        [base_url] * clients,
+                        [f"scale_{workers}_{c}" for c in range(clients)],
+                        [max(1, concurrency // clients)] * clients,
+                        per_client,
+                    )
+                )
+            wall = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    latencies = [latency for part, _ in parts for latency in part]
+    statuses: Counter[int] = Counter()
+    for _, part in parts:
+        statuses.update(part)
+    return {
+        "workers": workers,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": requests - statuses[200],
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2),
+        **common.percentiles(latencies),
+    }
+
+
+def run_scaling(worker_counts: Sequence[int], **kwargs: Any) -> List[Dict[str, Any]]:
+    """Run :func:`run_workers` for each worker count and add the speedup.
+
+    ``speedup`` is the throughput relative to the first worker count and
+    ``efficiency`` the speedup per added worker; 1.0 is perfectly linear.
+    """
+
+    results = [run_workers(workers, **kwargs) for workers in worker_counts]
+    base = results[0]
+    for result in results:
+        speedup = result["throughput_rps"] / base["throughput_rps"]
+        result["speedup"] = round(speedup, 3)
+        result["efficiency"] = round(speedup / (result["workers"] / base["workers"]), 3)
+    return results
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scaling", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "--workers", default="1,2,4", help="Comma-separated worker counts"
+    )
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--clients",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Load generator processes",
+    )
+    parser.add_argument("--port", type=int, default=3099)
+    parser.add_argument("--build-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args(argv[1:])
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    results = {
+        "environment": common.environment(),
+        "config": {
+            "workers": worker_counts,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "clients": args.clients,
+            "build_latency": args.build_latency,
+            "llm_latency": args.llm_latency,
+        },
+        "scaling": run_scaling(
+            worker_counts,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            clients=args.clients,
+            port=args.port,
+            build_latency=args.build_latency,
+            llm_latency=args.llm_latency,
+        ),
+    }
+    common.write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
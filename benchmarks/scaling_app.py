@@ -0,0 +1,33 @@
+"""ASGI app the scaling benchmark runs under gunicorn.
+
+Each worker serves the real app with Bright Data replaced by its own in-process
+:class:`MockBrightData` and the LLM by :func:`benchmarks.common.fake_model`, so
+throughput is bounded by the workers themselves rather than by a shared
+stand-in process.
+"""
+
+from benchmarks import common
+
+import os
+
+import httpx
+
+from app.agents.instagram_analyzer import get_instagram_agent
+from app.main import app
+from app.services import brightdata
+from app.services.brightdata_mock import MockBrightData
+
+_mock_app = MockBrightData.from_file(
+    common.FIXTURES,
+    build_latency=float(os.getenv("BENCH_BUILD_LATENCY", "0.05")),
+    seed=0,
+).build_app()
+
+brightdata._build_http_client = lambda: httpx.AsyncClient(
+    transport=httpx.ASGITransport(app=_mock_app), timeout=None
+)
+get_instagram_agent().model = common.fake_model(
+    float(os.getenv("BENCH_LLM_LATENCY", "0.05"))
+)
+
+__all__ = ["app"]
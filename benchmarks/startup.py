@@ -0,0 +1,96 @@
+"""Cold-import budget check for the API.
+
+Imports ``app.main`` in fresh interpreters without ``OPENROUTER_API_KEY`` and
+fails when the median import time exceeds the budget, or when a module that
+should load lazily (the LLM stack) is imported eagerly.
+
+Usage: ``python -m benchmarks.startup [--budget 0.75] [--runs 5]``. The test
+suite (``tests/test_startup.py``) only checks the lazy modules, since the
+timing depends on the machine.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+LAZY_MODULES = ("pydantic_ai", "openai")
+DEFAULT_BUDGET = 0.75
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def measure_import(runs: int = 5) -> Dict[str, Any]:
+    """Import ``app.main`` in ``runs`` fresh interpreters and summarize.
+
+    Returns:
+        The median and best import time in seconds, and the lazy modules that
+        were loaded anyway.
+    """
+
+    env = {key: value for key, value in os.environ.items()}
+    env.pop("OPENROUTER_API_KEY", None)
+    env.setdefault("LOG_LEVEL", "WARNING")
+
+    timings: List[float] = []
+    loaded: set[str] = set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            env=env,
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return {
+        "runs": runs,
+        "median_s": round(statistics.median(timings), 4),
+        "best_s": round(min(timings), 4),
+        "eagerly_loaded": sorted(loaded),
+    }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help="Maximum median import time in seconds",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv[1:])
+
+    result = measure_import(args.runs)
+    result["budget_s"] = args.budget
+    print(json.dumps(result, indent=2))
+
+    if result["eagerly_loaded"]:
+        print(f"FAIL: imported at startup: {', '.join(result['eagerly_loaded'])}")
+        return 1
+    if result["median_s"] > args.budget:
+        print(f"FAIL: median import {result['median_s']}s > {args.budget}s budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,58 @@
+"""Gunicorn settings for running the API with several worker processes.
+
+Usage: ``WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py app.main:app``
+
+With more than one worker, the profile cache, the analysis cache and the
+cross-process leases default to the shared SQLite database, so a username
+requested on two workers is scraped and analyzed once. Prometheus metrics are
+collected per process in ``PROMETHEUS_MULTIPROC_DIR`` and merged on scrape.
+"""
+
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '3011')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn_worker.UvicornWorker"
+# Uvicorn's own default; gunicorn's 2s drops reused connections under load.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+SHARED_BACKENDS = (
+    "PROFILE_CACHE_BACKEND",
+    "ANALYSIS_CACHE_BACKEND",
+    "COORDINATION_BACKEND",
+)
+
+if workers > 1:
+    for _name in SHARED_BACKENDS:
+        os.environ.setdefault(_name, "sqlite")
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        os.path.join(tempfile.gettempdir(), f"wykra-metrics-{os.getpid()}"),
+    )
+
+
+def on_starting(server):
+    for name in SHARED_BACKENDS:
+        if workers > 1 and os.environ[name] != "sqlite":
+            server.log.warning(
+                "%s=%s is not shared between the %s workers; duplicate scrapes "
+                "and LLM calls are possible",
+                name,
+                os.environ[name],
+                workers,
+            )
+
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
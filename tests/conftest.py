@@ -0,0 +1,88 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, List
+
+# Settings are read once at import, so the test environment has to be in place
+# before anything under ``app`` is imported. It points Bright Data at a host
+# that only the in-process stand-in answers and keeps all state in memory.
+os.environ.update(
+    {
+        "LOG_LEVEL": "WARNING",
+        "BRIGHTDATA_API_TOKEN": "test-token",
+        "BRIGHTDATA_INSTAGRAM_DATASET_ID": "gd_test",
+        "BRIGHTDATA_BASE_URL": "http://brightdata.test/datasets/v3",
+        "BRIGHTDATA_HTTP2": "false",
+        "BRIGHTDATA_POLL_INITIAL_DELAY": "0.02",
+        "BRIGHTDATA_TRIGGER_RATE": "0",
+        "BRIGHTDATA_PROGRESS_RATE": "0",
+        "BRIGHTDATA_SNAPSHOT_RATE": "0",
+        "OPENROUTER_API_KEY": "test-key",
+        "OPENROUTER_RATE": "0",
+        "PROFILE_CACHE_BACKEND": "memory",
+        "ANALYSIS_CACHE_BACKEND": "memory",
+        "SNAPSHOT_LEDGER_BACKEND": "none",
+        "COORDINATION_BACKEND": "none",
+        "PRESCREEN_ENABLED": "false",
+        "LLM_WARMUP": "false",
+    }
+)
+os.environ.pop("BRIGHTDATA_NOTIFY_URL", None)
+os.environ.pop("BRIGHTDATA_NOTIFY_SECRET", None)
+
+import httpx
+import pytest
+
+from app.services import brightdata
+from app.services.brightdata_mock import MockBrightData
+from benchmarks.sample import SAMPLE_ANALYSIS
+
+FIXTURES = Path(__file__).resolve().parent.parent / "research" / "profiles.json"
+
+
+@pytest.fixture
+def mock_brightdata() -> MockBrightData:
+    """The Bright Data stand-in, with snapshots that are ready at once."""
+
+    return MockBrightData.from_file(str(FIXTURES), seed=0)
+
+
+@pytest.fixture
+def use_mock(monkeypatch: pytest.MonkeyPatch, mock_brightdata: MockBrightData):
+    """Return a function that routes the Bright Data client to the stand-in.
+
+    It must be called from inside the test's event loop, since the client is
+    bound to it.
+    """
+
+    def install() -> httpx.AsyncClient:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=mock_brightdata.build_app())
+        )
+        monkeypatch.setattr(brightdata, "_http_client", client)
+        return client
+
+    return install
+
+
+@pytest.fixture
+def llm_calls(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Replace the LLM with a fake model and record the prompt of each call."""
+
+    from pydantic_ai.messages import ModelResponse, ToolCallPart
+    from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+    from app.agents.instagram_analyzer import get_instagram_agent
+
+    calls: List[str] = []
+
+    async def respond(messages: List[Any], info: AgentInfo) -> ModelResponse:
+        calls.append(str(messages[-1].parts[-1].content))
+        await asyncio.sleep(0.1)
+        return ModelResponse(
+            parts=[ToolCallPart(info.output_tools[0].name, SAMPLE_ANALYSIS)]
+        )
+
+    agent = get_instagram_agent()
+    monkeypatch.setattr(agent, "model", FunctionModel(respond, model_name="test"))
+    return calls
@@ -0,0 +1,46 @@
+import asyncio
+
+from app.agents import instagram_analyzer
+from app.agents.instagram_analyzer import _analysis_cache_key, analyze_profile
+from app.models.instagram import InstagramProfile
+
+
+def test_the_key_depends_on_the_model_prompt_and_payload(monkeypatch):
+    key = _analysis_cache_key('{"username": "alice"}')
+
+    assert _analysis_cache_key('{"username": "alice"}') == key
+    assert _analysis_cache_key('{"username": "bob"}') != key
+
+    monkeypatch.setattr(instagram_analyzer.settings, "openrouter_model", "other/model")
+    assert _analysis_cache_key('{"username": "alice"}') != key
+
+    monkeypatch.undo()
+    monkeypatch.setattr(instagram_analyzer, "SYSTEM_PROMPT", "A new prompt.")
+    assert _analysis_cache_key('{"username": "alice"}') != key
+
+
+def test_parts_cannot_run_into_each_other(monkeypatch):
+    monkeypatch.setattr(instagram_analyzer.settings, "openrouter_model", "m")
+    monkeypatch.setattr(instagram_analyzer, "SYSTEM_PROMPT", "ab")
+    joined_left = _analysis_cache_key("c")
+
+    monkeypatch.setattr(instagram_analyzer, "SYSTEM_PROMPT", "a")
+    joined_right = _analysis_cache_key("bc")
+
+    assert joined_left != joined_right
+
+
+def test_an_unchanged_payload_is_answered_from_the_cache(llm_calls):
+    profile = InstagramProfile(
+        username="cache_user", followers=1200, posts_count=3, raw={"posts": []}
+    )
+
+    async def scenario():
+        first = await analyze_profile(profile)
+        second = await analyze_profile(profile.model_copy())
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert len(llm_calls) == 1
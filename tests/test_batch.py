@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services import brightdata
+from app.services.brightdata_mock import MockBrightData
+from app.services.limits import UpstreamBusyError
+
+from conftest import FIXTURES
+
+
+@pytest.fixture
+def mock_brightdata() -> MockBrightData:
+    # Slow enough builds that concurrent fetches overlap.
+    return MockBrightData.from_file(str(FIXTURES), build_latency=0.2, seed=0)
+
+
+def _snapshots_of(mock_brightdata: MockBrightData, username: str) -> int:
+    return sum(
+        any(record.get("account") == username for record in snapshot.records)
+        for snapshot in mock_brightdata.snapshots.values()
+    )
+
+
+def test_batch_joins_a_single_fetch_in_flight(mock_brightdata, use_mock):
+    async def scenario():
+        client = use_mock()
+        single = asyncio.create_task(brightdata.fetch_instagram_profile("b1_shared"))
+        await asyncio.sleep(0.05)
+        batch = await brightdata.fetch_instagram_profiles(["b1_shared", "b1_other"])
+        await single
+        await client.aclose()
+        return batch
+
+    batch = asyncio.run(scenario())
+
+    assert all(
+        isinstance(result, brightdata.InstagramProfile) for result in batch.values()
+    )
+    assert _snapshots_of(mock_brightdata, "b1_shared") == 1
+
+
+def test_single_fetch_joins_a_batch_in_flight(mock_brightdata, use_mock):
+    async def scenario():
+        client = use_mock()
+        batch = asyncio.create_task(
+            brightdata.fetch_instagram_profiles(["b2_shared", "b2_other"])
+        )
+        await asyncio.sleep(0.05)
+        profile = await brightdata.fetch_instagram_profile("b2_shared")
+        await batch
+        await client.aclose()
+        return profile
+
+    profile = asyncio.run(scenario())
+
+    assert profile.username == "b2_shared"
+    assert mock_brightdata.requests["trigger"] == 1
+
+
+def test_a_failing_chunk_becomes_error_rows(monkeypatch, mock_brightdata, use_mock):
+    monkeypatch.setattr(brightdata.settings, "brightdata_batch_max_size", 1)
+    trigger = brightdata._trigger_snapshot
+
+    async def busy_for_one(client, headers, dataset, inputs):
+        if inputs == [{"user_name": "b3_busy"}]:
+            raise UpstreamBusyError("Bright Data trigger", retry_after=1)
+        return await trigger(client, headers, dataset, inputs)
+
+    monkeypatch.setattr(brightdata, "_trigger_snapshot", busy_for_one)
+
+    async def scenario():
+        client = use_mock()
+        results = await brightdata.fetch_instagram_profiles(["b3_busy", "b3_fine"])
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert isinstance(results["b3_busy"], brightdata.BrightDataError)
+    assert "at capacity" in str(results["b3_busy"])
+    assert isinstance(results["b3_fine"], brightdata.InstagramProfile)
+
+
+def test_batch_analysis_shares_the_llm_call_with_a_single_analysis(
+    mock_brightdata, use_mock, llm_calls
+):
+    async def scenario():
+        client = use_mock()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as api:
+            single = asyncio.create_task(
+                api.get("/api/v1/instagram/analysis", params={"profile": "b4_shared"})
+            )
+            await asyncio.sleep(0.05)
+            batch = await api.post(
+                "/api/v1/instagram/analysis/batch",
+                json={"usernames": ["b4_shared", "b4_other"]},
+            )
+            single = await single
+        await client.aclose()
+        return single, batch
+
+    single, batch = asyncio.run(scenario())
+
+    assert single.status_code == 200
+    assert batch.status_code == 200
+    assert [item["error"] for item in batch.json()] == [None, None]
+    assert len(llm_calls) == 2
+    assert sum("b4_shared" in prompt for prompt in llm_calls) == 1
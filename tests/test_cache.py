@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import pytest
+
+from app.models.instagram import InstagramProfile
+from app.services.cache import MemoryCache, ModelCache, SQLiteCache, build_cache_backend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_backend(request, tmp_path):
+    def make(ttl: float = 60, max_entries: int = 10, namespace: str = "test"):
+        return build_cache_backend(
+            request.param,
+            namespace=namespace,
+            ttl=ttl,
+            max_entries=max_entries,
+            sqlite_path=str(tmp_path / "cache.sqlite3"),
+        )
+
+    return make
+
+
+def test_entries_expire_after_the_ttl(make_backend):
+    backend = make_backend(ttl=60)
+
+    async def scenario():
+        await backend.set("fresh", "a")
+        await backend.set("old", "b", stored_at=time.time() - 61)
+        return await backend.get("fresh"), await backend.get("old")
+
+    fresh, old = asyncio.run(scenario())
+
+    assert fresh[1] == "a"
+    assert old is None
+
+
+def test_the_least_recently_used_entry_is_evicted(make_backend):
+    backend = make_backend(max_entries=2)
+
+    async def scenario():
+        await backend.set("a", "1")
+        await asyncio.sleep(0.01)
+        await backend.set("b", "2")
+        await asyncio.sleep(0.01)
+        await backend.get("a")
+        await asyncio.sleep(0.01)
+        await backend.set("c", "3")
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    a, b, c = asyncio.run(scenario())
+
+    assert (a[1], b, c[1]) == ("1", None, "3")
+
+
+def test_delete_removes_the_entry(make_backend):
+    backend = make_backend()
+
+    async def scenario():
+        await backend.set("a", "1")
+        await backend.delete("a")
+        return await backend.get("a")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_sqlite_namespaces_share_a_file_and_survive_a_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    profiles = SQLiteCache(path, namespace="profiles", ttl=60, max_entries=10)
+    analyses = SQLiteCache(path, namespace="analyses", ttl=60, max_entries=10)
+
+    async def scenario():
+        await profiles.set("key", "profile")
+        await analyses.set("key", "analysis")
+        reopened = SQLiteCache(path, namespace="profiles", ttl=60, max_entries=10)
+        return await reopened.get("key"), await analyses.get("key")
+
+    profile, analysis = asyncio.run(scenario())
+
+    assert (profile[1], analysis[1]) == ("profile", "analysis")
+
+
+def test_unknown_backends_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        build_cache_backend(
+            "redis", "test", ttl=60, max_entries=10, sqlite_path=str(tmp_path)
+        )
+
+
+def test_max_age_is_tighter_than_the_ttl():
+    cache = ModelCache(MemoryCache(ttl=3600, max_entries=10), InstagramProfile)
+    profile = InstagramProfile(username="alice", followers=10, raw={})
+
+    async def scenario():
+        await cache.set("alice", profile, stored_at=time.time() - 600)
+        return (
+            await cache.get("alice"),
+            await cache.get("alice", max_age=900),
+            await cache.get("alice", max_age=300),
+            await cache.get("alice", max_age=0),
+        )
+
+    no_limit, loose, tight, zero = asyncio.run(scenario())
+
+    assert no_limit == loose == profile
+    assert tight is None
+    assert zero is None
+
+
+def test_unreadable_entries_are_dropped():
+    backend = MemoryCache(ttl=60, max_entries=10)
+    cache = ModelCache(backend, InstagramProfile)
+
+    async def scenario():
+        await backend.set("alice", '{"not": "a profile"}')
+        return await cache.get("alice"), await backend.get("alice")
+
+    model, entry = asyncio.run(scenario())
+
+    assert model is None
+    assert entry is None
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.api.routes import instagram as instagram_routes
+from app.main import app
+from app.services.cohort import compute_cohort_stats, flatten_snapshots
+
+from conftest import FIXTURES
+
+COHORT_PATH = "/api/v1/instagram/cohort"
+
+
+def _profile(account: str, *datetimes: str) -> dict:
+    return {
+        "account": account,
+        "followers": 1000,
+        "following": 100,
+        "posts": [
+            {"likes": 50, "comments": 5, "datetime": value} for value in datetimes
+        ],
+    }
+
+
+def _post(body) -> httpx.Response:
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as api:
+            return await api.post(COHORT_PATH, json=body)
+
+    return asyncio.run(scenario())
+
+
+def test_malformed_timestamps_do_not_fail_the_cohort():
+    response = _post(
+        [
+            _profile("clean", "2024-01-01T00:00:00.000Z", "2024-01-15T00:00:00.000Z"),
+            _profile(
+                "messy",
+                "2024-01-01T00:00:00.000Z",
+                "garbage",
+                "2024-01-08T00:00:00.000Z",
+            ),
+        ]
+    )
+
+    assert response.status_code == 200
+    stats = {item["username"]: item for item in response.json()["profiles"]}
+    assert stats["clean"]["posts_per_week"] == pytest.approx(0.5)
+    assert stats["messy"]["posts_analyzed"] == 3
+    assert stats["messy"]["posts_per_week"] == pytest.approx(1.0)
+
+
+def test_too_many_profiles_are_rejected(monkeypatch):
+    monkeypatch.setattr(instagram_routes.settings, "cohort_max_profiles", 2)
+
+    response = _post([_profile(f"p{i}") for i in range(3)])
+
+    assert response.status_code == 413
+
+
+def test_fixture_export_is_ranked_by_engagement():
+    with open(FIXTURES, encoding="utf-8") as f:
+        records = flatten_snapshots(json.load(f))
+
+    stats = compute_cohort_stats(records)
+
+    rates = [p.engagement_rate for p in stats.profiles if p.engagement_rate is not None]
+    assert stats.summary.profiles == len(records)
+    assert rates == sorted(rates, reverse=True)
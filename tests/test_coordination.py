@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.agents.instagram_analyzer import analyze_profile
+from app.services import analysis, brightdata
+from app.services.coordination import SQLiteLeases
+
+
+@pytest.fixture
+def leases(monkeypatch, tmp_path):
+    """SQLite leases for this worker, and a second owner standing in for another."""
+
+    path = str(tmp_path / "leases.sqlite3")
+    ours = SQLiteLeases(path, ttl=5, poll_interval=0.02)
+    theirs = SQLiteLeases(path, ttl=5, poll_interval=0.02)
+    monkeypatch.setattr(analysis, "get_leases", lambda: ours)
+    monkeypatch.setattr(brightdata, "get_leases", lambda: ours)
+    return theirs
+
+
+def test_waiting_for_the_analysis_lease_reuses_the_holders_work(
+    leases, mock_brightdata, use_mock, llm_calls
+):
+    async def other_worker(started: asyncio.Event) -> None:
+        async with leases.exclusive("analysis:c1_user"):
+            started.set()
+            profile = await brightdata.fetch_instagram_profile("c1_user", max_age=0)
+            await analyze_profile(profile)
+
+    async def scenario():
+        client = use_mock()
+        started = asyncio.Event()
+        other = asyncio.create_task(other_worker(started))
+        await started.wait()
+        result = await analysis.analyze_instagram_username("c1_user", max_age=0)
+        await other
+        await client.aclose()
+        return result
+
+    result = asyncio.run(scenario())
+
+    assert result.qualityScore == 4
+    assert mock_brightdata.requests["trigger"] == 1
+    assert len(llm_calls) == 1
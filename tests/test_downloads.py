@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.services import brightdata
+from app.services.brightdata_mock import MockBrightData
+from app.services.datasets import datasets
+
+from conftest import FIXTURES
+
+
+@pytest.fixture
+def mock_brightdata() -> MockBrightData:
+    # Ready at once, but the download keeps answering 202 for a while, more
+    # times than a fixed attempt count would allow.
+    return MockBrightData.from_file(str(FIXTURES), not_ready_responses=8, seed=0)
+
+
+@pytest.fixture
+def dataset(monkeypatch):
+    dataset = datasets.get("profiles")
+    monkeypatch.setattr(dataset, "poll_initial_delay", 0.01)
+    monkeypatch.setattr(dataset, "poll_interval", 0.05)
+    return dataset
+
+
+async def _download(dataset, username: str):
+    client = brightdata.get_http_client()
+    headers = brightdata._auth_headers(dataset)
+    snapshot_id = await brightdata._trigger_snapshot(
+        client, headers, dataset, [{"user_name": username}]
+    )
+    try:
+        return [
+            record
+            async for record in brightdata._iter_snapshot_records(
+                client, headers, dataset, snapshot_id
+            )
+        ]
+    finally:
+        await client.aclose()
+
+
+def test_downloads_retry_202_until_the_snapshot_is_served(
+    dataset, mock_brightdata, use_mock
+):
+    async def scenario():
+        use_mock()
+        return await _download(dataset, "d1_user")
+
+    records = asyncio.run(scenario())
+
+    assert [record["account"] for record in records] == ["d1_user"]
+    assert mock_brightdata.requests["snapshot"] == 9
+
+
+def test_downloads_give_up_at_the_dataset_wait_budget(
+    monkeypatch, dataset, mock_brightdata, use_mock
+):
+    monkeypatch.setattr(dataset, "max_wait_time", 0.1)
+
+    async def scenario():
+        use_mock()
+        with pytest.raises(brightdata.BrightDataError, match="not ready"):
+            await _download(dataset, "d2_user")
+
+    asyncio.run(scenario())
+
+    assert 1 < mock_brightdata.requests["snapshot"] < 9
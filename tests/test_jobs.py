@@ -0,0 +1,117 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api.routes import instagram as instagram_routes
+from app.main import app
+from app.models.instagram import InstagramAnalysis
+from app.services import jobs
+from app.services.brightdata import BrightDataError
+from app.services.jobs import JobManager, JobQueueFullError
+
+from conftest import SAMPLE_ANALYSIS
+
+
+@pytest.fixture
+def analyses(monkeypatch):
+    """Replace the analysis with a short sleep and track its concurrency."""
+
+    state = {"running": 0, "peak": 0}
+
+    async def analyze(profile, max_age=None):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            state["running"] -= 1
+        if profile == "missing":
+            raise BrightDataError("Profile not found")
+        if profile == "broken":
+            raise RuntimeError("boom")
+        return InstagramAnalysis(**SAMPLE_ANALYSIS)
+
+    monkeypatch.setattr(jobs, "analyze_instagram_username", analyze)
+    return state
+
+
+async def _finish(manager: JobManager, profiles):
+    await manager.start()
+    submitted = [manager.submit(profile) for profile in profiles]
+    await manager._queue.join()
+    await manager.stop()
+    return submitted
+
+
+def test_jobs_run_on_a_bounded_pool(analyses):
+    manager = JobManager(workers=2, queue_size=10, retention=60)
+
+    submitted = asyncio.run(_finish(manager, [f"user{i}" for i in range(5)]))
+
+    assert [job.status for job in submitted] == ["succeeded"] * 5
+    assert all(job.result.topic == SAMPLE_ANALYSIS["topic"] for job in submitted)
+    assert analyses["peak"] == 2
+
+
+def test_failures_are_recorded_on_the_job(analyses):
+    manager = JobManager(workers=1, queue_size=10, retention=60)
+
+    missing, broken = asyncio.run(_finish(manager, ["missing", "broken"]))
+
+    assert (missing.status, missing.error) == ("failed", "Profile not found")
+    assert (broken.status, broken.error) == ("failed", "Analysis failed: boom")
+    assert broken.finished_at >= broken.started_at
+
+
+def test_a_full_queue_rejects_new_jobs():
+    manager = JobManager(workers=1, queue_size=1, retention=60)
+
+    async def scenario():
+        manager.submit("first")
+        with pytest.raises(JobQueueFullError):
+            manager.submit("second")
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_are_pruned_after_the_retention(analyses):
+    manager = JobManager(workers=1, queue_size=10, retention=0)
+
+    async def scenario():
+        (old,) = await _finish(manager, ["old"])
+        new = manager.submit("new")
+        return old, new
+
+    old, new = asyncio.run(scenario())
+
+    assert manager.get(old.id) is None
+    assert manager.get(new.id) is new
+
+
+def test_the_job_routes_queue_and_report_jobs(monkeypatch):
+    manager = JobManager(workers=1, queue_size=1, retention=60)
+    monkeypatch.setattr(instagram_routes, "job_manager", manager)
+
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as api:
+            created = await api.post(
+                "/api/v1/instagram/analysis/jobs", json={"profile": "alice"}
+            )
+            full = await api.post(
+                "/api/v1/instagram/analysis/jobs", json={"profile": "bob"}
+            )
+            found = await api.get(
+                f"/api/v1/instagram/analysis/jobs/{created.json()['id']}"
+            )
+            unknown = await api.get("/api/v1/instagram/analysis/jobs/nope")
+        return created, full, found, unknown
+
+    created, full, found, unknown = asyncio.run(scenario())
+
+    assert (created.status_code, created.json()["status"]) == (202, "queued")
+    assert full.status_code == 503
+    assert found.json()["profile"] == "alice"
+    assert unknown.status_code == 404
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from typing import Iterable, List
+
+import httpx
+import pytest
+
+from app.services.brightdata import _parse_snapshot_body
+from app.services.jsonstream import JSONArrayStream
+
+DOCUMENT = '[1, -2.5e3, "a, ]", null, true, {"b": [1, 2]}, [3], 0.125, false]'
+
+
+def _decode(chunks: Iterable[str]) -> List:
+    stream = JSONArrayStream()
+    items = []
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+    return items + stream.close()
+
+
+class _Chunks(httpx.AsyncByteStream):
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self.chunks = list(chunks)
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _parse(chunks: Iterable[bytes], snapshot_format: str = "ndjson") -> List:
+    async def scenario():
+        resp = httpx.Response(200, stream=_Chunks(chunks))
+        return [item async for item in _parse_snapshot_body(resp, snapshot_format)]
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, len(DOCUMENT)])
+def test_any_chunking_decodes_the_same_elements(size):
+    chunks = [DOCUMENT[i : i + size] for i in range(0, len(DOCUMENT), size)]
+
+    assert _decode(chunks) == json.loads(DOCUMENT)
+
+
+def test_a_number_split_after_its_point_is_not_cut_short():
+    chunks = ["[", "\n 1,\n tr", "ue,\n t", "rue,", "\n 0.", "5\n]"]
+
+    assert _decode(chunks) == [1, True, True, 0.5]
+    assert _decode(["[1", "e", "3]"]) == [1000]
+
+
+def test_elements_are_returned_as_soon_as_they_are_complete():
+    stream = JSONArrayStream()
+
+    assert stream.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert stream.feed(": 2}]") == [{"b": 2}]
+    assert stream.close() == []
+
+
+def test_a_top_level_object_is_returned_whole_on_close():
+    stream = JSONArrayStream()
+
+    assert stream.feed('{"status": "building"}') == []
+    assert stream.close() == [{"status": "building"}]
+    assert stream.is_array is False
+
+
+@pytest.mark.parametrize("text", ["[1, 2", '[{"a": 1}', "[1 x]", "[1] 2"])
+def test_truncated_or_invalid_arrays_raise(text):
+    with pytest.raises(ValueError):
+        _decode([text])
+
+
+def test_ndjson_lines_split_across_chunks():
+    body = b'{"account": "a"}\n{"account": "b"}\n'
+
+    assert _parse([body[:5], body[5:20], body[20:]]) == [
+        {"account": "a"},
+        {"account": "b"},
+    ]
+
+
+def test_a_json_array_is_parsed_whatever_format_was_requested():
+    body = b'[{"account": "a"},\n {"account": "b"}]'
+
+    assert _parse([body[:7], body[7:]]) == [{"account": "a"}, {"account": "b"}]
+    assert _parse([body], snapshot_format="json") == [
+        {"account": "a"},
+        {"account": "b"},
+    ]
+
+
+def test_multibyte_characters_split_across_chunks():
+    body = '{"account": "café"}\n'.encode()
+    split = body.index("é".encode()) + 1
+
+    assert _parse([body[:split], body[split:]]) == [{"account": "café"}]
+
+
+def test_a_pretty_printed_object_in_an_ndjson_body_is_read_whole():
+    body = b'{\n  "status": "building",\n  "message": "not ready yet"\n}\n'
+
+    assert _parse([body[:10], body[10:]]) == [
+        {"status": "building", "message": "not ready yet"}
+    ]
+
+
+def test_a_bad_line_after_valid_ndjson_records_is_an_error():
+    with pytest.raises(ValueError):
+        _parse([b'{"account": "a"}\n{"account": \n"b"}\n'])
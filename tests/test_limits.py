@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.agents import instagram_analyzer
+from app.main import app
+from app.services.limits import (
+    TokenBucket,
+    UpstreamBusyError,
+    UpstreamLimiter,
+    queue_patiently,
+)
+
+
+def _limiter(**overrides) -> UpstreamLimiter:
+    options = {"concurrency": 1, "rate": 0, "max_queue_time": 0.05}
+    options.update(overrides)
+    return UpstreamLimiter("test", **options)
+
+
+async def _hold(limiter: UpstreamLimiter, seconds: float) -> None:
+    async with limiter.acquire():
+        await asyncio.sleep(seconds)
+
+
+def test_token_bucket_refuses_a_wait_beyond_the_budget():
+    bucket = TokenBucket(rate=10, capacity=1)
+
+    assert bucket.reserve(max_wait=0) == 0
+    assert bucket.reserve(max_wait=0) is None
+    assert bucket.reserve(max_wait=None) == pytest.approx(0.1, abs=0.01)
+    assert TokenBucket(rate=0, capacity=1).reserve(max_wait=0) == 0
+
+
+def test_a_saturated_limiter_sheds_with_a_retry_hint():
+    limiter = _limiter()
+
+    async def scenario():
+        holder = asyncio.create_task(_hold(limiter, 0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(UpstreamBusyError) as busy:
+            async with limiter.acquire():
+                pass
+        await holder
+        return busy.value
+
+    busy = asyncio.run(scenario())
+
+    assert busy.retry_after >= 1
+    assert (limiter.admitted, limiter.rejected, limiter.in_flight) == (1, 1, 0)
+
+
+def test_patient_callers_queue_past_the_budget():
+    limiter = _limiter()
+
+    async def scenario():
+        holder = asyncio.create_task(_hold(limiter, 0.2))
+        await asyncio.sleep(0)
+        with queue_patiently():
+            await asyncio.gather(*(_hold(limiter, 0.01) for _ in range(3)))
+        await holder
+
+    asyncio.run(scenario())
+
+    assert (limiter.admitted, limiter.rejected) == (4, 0)
+
+
+@pytest.fixture
+def llm_limiter(monkeypatch) -> UpstreamLimiter:
+    limiter = _limiter(concurrency=2)
+    monkeypatch.setattr(instagram_analyzer, "llm_limiter", limiter)
+    return limiter
+
+
+def test_a_busy_llm_answers_429_with_retry_after(
+    llm_limiter, mock_brightdata, use_mock, llm_calls
+):
+    async def scenario():
+        client = use_mock()
+        holders = [asyncio.create_task(_hold(llm_limiter, 0.5)) for _ in range(2)]
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as api:
+            response = await api.get(
+                "/api/v1/instagram/analysis", params={"profile": "l1_user"}
+            )
+        await asyncio.gather(*holders)
+        await client.aclose()
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert "at capacity" in response.json()["detail"]
+
+
+def test_a_batch_queues_for_the_llm_instead_of_failing(
+    llm_limiter, mock_brightdata, use_mock, llm_calls
+):
+    usernames = [f"l2_user{i}" for i in range(6)]
+
+    async def scenario():
+        client = use_mock()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as api:
+            response = await api.post(
+                "/api/v1/instagram/analysis/batch", json={"usernames": usernames}
+            )
+        await client.aclose()
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert [item["error"] for item in response.json()] == [None] * len(usernames)
+    assert len(llm_calls) == len(usernames)
+    assert llm_limiter.rejected == 0
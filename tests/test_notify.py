@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services import brightdata
+from app.services.snapshot_notifier import notifier
+
+NOTIFY_PATH = "/api/v1/brightdata/notify"
+# Nothing listens here, so the stand-in's own callback attempt fails fast and
+# only the callbacks sent by the tests reach the route.
+UNREACHABLE_NOTIFY_URL = "http://127.0.0.1:9/notify"
+
+
+@pytest.fixture
+def notify_mode(monkeypatch):
+    monkeypatch.setattr(
+        brightdata.settings, "brightdata_notify_url", UNREACHABLE_NOTIFY_URL
+    )
+    monkeypatch.setattr(brightdata.settings, "brightdata_notify_secret", "s3cret")
+
+
+def _api_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    )
+
+
+async def _triggered_snapshot(mock_brightdata) -> str:
+    while not mock_brightdata.snapshots:
+        await asyncio.sleep(0.01)
+    (snapshot_id,) = mock_brightdata.snapshots
+    return snapshot_id
+
+
+def test_callback_completes_the_wait_without_polling(
+    monkeypatch, notify_mode, mock_brightdata, use_mock
+):
+    monkeypatch.setattr(brightdata.settings, "brightdata_notify_check_interval", 60)
+
+    async def scenario():
+        client = use_mock()
+        fetch = asyncio.create_task(brightdata.fetch_instagram_profile("notified"))
+        snapshot_id = await _triggered_snapshot(mock_brightdata)
+        payload = {"snapshot_id": snapshot_id, "status": "ready"}
+
+        async with _api_client() as api:
+            denied = await api.post(
+                NOTIFY_PATH, json=payload, headers={"Authorization": "Bearer nope"}
+            )
+            accepted = await api.post(
+                NOTIFY_PATH, json=payload, headers={"Authorization": "Bearer s3cret"}
+            )
+        profile = await asyncio.wait_for(fetch, timeout=5)
+        await client.aclose()
+        return denied, accepted, profile
+
+    denied, accepted, profile = asyncio.run(scenario())
+
+    assert denied.status_code == 401
+    assert accepted.status_code == 200
+    assert profile.username == "notified"
+    assert mock_brightdata.requests["progress"] == 0
+
+
+def test_lost_callback_falls_back_to_progress_checks(
+    monkeypatch, notify_mode, mock_brightdata, use_mock
+):
+    monkeypatch.setattr(brightdata.settings, "brightdata_notify_check_interval", 0.05)
+
+    async def scenario():
+        client = use_mock()
+        profile = await asyncio.wait_for(
+            brightdata.fetch_instagram_profile("unnotified"), timeout=5
+        )
+        await client.aclose()
+        return profile
+
+    profile = asyncio.run(scenario())
+
+    assert profile.username == "unnotified"
+    assert mock_brightdata.requests["progress"] >= 1
+    (snapshot_id,) = mock_brightdata.snapshots
+    assert snapshot_id not in notifier._waiters
+
+
+def test_notify_requires_a_snapshot_id(notify_mode):
+    async def scenario():
+        async with _api_client() as api:
+            return await api.post(
+                NOTIFY_PATH,
+                json={"status": "ready"},
+                headers={"Authorization": "s3cret"},
+            )
+
+    assert asyncio.run(scenario()).status_code == 422
@@ -0,0 +1,61 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.agents import prescreen
+from app.models.instagram import InstagramProfile
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(prescreen.settings, "prescreen_reject_private", True)
+    monkeypatch.setattr(prescreen.settings, "prescreen_min_followers", 100)
+    monkeypatch.setattr(prescreen.settings, "prescreen_min_posts", 1)
+    monkeypatch.setattr(prescreen.settings, "prescreen_min_avg_engagement", 0.0005)
+
+
+def _profile(**fields) -> InstagramProfile:
+    fields.setdefault("followers", 5000)
+    fields.setdefault("raw", {})
+    return InstagramProfile(username="someone", **fields)
+
+
+def test_unknown_post_count_is_not_rejected():
+    assert prescreen.screen_profile(_profile()) == []
+
+
+def test_zero_posts_are_rejected():
+    assert prescreen.screen_profile(_profile(posts_count=0)) == [
+        "the account has 0 posts"
+    ]
+    assert prescreen.screen_profile(_profile(raw={"posts": []})) == [
+        "the account has 0 posts"
+    ]
+
+
+def test_scraped_posts_count_when_the_post_count_is_missing():
+    profile = _profile(raw={"posts": [{"likes": 10}]})
+
+    assert prescreen.screen_profile(profile) == []
+
+
+def test_private_low_follower_account_lists_every_reason():
+    profile = _profile(followers=10, posts_count=3, raw={"is_private": True})
+
+    assert prescreen.screen_profile(profile) == [
+        "the account is private",
+        "10 followers is below the minimum of 100",
+    ]
+
+
+def test_screening_is_counted_in_the_metrics():
+    def count(name: str) -> float:
+        return REGISTRY.get_sample_value(name) or 0.0
+
+    before = count("wykra_prescreen_screened_total")
+    rejected = count("wykra_prescreen_rejected_total")
+
+    prescreen.screen_profile(_profile(posts_count=0))
+    prescreen.screen_profile(_profile(posts_count=5))
+
+    assert count("wykra_prescreen_screened_total") == before + 2
+    assert count("wykra_prescreen_rejected_total") == rejected + 1
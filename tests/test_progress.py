@@ -0,0 +1,99 @@
+import asyncio
+import json
+from typing import List, Tuple
+
+import httpx
+import pytest
+
+from app.agents import instagram_analyzer
+from app.main import app
+from app.services import progress
+
+from conftest import SAMPLE_ANALYSIS
+
+EVENTS_PATH = "/api/v1/instagram/analysis/events"
+
+
+def test_events_reach_the_subscribers_of_bound_channels():
+    async def scenario():
+        with progress.subscribe("alice") as alice, progress.subscribe("bob") as bob:
+            progress.emit("unbound")
+            with progress.bind("alice"):
+                with progress.bind("bob", "alice"):
+                    await asyncio.create_task(_emit("nested"))
+                progress.emit("outer")
+            return _drain(alice), _drain(bob)
+
+    alice, bob = asyncio.run(scenario())
+
+    assert [(e.stage, e.data) for e in alice] == [("nested", {"n": 1}), ("outer", {})]
+    assert [e.stage for e in bob] == ["nested"]
+    assert progress._subscribers == {}
+
+
+def test_is_observed_only_with_a_subscriber():
+    with progress.bind("carol"):
+        assert not progress.is_observed()
+        with progress.subscribe("carol"):
+            assert progress.is_observed()
+
+
+async def _emit(stage: str) -> None:
+    progress.emit(stage, n=1)
+
+
+def _drain(queue) -> list:
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def _events(profile: str, use_mock) -> Tuple[httpx.Response, List[Tuple[str, dict]]]:
+    async def scenario():
+        client = use_mock()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as api:
+            response = await api.get(EVENTS_PATH, params={"profile": profile})
+        await client.aclose()
+        return response
+
+    response = asyncio.run(scenario())
+    events = []
+    for frame in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return response, events
+
+
+@pytest.fixture(autouse=True)
+def whole_responses(monkeypatch):
+    monkeypatch.setattr(instagram_analyzer.settings, "llm_stream", False)
+
+
+def test_the_stream_reports_each_stage_then_the_analysis(
+    mock_brightdata, use_mock, llm_calls
+):
+    response, events = _events("@P1_User", use_mock)
+
+    stages = [stage for stage, _ in events]
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert stages[0] == "snapshot_triggered"
+    assert stages.index("snapshot_downloaded") < stages.index("llm_started")
+    assert stages[-2:] == ["llm_completed", "done"]
+    assert all(data["profile"] == "p1_user" for _, data in events)
+    assert events[-1][1]["data"]["analysis"] == SAMPLE_ANALYSIS
+
+
+def test_a_failed_fetch_ends_the_stream_with_an_error(
+    mock_brightdata, use_mock, llm_calls
+):
+    mock_brightdata.error_rate = 1.0
+
+    _, events = _events("p2_user", use_mock)
+
+    stage, data = events[-1]
+    assert stage == "error"
+    assert "Injected failure" in data["data"]["detail"]
+    assert llm_calls == []
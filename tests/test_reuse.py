@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from app.services import brightdata, snapshot_ledger
+from app.services.datasets import datasets
+from app.services.snapshot_ledger import SQLiteSnapshotLedger
+
+
+@pytest.fixture
+def ledger(monkeypatch, tmp_path) -> SQLiteSnapshotLedger:
+    ledger = SQLiteSnapshotLedger(str(tmp_path / "ledger.sqlite3"), retention=86400)
+    monkeypatch.setattr(brightdata, "get_snapshot_ledger", lambda: ledger)
+    monkeypatch.setattr(brightdata.settings, "brightdata_snapshot_reuse_max_age", 3600)
+    return ledger
+
+
+async def _recorded_snapshot(
+    ledger: SQLiteSnapshotLedger, username: str, age: float
+) -> str:
+    """Trigger a snapshot of ``username`` and record it as built ``age`` ago."""
+
+    dataset = datasets.get("profiles")
+    snapshot_id = await brightdata._trigger_snapshot(
+        brightdata.get_http_client(),
+        brightdata._auth_headers(dataset),
+        dataset,
+        [{"user_name": username}],
+    )
+    await ledger.record(dataset.dataset_id, snapshot_id, [username])
+    await ledger.set_status(snapshot_id, snapshot_ledger.READY)
+    with ledger._lock, ledger._conn:
+        ledger._conn.execute(
+            "UPDATE snapshots SET triggered_at = triggered_at - ?"
+            " WHERE snapshot_id = ?",
+            (age, snapshot_id),
+        )
+    return snapshot_id
+
+
+def test_a_recent_snapshot_is_reused_instead_of_triggering(
+    ledger, mock_brightdata, use_mock
+):
+    async def scenario():
+        client = use_mock()
+        snapshot_id = await _recorded_snapshot(ledger, "r1_user", age=60)
+        profile = await brightdata.fetch_instagram_profile("r1_user")
+        await client.aclose()
+        return profile, await ledger.get(snapshot_id)
+
+    profile, entry = asyncio.run(scenario())
+
+    assert profile.username == "r1_user"
+    assert mock_brightdata.requests["trigger"] == 1
+    assert entry.status == snapshot_ledger.DOWNLOADED
+
+
+def test_a_snapshot_older_than_max_age_is_not_reused(ledger, mock_brightdata, use_mock):
+    async def scenario():
+        client = use_mock()
+        await _recorded_snapshot(ledger, "r2_user", age=600)
+        await brightdata.fetch_instagram_profile("r2_user", max_age=300)
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+    assert mock_brightdata.requests["trigger"] == 2
+
+
+def test_reused_profiles_are_cached_as_of_their_trigger(
+    ledger, mock_brightdata, use_mock
+):
+    async def scenario():
+        client = use_mock()
+        await _recorded_snapshot(ledger, "r3_user", age=3000)
+        await brightdata.fetch_instagram_profile("r3_user", max_age=3600)
+        triggers = mock_brightdata.requests["trigger"]
+        await brightdata.fetch_instagram_profile("r3_user", max_age=600)
+        await client.aclose()
+        return triggers
+
+    triggers_after_reuse = asyncio.run(scenario())
+
+    assert triggers_after_reuse == 1
+    assert mock_brightdata.requests["trigger"] == 2
+
+
+def test_a_batch_reuses_recorded_snapshots(ledger, mock_brightdata, use_mock):
+    async def scenario():
+        client = use_mock()
+        await _recorded_snapshot(ledger, "r4_old", age=60)
+        results = await brightdata.fetch_instagram_profiles(["r4_old", "r4_new"])
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert all(
+        isinstance(result, brightdata.InstagramProfile) for result in results.values()
+    )
+    assert mock_brightdata.requests["trigger"] == 2
+
+
+def test_an_error_row_in_a_reused_snapshot_is_scraped_again(
+    ledger, mock_brightdata, use_mock
+):
+    async def scenario():
+        client = use_mock()
+        mock_brightdata.error_rate = 1.0
+        await _recorded_snapshot(ledger, "r5_single", age=60)
+        await _recorded_snapshot(ledger, "r5_batch", age=60)
+        mock_brightdata.error_rate = 0.0
+        single = await brightdata.fetch_instagram_profile("r5_single")
+        batch = await brightdata.fetch_instagram_profiles(["r5_batch"])
+        await client.aclose()
+        return single, batch["r5_batch"]
+
+    single, batched = asyncio.run(scenario())
+
+    assert single.username == "r5_single"
+    assert isinstance(batched, brightdata.InstagramProfile)
+    assert mock_brightdata.requests["trigger"] == 4
@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+
+from app.services import brightdata, snapshot_ledger
+from app.services.brightdata_mock import MockBrightData
+from app.services.datasets import datasets
+from app.services.snapshot_ledger import SQLiteSnapshotLedger
+from app.services.snapshot_notifier import SnapshotNotifier, notifier
+
+from conftest import FIXTURES
+
+
+@pytest.fixture
+def mock_brightdata() -> MockBrightData:
+    return MockBrightData.from_file(str(FIXTURES), build_latency=0.08, seed=0)
+
+
+async def _trigger(username: str) -> str:
+    dataset = datasets.get("profiles")
+    return await brightdata._trigger_snapshot(
+        brightdata.get_http_client(),
+        brightdata._auth_headers(dataset),
+        dataset,
+        [{"user_name": username}],
+    )
+
+
+def test_a_discarded_waiter_leaves_the_others_waiting():
+    async def scenario():
+        local = SnapshotNotifier()
+        first = local.register("s1")
+        second = local.register("s1")
+        local.discard("s1")
+        local.resolve("s1", {"status": "ready"})
+        local.discard("s1")
+        return first, second, local
+
+    first, second, local = asyncio.run(scenario())
+
+    assert first is second
+    assert second.result() == {"status": "ready"}
+    assert "s1" not in local._waiters
+
+
+def test_a_waiter_finishing_on_a_progress_check_leaves_the_others_waiting(
+    monkeypatch, mock_brightdata, use_mock
+):
+    monkeypatch.setattr(
+        brightdata.settings, "brightdata_notify_url", "http://127.0.0.1:9/notify"
+    )
+    dataset = datasets.get("profiles")
+    headers = brightdata._auth_headers(dataset)
+
+    async def scenario():
+        client = use_mock()
+        snapshot_id = await _trigger("s2_user")
+
+        def wait(check_interval):
+            monkeypatch.setattr(
+                brightdata.settings, "brightdata_notify_check_interval", check_interval
+            )
+            return asyncio.create_task(
+                brightdata._wait_for_snapshot_notification(
+                    client, headers, dataset, snapshot_id
+                )
+            )
+
+        # The first waiter finds the snapshot ready on a fallback progress
+        # check while the second only waits for the callback.
+        checking = wait(0.05)
+        await asyncio.sleep(0)
+        listening = wait(60)
+        await asyncio.sleep(0)
+        await asyncio.wait_for(checking, timeout=5)
+
+        notifier.resolve(snapshot_id, {"snapshot_id": snapshot_id, "status": "ready"})
+        await asyncio.wait_for(listening, timeout=5)
+        await client.aclose()
+        return snapshot_id
+
+    snapshot_id = asyncio.run(scenario())
+
+    assert snapshot_id not in notifier._waiters
+
+
+def test_concurrent_collections_of_one_snapshot_download_it_once(
+    mock_brightdata, use_mock
+):
+    dataset = datasets.get("profiles")
+    headers = brightdata._auth_headers(dataset)
+
+    async def scenario():
+        client = use_mock()
+        snapshot_id = await _trigger("s3_user")
+        collections = await asyncio.gather(
+            *(
+                brightdata._collect_snapshot(
+                    client, headers, dataset, snapshot_id, ["s3_user"]
+                )
+                for _ in range(2)
+            )
+        )
+        await client.aclose()
+        return collections
+
+    first, second = asyncio.run(scenario())
+
+    assert first is second
+    assert mock_brightdata.requests["snapshot"] == 1
+
+
+def test_expired_snapshots_stay_expired(tmp_path):
+    ledger = SQLiteSnapshotLedger(str(tmp_path / "ledger.sqlite3"), retention=3600)
+
+    async def scenario():
+        await ledger.record("gd_test", "old", ["alice"])
+        await ledger.record("gd_test", "new", ["alice"])
+        revived = await ledger.set_status("old", snapshot_ledger.DOWNLOADED)
+        moved = await ledger.set_status("new", snapshot_ledger.DOWNLOADED)
+        return revived, moved, await ledger.get("old"), await ledger.get("new")
+
+    revived, moved, old, new = asyncio.run(scenario())
+
+    assert (revived, old.status) == (False, snapshot_ledger.EXPIRED)
+    assert (moved, new.status) == (True, snapshot_ledger.DOWNLOADED)
+
+
+def test_a_late_download_of_an_expired_snapshot_is_not_cached(
+    monkeypatch, tmp_path, mock_brightdata, use_mock
+):
+    ledger = SQLiteSnapshotLedger(str(tmp_path / "ledger.sqlite3"), retention=3600)
+    monkeypatch.setattr(brightdata, "get_snapshot_ledger", lambda: ledger)
+    dataset = datasets.get("profiles")
+    headers = brightdata._auth_headers(dataset)
+
+    async def scenario():
+        client = use_mock()
+        snapshot_id = await _trigger("s5_user")
+        await ledger.record(dataset.dataset_id, snapshot_id, ["s5_user"])
+        collect = asyncio.create_task(
+            brightdata._collect_snapshot(
+                client, headers, dataset, snapshot_id, ["s5_user"]
+            )
+        )
+        await ledger.record(dataset.dataset_id, "newer", ["s5_user"])
+        results = await collect
+        cached = await brightdata.get_profile_cache().get(
+            brightdata._profile_cache_key("s5_user")
+        )
+        await client.aclose()
+        return results, cached, await ledger.get(snapshot_id)
+
+    results, cached, entry = asyncio.run(scenario())
+
+    assert isinstance(results["s5_user"], brightdata.InstagramProfile)
+    assert cached is None
+    assert entry.status == snapshot_ledger.EXPIRED
+
+
+def test_resumed_snapshots_are_cached_as_of_their_trigger(
+    monkeypatch, tmp_path, mock_brightdata, use_mock
+):
+    ledger = SQLiteSnapshotLedger(str(tmp_path / "ledger.sqlite3"), retention=86400)
+    monkeypatch.setattr(brightdata, "get_snapshot_ledger", lambda: ledger)
+    dataset = datasets.get("profiles")
+
+    async def scenario():
+        client = use_mock()
+        snapshot_id = await _trigger("s6_user")
+        await ledger.record(dataset.dataset_id, snapshot_id, ["s6_user"])
+        with ledger._lock, ledger._conn:
+            ledger._conn.execute(
+                "UPDATE snapshots SET triggered_at = triggered_at - 3000"
+                " WHERE snapshot_id = ?",
+                (snapshot_id,),
+            )
+        resumed = await brightdata.resume_outstanding_snapshots()
+        fresh = await brightdata.get_profile_cache().get(
+            brightdata._profile_cache_key("s6_user"), max_age=600
+        )
+        await client.aclose()
+        return resumed, fresh, await ledger.get(snapshot_id)
+
+    resumed, fresh, entry = asyncio.run(scenario())
+
+    assert resumed == 1
+    assert entry.status == snapshot_ledger.DOWNLOADED
+    assert fresh is None
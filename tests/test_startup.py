@@ -0,0 +1,9 @@
+from benchmarks.startup import measure_import
+
+
+def test_app_imports_without_the_llm_stack():
+    # Only the eager-import check runs here: import time depends on the
+    # machine, so its budget is checked by ``python -m benchmarks.startup``.
+    result = measure_import(runs=1)
+
+    assert result["eagerly_loaded"] == [], result
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+from app.agents import instagram_analyzer
+from app.agents.instagram_analyzer import _completed_fields, _run_streamed
+from app.models.instagram import InstagramAnalysis
+from app.services import progress
+
+from conftest import SAMPLE_ANALYSIS
+
+
+def _response(args) -> ModelResponse:
+    return ModelResponse(parts=[ToolCallPart("final_result", args)])
+
+
+def test_the_last_field_is_held_back_until_the_response_completes():
+    args = '{"qualityScore": 4, "topic": "fo'
+
+    assert _completed_fields(_response(args), final=False) == {"qualityScore": 4}
+    assert _completed_fields(_response(args), final=True) == {
+        "qualityScore": 4,
+        "topic": "fo",
+    }
+
+
+def test_invalid_and_unknown_fields_are_skipped():
+    args = {"qualityScore": "high", "topic": "food", "extra": 1, "niche": None}
+
+    assert _completed_fields(_response(args), final=True) == {
+        "topic": "food",
+        "niche": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        ModelResponse(parts=[TextPart("thinking")]),
+        _response("not json at all"),
+        _response("[1, 2]"),
+    ],
+)
+def test_responses_without_tool_arguments_have_no_fields(response):
+    assert _completed_fields(response, final=True) == {}
+
+
+@pytest.fixture
+def streamed_model(monkeypatch):
+    """Stream the sample analysis a few characters at a time."""
+
+    async def stream(messages, info):
+        text = json.dumps(SAMPLE_ANALYSIS)
+        yield {0: DeltaToolCall(name=info.output_tools[0].name)}
+        for start in range(0, len(text), 7):
+            yield {0: DeltaToolCall(json_args=text[start : start + 7])}
+            await asyncio.sleep(0)
+
+    agent = instagram_analyzer.get_instagram_agent()
+    monkeypatch.setattr(agent, "model", FunctionModel(stream_function=stream))
+    monkeypatch.setattr(instagram_analyzer.settings, "llm_stream_debounce", 0)
+
+
+def test_fields_are_published_once_each_in_schema_order(streamed_model):
+    async def scenario():
+        with progress.subscribe("s_user") as queue, progress.bind("s_user"):
+            analysis, _ = await _run_streamed("{}")
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return analysis, events
+
+    analysis, events = asyncio.run(scenario())
+
+    fields = [event.data["field"] for event in events]
+    assert analysis == InstagramAnalysis(**SAMPLE_ANALYSIS)
+    assert fields == list(SAMPLE_ANALYSIS)
+    assert {e.data["field"]: e.data["value"] for e in events} == SAMPLE_ANALYSIS